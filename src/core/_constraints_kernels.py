@@ -0,0 +1,98 @@
+"""
+Các kernel số học cho ConstraintChecker và FastConstraintChecker (chạy trên mảng NumPy).
+
+Nếu có cài numba, các kernel được biên dịch bằng @njit(cache=True) để bỏ
+overhead của interpreter; không có thì chạy như hàm NumPy thường - kết quả
+giống hệt nhau.
+"""
+
+import numpy as np
+
+# OPTIMIZATION: numba là tùy chọn (requirements-optional.txt) - cùng cách
+# xử lý với engine 'calamine' của DataLoader
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Decorator thay thế khi không có numba: trả về nguyên hàm gốc."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+@njit(cache=True)
+def overlapping_pairs(starts: np.ndarray, ends: np.ndarray) -> int:
+    """
+    Đếm số cặp khoảng [start, end) chồng lấn nhau (yêu cầu mọi end > start).
+
+    Cặp (i, j) KHÔNG overlap khi và chỉ khi end_i <= start_j hoặc end_j <= start_i
+    (không thể xảy ra đồng thời khi thời lượng > 0), nên số cặp không overlap là
+    tổng searchsorted của các giờ bắt đầu trên mảng giờ kết thúc đã sắp xếp.
+    """
+    k = starts.shape[0]
+    non_overlapping = np.searchsorted(np.sort(ends), starts, side='right').sum()
+    return k * (k - 1) // 2 - int(non_overlapping)
+
+
+@njit(cache=True)
+def capacity_penalty(student_counts: np.ndarray, capacities: np.ndarray, weight: float) -> float:
+    """
+    Điểm phạt quá tải phòng (capacities = -1: phòng không tồn tại, phạt cố định).
+
+    Mỗi ca vượt sức chứa bị phạt weight * (1 + số SV vượt / 10).
+    """
+    known = capacities >= 0
+    penalty = weight * (capacities.shape[0] - known.sum())
+    overflow = student_counts[known] - capacities[known]
+    overflow = overflow[overflow > 0]
+    return penalty + (weight * (1 + overflow / 10)).sum()
+
+
+@njit(cache=True)
+def underutilization_penalty(student_counts: np.ndarray, capacities: np.ndarray, weight: float) -> float:
+    """
+    Điểm phạt lãng phí sức chứa: ca có utilization < 50% bị phạt
+    weight * (1 - utilization) * capacity. Bỏ qua phòng không tồn tại / sức chứa 0.
+    """
+    valid = capacities > 0
+    valid_capacities = capacities[valid]
+    utilization = student_counts[valid] / valid_capacities
+    wasted = utilization < 0.5
+    return (weight * (1.0 - utilization[wasted]) * valid_capacities[wasted]).sum()
+
+
+@njit(cache=True)
+def grouped_overlap_counts(keys: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Phần đóng góp của từng khoảng vào số cặp overlap trong nhóm (cùng key) của nó
+    (yêu cầu mọi end > start, key >= 0 và start >= 0).
+    
+    Phần tử i nhận (k_i - 1) - 2 * (số khoảng cùng nhóm kết thúc trước start_i),
+    với k_i là kích thước nhóm. Tổng trên các nhóm trọn vẹn chia 2 là số cặp
+    overlap: C(k, 2) trừ số cặp không overlap (như overlapping_pairs).
+    
+    Mọi nhóm được xử lý cùng lúc trên 1 mảng sắp xếp duy nhất của khóa ghép
+    key * span + giờ kết thúc (span > mọi giờ kết thúc): các nhóm nằm liền nhau
+    theo thứ tự key, nên biên nhóm [key * span, (key + 1) * span) và vị trí của
+    start_i trong nhóm đều tìm được bằng searchsorted - không cần sort riêng khóa.
+    """
+    if keys.shape[0] == 0:
+        return np.zeros(0, dtype=np.int64)
+    if keys.min() < 0 or starts.min() < 0:
+        raise ValueError("grouped_overlap_counts: key và start phải >= 0")
+    span = ends.max() + 1
+    # Khóa ghép lớn nhất là (max_key + 1) * span - phải nằm trong int64
+    if keys.max() >= _INT64_MAX // span - 1:
+        raise ValueError("grouped_overlap_counts: key * span vượt quá int64")
+    origin = keys * span
+    sorted_ends = np.sort(origin + ends)
+    group_begin = np.searchsorted(sorted_ends, origin, side='left')
+    group_sizes = np.searchsorted(sorted_ends, origin + span, side='left') - group_begin
+    non_overlapping = np.searchsorted(sorted_ends, origin + starts, side='right') - group_begin
+    return group_sizes - 1 - 2 * non_overlapping
@@ -3,16 +3,147 @@ Module xử lý các ràng buộc và tính toán hàm mục tiêu (cost functio
 Điểm phạt càng cao = lịch thi càng kém chất lượng (minimization problem).
 """
 
-from typing import Dict, List, Tuple, Set
-from collections import defaultdict
-import sys
-from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Set
+from collections import Counter, defaultdict
+from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
+import heapq
+import numpy as np
 
 # Import models
-sys.path.append(str(Path(__file__).parent.parent))
-from models.solution import Schedule
-from models.course import Course
-from models.room import Room
+from src.models.solution import Schedule, ScheduleArrays
+from src.models.course import Course
+from src.models.room import Room
+
+from src.core._constraints_kernels import capacity_penalty, overlapping_pairs, underutilization_penalty
+
+
+@lru_cache(maxsize=1024)
+def time_to_minutes(time_str: str):
+    """
+    Chuyển giờ thi "HH:MM" thành số phút tính từ 00:00 (có cache).
+    
+    OPTIMIZATION: Giờ thi chỉ có vài giá trị khác nhau, nên mỗi chuỗi chỉ
+    strptime một lần; so sánh overlap sau đó là so sánh số nguyên.
+    
+    Returns:
+        int | None: Số phút, hoặc None nếu chuỗi không hợp lệ.
+    """
+    try:
+        parsed = datetime.strptime(time_str, "%H:%M")
+    except (ValueError, TypeError):
+        return None
+    return parsed.hour * 60 + parsed.minute
+
+
+@lru_cache(maxsize=4096)
+def _week_start(date_str: str):
+    """
+    Ngày thứ 2 của tuần chứa date_str ("YYYY-MM-DD"), dạng số thứ tự ngày (ordinal).
+    
+    OPTIMIZATION: Ngày thi chỉ có vài chục giá trị nhưng được tra cho mọi môn ở
+    mỗi lần đánh giá - cache theo chuỗi ngày nên mỗi ngày chỉ strptime 1 lần.
+    Trả về số nguyên (toordinal) để làm khóa đếm rẻ hơn đối tượng date.
+    
+    Returns:
+        int | None: None nếu chuỗi ngày không hợp lệ.
+    """
+    try:
+        course_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+    except (ValueError, TypeError):
+        return None
+    return course_date.toordinal() - course_date.weekday()
+
+
+# Nhóm có từ ngần này môn trở lên thì đếm overlap bằng kernel NumPy/numba (overlapping_pairs)
+_VECTORIZED_BUCKET_SIZE = 32
+
+_exam_start = itemgetter(1)
+_exam_duration = itemgetter(2)
+
+# Từ ngần này nhóm (giám thị, tuần/ngày) trở lên thì tính số môn vượt giới hạn bằng NumPy
+_VECTORIZED_TALLY_SIZE = 200
+
+
+def count_overlapping_pairs(exams: List[Tuple[object, int, int]]) -> int:
+    """
+    Đếm số cặp môn thi có thời gian chồng lấn trong cùng một nhóm (sweep-line).
+    
+    OPTIMIZATION: Thay vì xét tất cả k(k-1)/2 cặp, sắp xếp theo giờ bắt đầu và
+    giữ một min-heap các môn "đang diễn ra" (theo giờ kết thúc). Môn đã kết thúc
+    trước giờ bắt đầu của môn hiện tại bị loại khỏi heap; các môn còn lại đều
+    overlap với môn hiện tại -> O(k log k + số cặp vi phạm).
+    Nhóm lớn (>= _VECTORIZED_BUCKET_SIZE môn) được đếm bằng NumPy.
+    
+    Args:
+        exams: Danh sách (môn/ca thi, phút bắt đầu, thời lượng).
+    
+    Returns:
+        int: Số cặp (i, j) thỏa start_i < end_j và start_j < end_i.
+    """
+    if len(exams) < 2:
+        return 0
+    
+    count = len(exams)
+    if count >= _VECTORIZED_BUCKET_SIZE:
+        # Chép thẳng giờ bắt đầu/thời lượng vào mảng int64 liền kề (map + itemgetter
+        # chạy ở tầng C, không tạo generator/tuple trung gian); kiểm tra thời lượng
+        # trước để nhóm phải dùng sweep không tốn công dựng mảng giờ bắt đầu
+        durations = np.fromiter(map(_exam_duration, exams), dtype=np.int64, count=count)
+        if (durations > 0).all():
+            starts = np.fromiter(map(_exam_start, exams), dtype=np.int64, count=count)
+            return overlapping_pairs(starts, starts + durations)
+    
+    pairs = 0
+    active: List[Tuple[int, int]] = []  # heap (end, start) của các môn đang diễn ra
+    for start, duration in sorted((exam[1], exam[2]) for exam in exams):
+        end = start + duration
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        if duration > 0:
+            # Môn trong heap có start <= start hiện tại < end -> chắc chắn overlap
+            pairs += len(active)
+        else:
+            pairs += sum(1 for _, other_start in active if other_start < end)
+        heapq.heappush(active, (end, start))
+    return pairs
+
+
+def _excess_exams(counts: Dict, limit: int) -> int:
+    """
+    Tổng số môn vượt giới hạn trên tất cả các nhóm: Σ max(count - limit, 0).
+    
+    OPTIMIZATION: Ít nhóm thì cộng bằng vòng lặp Python (không tốn chi phí dựng
+    mảng); nhiều nhóm thì chép số đếm vào mảng và tính dạng vector.
+    """
+    if len(counts) < _VECTORIZED_TALLY_SIZE:
+        return sum(count - limit for count in counts.values() if count > limit)
+    tally = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    return int(np.maximum(tally - limit, 0).sum())
+
+
+def _has_overlap(exams: List[Tuple[object, int, int]]) -> bool:
+    """
+    Nhóm có ít nhất 1 cặp môn thi chồng lấn thời gian hay không (dừng ở cặp đầu tiên).
+    
+    Sắp xếp theo giờ bắt đầu, giữ giờ kết thúc lớn nhất đã gặp: môn bắt đầu trước
+    giờ đó là overlap. Nhóm có thời lượng <= 0 dùng lại phép đếm đầy đủ.
+    """
+    if len(exams) < 2:
+        return False
+    if any(exam[2] <= 0 for exam in exams):
+        return count_overlapping_pairs(exams) > 0
+    
+    max_end = None
+    for start, duration in sorted((exam[1], exam[2]) for exam in exams):
+        if max_end is not None and start < max_end:
+            return True
+        end = start + duration
+        if max_end is None or end > max_end:
+            max_end = end
+    return False
 
 
 class ConstraintWeights:
@@ -57,6 +188,7 @@ class ConstraintChecker:
         self.rooms_dict: Dict[str, Room] = {}
         if rooms:
             self.rooms_dict = {room.room_id: room for room in rooms}
+        self._index_rooms()
         
         # Proctor constraints
         self.max_exams_per_week = max_exams_per_week
@@ -70,359 +202,135 @@ class ConstraintChecker:
             rooms (List[Room]): Danh sách các phòng thi.
         """
         self.rooms_dict = {room.room_id: room for room in rooms}
+        self._index_rooms()
     
-    def _check_overlap(self, t1_start_str: str, t1_duration: int, 
-                       t2_start_str: str, t2_duration: int) -> bool:
+    def _index_rooms(self) -> None:
         """
-        ENHANCED: Helper method để kiểm tra xem 2 khoảng thời gian có bị chồng lấn (overlap) không.
-        
-        Sử dụng datetime để tính toán chính xác:
-        - t1: [t1_start, t1_start + t1_duration]
-        - t2: [t2_start, t2_start + t2_duration]
-        
-        Overlap xảy ra khi: t1_start < t2_start + t2_duration AND t2_start < t1_start + t1_duration
-        
-        Args:
-            t1_start_str (str): Thời gian bắt đầu môn 1 (format: "HH:MM").
-            t1_duration (int): Thời lượng môn 1 (phút).
-            t2_start_str (str): Thời gian bắt đầu môn 2 (format: "HH:MM").
-            t2_duration (int): Thời lượng môn 2 (phút).
+        Dựng các bảng tra theo phòng từ rooms_dict.
         
-        Returns:
-            bool: True nếu có overlap, False nếu không.
+        OPTIMIZATION: Địa điểm được chuẩn hóa (strip + lower) và gán ID số nguyên
+        1 lần; so sánh địa điểm trong các phép kiểm tra chỉ còn so sánh số nguyên.
+        Mỗi phòng có 1 index số nguyên, sức chứa / ID địa điểm nằm trong các mảng
+        NumPy song song theo index đó. Phần tử cuối mỗi mảng (index = số phòng)
+        là giá trị -1 dành cho phòng không tồn tại.
         """
-        try:
-            from datetime import datetime, timedelta
-            
-            # Parse thời gian bắt đầu
-            t1_start = datetime.strptime(t1_start_str, "%H:%M")
-            t2_start = datetime.strptime(t2_start_str, "%H:%M")
-            
-            # Tính thời gian kết thúc
-            t1_end = t1_start + timedelta(minutes=t1_duration)
-            t2_end = t2_start + timedelta(minutes=t2_duration)
-            
-            # Kiểm tra overlap: 2 khoảng [a, b] và [c, d] overlap khi a < d AND c < b
-            return t1_start < t2_end and t2_start < t1_end
-        except (ValueError, TypeError):
-            # Nếu parse thất bại, coi như không overlap
-            return False
+        self._location_ids: Dict[str, int] = {}          # địa điểm đã chuẩn hóa -> ID
+        self._location_id_by_raw: Dict[str, int] = {}    # chuỗi gốc -> ID
+        rooms = list(self.rooms_dict.values())
+        self._room_index: Dict[str, int] = {room.room_id: idx for idx, room in enumerate(rooms)}
+        self._room_capacities = np.array([room.capacity for room in rooms] + [-1], dtype=np.int64)
+        self._room_location_ids = np.array(
+            [self._location_id(room.location) for room in rooms] + [-1], dtype=np.int64
+        )
+        self._room_columns_cache: Tuple[Optional[ScheduleArrays], Optional[Tuple]] = (None, None)
     
+    def _location_id(self, location: str) -> int:
+        """ID số nguyên của địa điểm (các chuỗi giống nhau sau strip/lower có cùng ID)."""
+        loc_id = self._location_id_by_raw.get(location)
+        if loc_id is None:
+            normalized = location.strip().lower()
+            loc_id = self._location_ids.setdefault(normalized, len(self._location_ids))
+            self._location_id_by_raw[location] = loc_id
+        return loc_id
     
-    def _check_room_conflicts(self, schedule: Schedule) -> float:
+    def _exam_room_columns(self, arrays: ScheduleArrays) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Kiểm tra vi phạm trùng phòng: Nhiều môn thi cùng phòng, cùng ngày, cùng giờ.
+        Sức chứa và ID địa điểm phòng của từng ca thi trong arrays
+        (-1 nếu phòng không tồn tại).
         
-        ENHANCED: Hỗ trợ kiểm tra cả sessions.
-        ENHANCED: Kiểm tra overlap thời gian dựa trên duration, không chỉ so sánh giờ bắt đầu.
-        
-        Strategy:
-            - Nhóm các môn theo (date, room)
-            - Kiểm tra từng cặp môn trong cùng nhóm xem thời gian có overlap không
-            - Sử dụng _check_overlap để kiểm tra với duration
-        
-        Args:
-            schedule (Schedule): Lịch thi cần kiểm tra.
-        
-        Returns:
-            float: Tổng điểm phạt cho vi phạm trùng phòng.
+        Kết quả được giữ lại cho arrays gần nhất để các phép kiểm tra trong cùng
+        một lần đánh giá không phải tra lại dict phòng.
         """
-        penalty = 0.0
-        
-        # Dictionary: (date, room) -> List[(course, time, duration)]
-        room_schedule: Dict[Tuple[str, str], List[Tuple[Course, str, int]]] = defaultdict(list)
-        
-        for course in schedule.courses:
-            # Xử lý sessions nếu có
-            if course.sessions:
-                for session in course.sessions:
-                    if session.is_scheduled():
-                        key = (session.assigned_date, session.assigned_room)
-                        duration = getattr(course, 'duration', 90)  # Lấy duration từ course cha
-                        room_schedule[key].append((session, session.assigned_time, duration))
-            # Backward compatible: Xử lý course không chia ca
-            elif course.is_scheduled():
-                key = (course.assigned_date, course.assigned_room)
-                duration = getattr(course, 'duration', 90)  # Lấy duration từ course
-                room_schedule[key].append((course, course.assigned_time, duration))
-        
-        # Kiểm tra overlap giữa các cặp môn trong cùng phòng/ngày
-        for (date, room), exams in room_schedule.items():
-            # Kiểm tra tất cả các cặp
-            for i in range(len(exams)):
-                for j in range(i + 1, len(exams)):
-                    exam1, time1, duration1 = exams[i]
-                    exam2, time2, duration2 = exams[j]
-                    
-                    # Kiểm tra overlap
-                    if self._check_overlap(time1, duration1, time2, duration2):
-                        penalty += ConstraintWeights.ROOM_CONFLICT
-        
-        return penalty
+        cached_arrays, columns = self._room_columns_cache
+        if cached_arrays is arrays:
+            return columns
+        # Tra dict 1 lần để lấy index phòng (map(dict.get, ...) duyệt ở tầng C),
+        # sau đó lấy các cột bằng fancy indexing trên mảng theo phòng
+        rooms = arrays.rooms
+        count = len(rooms)
+        missing = len(self._room_index)
+        room_idx = np.fromiter(map(self._room_index.get, rooms, repeat(missing, count)),
+                               dtype=np.intp, count=count)
+        columns = (self._room_capacities[room_idx], self._room_location_ids[room_idx])
+        self._room_columns_cache = (arrays, columns)
+        return columns
     
-    def _check_proctor_conflicts(self, schedule: Schedule) -> float:
-        """
-        Kiểm tra vi phạm trùng giám thị: Một giám thị coi thi 2 môn tại cùng một thời điểm (Ngày + Giờ).
-        
-        ENHANCED: Kiểm tra overlap thời gian dựa trên duration, không chỉ so sánh giờ bắt đầu.
-        
-        Strategy:
-            - Nhóm các môn theo (date, proctor_id)
-            - Kiểm tra từng cặp môn trong cùng nhóm xem thời gian có overlap không
-            - Sử dụng _check_overlap để kiểm tra với duration
-        
-        Args:
-            schedule (Schedule): Lịch thi cần kiểm tra.
-        
-        Returns:
-            float: Tổng điểm phạt cho vi phạm trùng giám thị.
-        """
-        penalty = 0.0
-        
-        # Dictionary: (date, proctor_id) -> List[(course, time, duration)]
-        proctor_schedule: Dict[Tuple[str, str], List[Tuple[Course, str, int]]] = defaultdict(list)
-        
-        for course in schedule.courses:
-            # Chỉ kiểm tra nếu môn học đã được xếp lịch và có giám thị
-            if not course.is_scheduled() or not course.assigned_proctor_id:
-                continue
-            
-            # Xử lý sessions nếu có
-            if course.sessions:
-                for session in course.sessions:
-                    if session.is_scheduled() and hasattr(session, 'assigned_proctor_id') and session.assigned_proctor_id:
-                        key = (session.assigned_date, session.assigned_proctor_id)
-                        duration = getattr(course, 'duration', 90)
-                        proctor_schedule[key].append((session, session.assigned_time, duration))
-            # Backward compatible: Xử lý course không chia ca
-            else:
-                key = (course.assigned_date, course.assigned_proctor_id)
-                duration = getattr(course, 'duration', 90)
-                proctor_schedule[key].append((course, course.assigned_time, duration))
-        
-        # Kiểm tra overlap giữa các cặp môn cùng giám thị/ngày
-        for (date, proctor_id), exams in proctor_schedule.items():
-            # Kiểm tra tất cả các cặp
-            for i in range(len(exams)):
-                for j in range(i + 1, len(exams)):
-                    exam1, time1, duration1 = exams[i]
-                    exam2, time2, duration2 = exams[j]
-                    
-                    # Kiểm tra overlap
-                    if self._check_overlap(time1, duration1, time2, duration2):
-                        penalty += ConstraintWeights.PROCTOR_CONFLICT
-        
-        return penalty
-    
-    def _check_room_capacity(self, schedule: Schedule) -> float:
+    def _check_room_capacity(self, schedule: Schedule,
+                             arrays: Optional[ScheduleArrays] = None) -> float:
         """
         Kiểm tra vi phạm quá tải phòng: Số sinh viên > sức chứa phòng.
         
         ENHANCED: Hỗ trợ kiểm tra cả sessions.
+        OPTIMIZATION: Tính dạng vector trên Schedule.to_soa() thay vì vòng lặp từng ca.
         
         Args:
             schedule (Schedule): Lịch thi cần kiểm tra.
+            arrays (ScheduleArrays, optional): Kết quả schedule.to_soa() dùng chung
+                                               giữa các phép kiểm tra (tự tạo nếu None).
         
         Returns:
             float: Tổng điểm phạt cho vi phạm quá tải.
         """
-        penalty = 0.0
-        
-        for course in schedule.courses:
-            # Xử lý sessions nếu có
-            if course.sessions:
-                for session in course.sessions:
-                    if not session.is_scheduled():
-                        continue
-                    
-                    room_id = session.assigned_room
-                    
-                    if room_id not in self.rooms_dict:
-                        penalty += ConstraintWeights.ROOM_OVERCAPACITY
-                        continue
-                    
-                    room = self.rooms_dict[room_id]
-                    
-                    # Kiểm tra sức chứa cho từng session
-                    if session.student_count > room.capacity:
-                        overflow = session.student_count - room.capacity
-                        penalty += ConstraintWeights.ROOM_OVERCAPACITY * (1 + overflow / 10)
-            
-            # Backward compatible: Xử lý course không chia ca
-            elif course.is_scheduled():
-                room_id = course.assigned_room
-                
-                if room_id not in self.rooms_dict:
-                    penalty += ConstraintWeights.ROOM_OVERCAPACITY
-                    continue
-                
-                room = self.rooms_dict[room_id]
-                
-                # Kiểm tra sức chứa
-                if course.student_count > room.capacity:
-                    overflow = course.student_count - room.capacity
-                    penalty += ConstraintWeights.ROOM_OVERCAPACITY * (1 + overflow / 10)
+        if arrays is None:
+            arrays = schedule.to_soa()
+        capacities = self._exam_room_columns(arrays)[0]
         
-        return penalty
+        # Phòng không tồn tại: phạt cố định; vượt sức chứa: phạt theo số sinh viên vượt
+        return float(capacity_penalty(arrays.student_count, capacities,
+                                      ConstraintWeights.ROOM_OVERCAPACITY))
     
-    def _check_location_mismatch(self, schedule: Schedule) -> float:
+    def _check_location_mismatch(self, schedule: Schedule,
+                                 arrays: Optional[ScheduleArrays] = None) -> float:
         """
         Kiểm tra vi phạm sai địa điểm: Môn học yêu cầu thi ở cơ sở A nhưng xếp vào phòng thuộc cơ sở B.
         
         ENHANCED: Hỗ trợ kiểm tra cả sessions.
+        OPTIMIZATION: So sánh ID địa điểm (số nguyên) dạng vector trên Schedule.to_soa().
         
         Args:
             schedule (Schedule): Lịch thi cần kiểm tra.
+            arrays (ScheduleArrays, optional): Kết quả schedule.to_soa() (tự tạo nếu None).
         
         Returns:
             float: Tổng điểm phạt cho vi phạm sai địa điểm.
         """
-        penalty = 0.0
-        
-        for course in schedule.courses:
-            # Xử lý sessions nếu có
-            if course.sessions:
-                for session in course.sessions:
-                    if not session.is_scheduled():
-                        continue
-                    
-                    room_id = session.assigned_room
-                    
-                    if room_id not in self.rooms_dict:
-                        continue
-                    
-                    room = self.rooms_dict[room_id]
-                    course_location = course.location.strip().lower()
-                    room_location = room.location.strip().lower()
-                    
-                    if course_location != room_location:
-                        penalty += ConstraintWeights.LOCATION_MISMATCH
-            
-            # Backward compatible: Xử lý course không chia ca
-            elif course.is_scheduled():
-                room_id = course.assigned_room
-                
-                if room_id not in self.rooms_dict:
-                    continue
-                
-                room = self.rooms_dict[room_id]
-                course_location = course.location.strip().lower()
-                room_location = room.location.strip().lower()
-                
-                if course_location != room_location:
-                    penalty += ConstraintWeights.LOCATION_MISMATCH
-        
-        return penalty
+        if arrays is None:
+            arrays = schedule.to_soa()
+        room_locations = self._exam_room_columns(arrays)[1]
+        
+        location_id = self._location_id
+        course_locations = np.fromiter(
+            (location_id(course.location) for course in schedule.courses),
+            dtype=np.int64, count=len(schedule.courses)
+        )[arrays.course_index]
+        
+        # Phòng không tồn tại thì bỏ qua (đã bị phạt ở kiểm tra sức chứa)
+        mismatched = (room_locations >= 0) & (course_locations != room_locations)
+        return ConstraintWeights.LOCATION_MISMATCH * int(mismatched.sum())
     
-    def _check_unscheduled_courses(self, schedule: Schedule) -> float:
-        """
-        Kiểm tra các môn học chưa được xếp lịch.
-        (Optional - Tùy thuộc vào cách implement thuật toán SA)
-        
-        ENHANCED: Hỗ trợ kiểm tra cả sessions.
-        
-        Args:
-            schedule (Schedule): Lịch thi cần kiểm tra.
-        
-        Returns:
-            float: Tổng điểm phạt cho các môn chưa xếp lịch.
-        """
-        penalty = 0.0
-        
-        for course in schedule.courses:
-            if not course.is_scheduled():
-                penalty += ConstraintWeights.UNSCHEDULED_COURSE
-        
-        return penalty
-    
-    def _check_room_underutilization(self, schedule: Schedule) -> float:
+    def _check_room_underutilization(self, schedule: Schedule,
+                                     arrays: Optional[ScheduleArrays] = None) -> float:
         """
         Kiểm tra lãng phí sức chứa phòng (Underutilization).
         
         Penalty: Phạt khi số lượng sinh viên ít nhưng chọn phòng lớn.
         Mục tiêu: Tối ưu utilization rate (số SV / sức chứa phòng).
+        OPTIMIZATION: Tính dạng vector trên Schedule.to_soa().
         
         Args:
             schedule (Schedule): Lịch thi cần kiểm tra.
+            arrays (ScheduleArrays, optional): Kết quả schedule.to_soa() (tự tạo nếu None).
         
         Returns:
             float: Tổng điểm phạt cho lãng phí sức chứa.
         """
-        penalty = 0.0
-        
-        for course in schedule.courses:
-            # Xử lý sessions nếu có
-            if course.sessions:
-                for session in course.sessions:
-                    if not session.is_scheduled():
-                        continue
-                    
-                    room_id = session.assigned_room
-                    if room_id not in self.rooms_dict:
-                        continue
-                    
-                    room = self.rooms_dict[room_id]
-                    utilization = session.student_count / room.capacity if room.capacity > 0 else 0
-                    
-                    # Phạt nếu utilization < 50% (lãng phí > 50%)
-                    if utilization < 0.5:
-                        waste_ratio = 1.0 - utilization
-                        penalty += ConstraintWeights.UNDERUTILIZATION * waste_ratio * room.capacity
-            
-            # Backward compatible: Xử lý course không chia ca
-            elif course.is_scheduled():
-                room_id = course.assigned_room
-                if room_id not in self.rooms_dict:
-                    continue
-                
-                room = self.rooms_dict[room_id]
-                utilization = course.student_count / room.capacity if room.capacity > 0 else 0
-                
-                # Phạt nếu utilization < 50%
-                if utilization < 0.5:
-                    waste_ratio = 1.0 - utilization
-                    penalty += ConstraintWeights.UNDERUTILIZATION * waste_ratio * room.capacity
-        
-        return penalty
-    
-    def _check_room_distance_penalty(self, schedule: Schedule) -> float:
-        """
-        Phạt khi các ca của cùng một môn học ở phòng xa nhau.
-        
-        Mục tiêu: Ưu tiên các ca của cùng môn ở phòng gần nhau (cùng tầng, cùng khu vực).
-        
-        Strategy đơn giản: Phạt nếu các ca của cùng môn ở phòng khác nhau.
-        (Có thể cải thiện bằng cách tính khoảng cách thực tế giữa các phòng)
-        
-        Args:
-            schedule (Schedule): Lịch thi cần kiểm tra.
-        
-        Returns:
-            float: Tổng điểm phạt cho khoảng cách phòng.
-        """
-        penalty = 0.0
+        if arrays is None:
+            arrays = schedule.to_soa()
+        capacities = self._exam_room_columns(arrays)[0]
         
-        for course in schedule.courses:
-            # Chỉ xử lý môn học có nhiều ca
-            if not course.sessions or len(course.sessions) < 2:
-                continue
-            
-            # Lấy danh sách phòng của các ca đã được xếp lịch
-            scheduled_rooms = [
-                session.assigned_room 
-                for session in course.sessions 
-                if session.is_scheduled()
-            ]
-            
-            # Nếu có nhiều hơn 1 ca và các ca ở phòng khác nhau
-            if len(scheduled_rooms) > 1:
-                unique_rooms = set(scheduled_rooms)
-                if len(unique_rooms) > 1:
-                    # Phạt khi các ca ở phòng khác nhau
-                    # Penalty tăng theo số lượng phòng khác nhau
-                    penalty += ConstraintWeights.ROOM_DISTANCE_PENALTY * (len(unique_rooms) - 1)
-        
-        return penalty
+        # Phạt nếu utilization < 50% (lãng phí > 50%)
+        return float(underutilization_penalty(arrays.student_count, capacities,
+                                              ConstraintWeights.UNDERUTILIZATION))
     
     def calculate_total_violation(self, schedule: Schedule) -> float:
         """
@@ -451,36 +359,127 @@ class ConstraintChecker:
             >>> cost = checker.calculate_total_violation(schedule)
             >>> print(f"Total violation: {cost}")
         """
+        # OPTIMIZATION: Mọi loại vi phạm được tính trong 1 lần duyệt (_compute_all);
+        # cộng theo đúng thứ tự các ràng buộc 1-9 như trước
         total_penalty = 0.0
+        for penalty in self._compute_all(schedule).values():
+            total_penalty += penalty
         
-        # 1. Kiểm tra trùng phòng (Hard)
-        total_penalty += self._check_room_conflicts(schedule)
-        
-        # 2. Kiểm tra quá tải phòng (Hard)
-        total_penalty += self._check_room_capacity(schedule)
+        return total_penalty
+    
+    def _collect(self, schedule: Schedule) -> Tuple:
+        """
+        Duyệt schedule.courses 1 lần, gom mọi dữ liệu cần cho các loại vi phạm.
         
-        # 3. Kiểm tra trùng giám thị (Hard)
-        total_penalty += self._check_proctor_conflicts(schedule)
+        OPTIMIZATION: Thay vì 9 hàm kiểm tra mỗi hàm tự duyệt lại toàn bộ môn/ca,
+        một vòng lặp duy nhất đồng thời:
+            (a) gom ca thi theo (date, room) và (date, proctor),
+            (b) gom dữ liệu sức chứa/địa điểm/lãng phí (dạng mảng, tính vector),
+            (c) đếm môn chưa xếp lịch và tính phạt khoảng cách phòng,
+            (d) đếm số môn của giám thị theo tuần và theo ngày.
         
-        # 4. Kiểm tra sai địa điểm (Soft)
-        total_penalty += self._check_location_mismatch(schedule)
+        Returns:
+            Tuple: (arrays, room_schedule, proctor_schedule, weekly_count, daily_count,
+            unscheduled, distance_penalty).
+        """
+        room_schedule: Dict[Tuple[str, str], List[Tuple]] = defaultdict(list)
+        proctor_schedule: Dict[Tuple[str, str], List[Tuple]] = defaultdict(list)
+        weekly_count: Dict[Tuple, int] = defaultdict(int)
+        daily_count: Dict[Tuple[str, str], int] = defaultdict(int)
+        records = []  # (course_index, student_count, duration, room) cho ScheduleArrays
+        unscheduled = 0
+        distance_penalty = 0.0
+        # OPTIMIZATION: Bind hệ số phạt / hàm hay dùng vào biến local trước vòng lặp
+        distance_weight = ConstraintWeights.ROOM_DISTANCE_PENALTY
+        to_minutes = time_to_minutes
+        week_start = _week_start
+        
+        for idx, course in enumerate(schedule.courses):
+            duration = course.duration
+            scheduled = course.is_scheduled()
+            proctor_id = course.assigned_proctor_id
+            if not scheduled:
+                unscheduled += 1
+            
+            if course.sessions:
+                check_proctor = scheduled and proctor_id
+                unique_rooms = set()
+                for session in course.sessions:
+                    if not session.is_scheduled():
+                        continue
+                    room = session.assigned_room
+                    unique_rooms.add(room)
+                    records.append((idx, session.student_count, duration, room))
+                    
+                    start = to_minutes(session.assigned_time)
+                    if start is None:
+                        continue
+                    room_schedule[(session.assigned_date, room)].append((session, start, duration))
+                    session_proctor = session.assigned_proctor_id if check_proctor else None
+                    if session_proctor:
+                        proctor_schedule[(session.assigned_date, session_proctor)].append(
+                            (session, start, duration))
+                
+                # Khoảng cách phòng giữa các ca của cùng môn
+                if len(unique_rooms) > 1:
+                    distance_penalty += distance_weight * (len(unique_rooms) - 1)
+            
+            elif scheduled:
+                room = course.assigned_room
+                records.append((idx, course.student_count, duration, room))
+                start = to_minutes(course.assigned_time)
+                if start is not None:
+                    room_schedule[(course.assigned_date, room)].append((course, start, duration))
+                    if proctor_id:
+                        proctor_schedule[(course.assigned_date, proctor_id)].append((course, start, duration))
+            
+            # Khối lượng giám thị (tính theo thông tin của môn)
+            if scheduled and proctor_id:
+                monday = week_start(course.assigned_date)
+                if monday is not None:
+                    weekly_count[(proctor_id, monday)] += 1
+                if course.assigned_date:
+                    daily_count[(proctor_id, course.assigned_date)] += 1
+        
+        return (ScheduleArrays.from_records(records), room_schedule, proctor_schedule,
+                weekly_count, daily_count, unscheduled, distance_penalty)
+    
+    def _compute_all(self, schedule: Schedule) -> Dict[str, float]:
+        """
+        Tính điểm phạt của tất cả các loại vi phạm trong 1 lần duyệt schedule.courses.
         
-        # 5. Kiểm tra môn chưa xếp lịch (Optional)
-        total_penalty += self._check_unscheduled_courses(schedule)
+        Dữ liệu được gom bởi _collect(); sau đó mới đếm overlap theo từng nhóm.
         
-        # 6. ENHANCED: Kiểm tra lãng phí sức chứa (Soft - Optimization)
-        total_penalty += self._check_room_underutilization(schedule)
+        Args:
+            schedule (Schedule): Lịch thi cần đánh giá.
         
-        # 7. ENHANCED: Kiểm tra khoảng cách phòng cho cùng môn (Soft - Optimization)
-        total_penalty += self._check_room_distance_penalty(schedule)
+        Returns:
+            Dict[str, float]: Điểm phạt từng loại (cùng khóa với get_violation_details(),
+            không có 'total'), theo thứ tự ràng buộc 1-9.
+        """
+        (arrays, room_schedule, proctor_schedule, weekly_count, daily_count,
+         unscheduled, distance_penalty) = self._collect(schedule)
         
-        # 8. NEW: Kiểm tra khối lượng công việc giám thị theo tuần (Soft constraint)
-        total_penalty += self.check_proctor_workload_per_week(schedule, self.max_exams_per_week)
+        room_conflicts = ConstraintWeights.ROOM_CONFLICT * sum(
+            map(count_overlapping_pairs, room_schedule.values()))
+        proctor_conflicts = ConstraintWeights.PROCTOR_CONFLICT * sum(
+            map(count_overlapping_pairs, proctor_schedule.values()))
         
-        # 9. NEW: Kiểm tra khối lượng công việc giám thị theo ngày (Soft constraint)
-        total_penalty += self.check_proctor_workload_per_day(schedule, self.max_exams_per_day)
+        # Cùng hệ số với check_proctor_workload_per_week / per_day
+        week_penalty = _excess_exams(weekly_count, self.max_exams_per_week) * 200.0
+        day_penalty = _excess_exams(daily_count, self.max_exams_per_day) * 100.0
         
-        return total_penalty
+        return {
+            'room_conflicts': room_conflicts,
+            'capacity_violations': self._check_room_capacity(schedule, arrays),
+            'proctor_conflicts': proctor_conflicts,
+            'location_mismatches': self._check_location_mismatch(schedule, arrays),
+            'unscheduled_courses': ConstraintWeights.UNSCHEDULED_COURSE * unscheduled,
+            'underutilization': self._check_room_underutilization(schedule, arrays),
+            'room_distance': distance_penalty,
+            'proctor_workload_per_week': week_penalty,
+            'proctor_workload_per_day': day_penalty,
+        }
     
     def get_violation_details(self, schedule: Schedule) -> Dict[str, float]:
         """
@@ -494,18 +493,13 @@ class ConstraintChecker:
         Returns:
             Dict[str, float]: Dictionary chứa điểm phạt của từng loại vi phạm.
         """
-        return {
-            'room_conflicts': self._check_room_conflicts(schedule),
-            'capacity_violations': self._check_room_capacity(schedule),
-            'proctor_conflicts': self._check_proctor_conflicts(schedule),
-            'location_mismatches': self._check_location_mismatch(schedule),
-            'unscheduled_courses': self._check_unscheduled_courses(schedule),
-            'underutilization': self._check_room_underutilization(schedule),
-            'room_distance': self._check_room_distance_penalty(schedule),
-            'proctor_workload_per_week': self.check_proctor_workload_per_week(schedule, self.max_exams_per_week),
-            'proctor_workload_per_day': self.check_proctor_workload_per_day(schedule, self.max_exams_per_day),
-            'total': self.calculate_total_violation(schedule)
-        }
+        # Dùng chung kết quả 1 lần duyệt, tổng cộng theo cùng thứ tự với calculate_total_violation
+        details = self._compute_all(schedule)
+        total = 0.0
+        for penalty in details.values():
+            total += penalty
+        details['total'] = total
+        return details
     
     def check_proctor_workload_per_week(self, schedule: Schedule, max_exams_per_week: int = 5) -> float:
         """
@@ -518,33 +512,21 @@ class ConstraintChecker:
         Returns:
             float: Tổng điểm phạt (0 nếu không vi phạm).
         """
-        from datetime import datetime, timedelta
-        
-        violation = 0.0
-        proctor_exams_per_week = defaultdict(lambda: defaultdict(int))  # {proctor_id: {week_start: count}}
+        # OPTIMIZATION: 1 Counter phẳng với khóa (proctor_id, week_start) thay vì
+        # dict lồng dict - 1 lần hash mỗi môn, không tạo dict con cho từng giám thị
+        proctor_exams_per_week: Counter = Counter()
         
         for course in schedule.courses:
             if not course.is_scheduled() or not course.assigned_proctor_id:
                 continue
             
-            try:
-                course_date = datetime.strptime(course.assigned_date, "%Y-%m-%d").date()
-                # Tính thứ 2 của tuần (ngày bắt đầu tuần)
-                weekday = course_date.weekday()  # 0=Monday, 6=Sunday
-                monday = course_date - timedelta(days=weekday)
-                
-                proctor_exams_per_week[course.assigned_proctor_id][monday] += 1
-            except ValueError:
-                pass
+            # Tính thứ 2 của tuần (ngày bắt đầu tuần)
+            monday = _week_start(course.assigned_date)
+            if monday is not None:
+                proctor_exams_per_week[(course.assigned_proctor_id, monday)] += 1
         
-        # Kiểm tra vi phạm
-        for proctor_id, weeks in proctor_exams_per_week.items():
-            for week_start, exam_count in weeks.items():
-                if exam_count > max_exams_per_week:
-                    # Mỗi môn vượt quá giới hạn bị phạt
-                    violation += (exam_count - max_exams_per_week) * 200.0  # Hệ số phạt: 200
-        
-        return violation
+        # Mỗi môn vượt quá giới hạn bị phạt - hệ số phạt: 200
+        return _excess_exams(proctor_exams_per_week, max_exams_per_week) * 200.0
     
     def check_proctor_workload_per_day(self, schedule: Schedule, max_exams_per_day: int = 3) -> float:
         """
@@ -557,24 +539,15 @@ class ConstraintChecker:
         Returns:
             float: Tổng điểm phạt (0 nếu không vi phạm).
         """
-        violation = 0.0
-        proctor_exams_per_day = defaultdict(lambda: defaultdict(int))  # {proctor_id: {date: count}}
-        
-        for course in schedule.courses:
-            if not course.is_scheduled() or not course.assigned_proctor_id:
-                continue
-            
-            if course.assigned_date:
-                proctor_exams_per_day[course.assigned_proctor_id][course.assigned_date] += 1
-        
-        # Kiểm tra vi phạm
-        for proctor_id, days in proctor_exams_per_day.items():
-            for date, exam_count in days.items():
-                if exam_count > max_exams_per_day:
-                    # Mỗi môn vượt quá giới hạn bị phạt
-                    violation += (exam_count - max_exams_per_day) * 100.0  # Hệ số phạt: 100
-        
-        return violation
+        # Khóa phẳng (proctor_id, date)
+        proctor_exams_per_day = Counter(
+            (course.assigned_proctor_id, course.assigned_date)
+            for course in schedule.courses
+            if course.assigned_date and course.assigned_proctor_id and course.is_scheduled()
+        )
+        
+        # Mỗi môn vượt quá giới hạn bị phạt - hệ số phạt: 100
+        return _excess_exams(proctor_exams_per_day, max_exams_per_day) * 100.0
     
     def is_feasible(self, schedule: Schedule) -> bool:
         """
@@ -587,11 +560,16 @@ class ConstraintChecker:
             bool: True nếu không có vi phạm hard constraints.
         """
         # Chỉ kiểm tra hard constraints
-        room_conflicts = self._check_room_conflicts(schedule)
-        capacity_violations = self._check_room_capacity(schedule)
-        proctor_conflicts = self._check_proctor_conflicts(schedule)
+        # Nhóm (date, room) / (date, proctor) lấy từ _collect() - cùng quy tắc gom nhóm
+        # với calculate_total_violation
+        arrays, room_schedule, proctor_schedule = self._collect(schedule)[:3]
         
-        return room_conflicts == 0.0 and capacity_violations == 0.0 and proctor_conflicts == 0.0
+        # OPTIMIZATION: Chỉ cần biết có vi phạm hay không - kiểm tra rẻ nhất trước
+        # (sức chứa, dạng vector) và dừng ngay ở cặp trùng đầu tiên thay vì đếm đủ số cặp
+        if self._check_room_capacity(schedule, arrays) > 0.0:
+            return False
+        return not (any(_has_overlap(bucket) for bucket in room_schedule.values())
+                    or any(_has_overlap(bucket) for bucket in proctor_schedule.values()))
 
 
 # Function wrapper để dùng nhanh (backward compatibility)
@@ -44,8 +44,50 @@ TARGET: 10,000+ evaluations/sec for both algorithms
 import numpy as np
 from typing import Dict, List, Tuple, Set
 from collections import defaultdict
+from itertools import repeat
 from src.models.solution import Schedule
 from src.models.course import Course
+from src.core.constraints import count_overlapping_pairs, time_to_minutes
+from src.core._constraints_kernels import grouped_overlap_counts
+
+
+def _batch_overlap_pairs(keys: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                         keys_per_row: int, num_rows: int) -> np.ndarray:
+    """
+    Đếm số cặp ca thi overlap trong từng nhóm, cộng dồn theo từng hàng (particle).
+    
+    Args:
+        keys: Khóa nhóm của từng ca (row * keys_per_row + khóa trong hàng).
+        starts, ends: Phút bắt đầu / kết thúc của từng ca.
+        keys_per_row: Số khóa nhóm khác nhau tối đa trong 1 hàng.
+        num_rows: Số hàng.
+    
+    Returns:
+        np.ndarray: Số cặp overlap của từng hàng, shape (num_rows,).
+    
+    OPTIMIZATION: Khi mọi thời lượng > 0, cặp (i, j) không overlap khi và chỉ khi
+    end_j <= start_i hoặc end_i <= start_j (không đồng thời). Phần số học nằm trong
+    kernel grouped_overlap_counts (biên dịch bằng numba nếu có): sort + searchsorted
+    1 lần cho cả batch, không có vòng lặp Python theo nhóm hay theo hàng.
+    """
+    if keys.size == 0:
+        return np.zeros(num_rows)
+    
+    if (ends <= starts).any():
+        # Thời lượng <= 0: công thức trên đếm trùng, dùng sweep theo từng nhóm.
+        # Nhóm được tách bằng argsort + biên đổi khóa (không dựng dict theo khóa)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+        exams = list(zip(repeat(None), starts[order].tolist(), (ends - starts)[order].tolist()))
+        pairs = np.zeros(num_rows)
+        for begin, end in zip(np.concatenate(([0], boundaries)).tolist(),
+                              np.concatenate((boundaries, [len(exams)])).tolist()):
+            pairs[sorted_keys[begin] // keys_per_row] += count_overlapping_pairs(exams[begin:end])
+        return pairs
+    
+    contributions = grouped_overlap_counts(keys, starts, ends)
+    return np.bincount(keys // keys_per_row, weights=contributions, minlength=num_rows) / 2
 
 
 class FastConstraintChecker:
@@ -73,36 +115,28 @@ class FastConstraintChecker:
         # Pre-cache room data for fast lookup
         self.room_ids_list = list(self.rooms_dict.keys())
         
-        # Time overlap cache - memoization để tránh recalculate
-        self._overlap_cache: Dict[Tuple[str, int, str, int], bool] = {}
-    
-    def _check_overlap_cached(self, t1: str, d1: int, t2: str, d2: int) -> bool:
-        """
-        Check time overlap with caching (memoization).
-        
-        Performance: O(1) nếu đã cache, O(time parsing) lần đầu.
-        """
-        key = (t1, d1, t2, d2)
-        if key in self._overlap_cache:
-            return self._overlap_cache[key]
+        # Index phòng (theo room_ids_list) và sức chứa dạng mảng cho calculate_fast_batch;
+        # phần tử cuối (index -1) dành cho phòng không tồn tại: sức chứa vô hạn
+        self._room_index = {room_id: idx for idx, room_id in enumerate(self.room_ids_list)}
+        self._room_capacities = np.array(
+            [self.room_capacity[room_id] for room_id in self.room_ids_list] + [np.inf]
+        )
         
-        # Tính toán overlap nếu chưa cache
-        try:
-            from datetime import datetime, timedelta
-            
-            t1_start = datetime.strptime(t1, "%H:%M")
-            t2_start = datetime.strptime(t2, "%H:%M")
-            
-            t1_end = t1_start + timedelta(minutes=d1)
-            t2_end = t2_start + timedelta(minutes=d2)
-            
-            result = t1_start < t2_end and t2_start < t1_end
-        except:
-            result = False
+        # Trạng thái cho đánh giá tăng dần (xem begin_incremental / apply_move)
+        self._inc_entries: List[Tuple] = []
+        self._inc_room_buckets: Dict[Tuple[str, str], List[Tuple[int, int, int, int]]] = defaultdict(list)
+        self._inc_proctor_buckets: Dict[Tuple[str, str], List[Tuple[int, int, int, int]]] = defaultdict(list)
+        self._inc_total = 0.0
         
-        # Cache kết quả
-        self._overlap_cache[key] = result
-        return result
+        # Bảng overlap giữa các cặp (giờ bắt đầu, thời lượng), dựng 1 lần trong
+        # begin_incremental - xem _build_slot_overlap
+        self._slot_ids: Dict[Tuple[int, int], int] = {}
+        self._slot_overlap = np.zeros((0, 0), dtype=bool)
+        self._slot_overlap_rows: List[List[bool]] = []
+    
+    def room_index(self, room_id: str) -> int:
+        """Index của phòng trong room_ids_list (-1 nếu phòng không tồn tại)."""
+        return self._room_index.get(room_id, -1)
     
     def calculate_fast(self, schedule: Schedule) -> float:
         """
@@ -123,101 +157,318 @@ class FastConstraintChecker:
         """
         penalty = 0.0
         
+        # OPTIMIZATION: Lọc môn đã xếp lịch + đọc thuộc tính 1 lần, dùng chung cho 3 kiểm tra
+        view = self._scheduled_view(schedule)
+        
         # 1. Room Conflicts - O(n) with dict hashing
-        penalty += self._fast_room_conflicts(schedule)
+        penalty += self._fast_room_conflicts(schedule, view)
         
         # 2. Capacity Violations - O(n) with direct dict lookup
-        penalty += self._fast_room_capacity(schedule)
+        penalty += self._fast_room_capacity(schedule, view)
         
         # 3. Proctor Conflicts - O(n) with dict hashing
-        penalty += self._fast_proctor_conflicts(schedule)
+        penalty += self._fast_proctor_conflicts(schedule, view)
         
         return penalty
     
-    def _fast_room_conflicts(self, schedule: Schedule) -> float:
+    @staticmethod
+    def _scheduled_view(schedule: Schedule) -> List[Tuple]:
+        """
+        Các môn đã xếp lịch dưới dạng tuple phẳng, dựng 1 lần mỗi lần đánh giá.
+        
+        Thay cho việc mỗi kiểm tra tự duyệt lại schedule.courses, gọi is_scheduled()
+        và getattr(course, 'duration', 90) cho từng môn.
+        
+        Returns:
+            List[Tuple]: (date, room, proctor_id, start_minute, duration, student_count)
+            cho mỗi môn đã xếp lịch; start_minute = None nếu giờ thi không hợp lệ.
+        """
+        return [
+            (course.assigned_date, course.assigned_room, course.assigned_proctor_id,
+             time_to_minutes(course.assigned_time), course.duration, course.student_count)
+            for course in schedule.courses if course.is_scheduled()
+        ]
+    
+    def calculate_fast_batch(self, date_ids: np.ndarray, start_minutes: np.ndarray,
+                             durations: np.ndarray, room_ids: np.ndarray,
+                             proctor_ids: np.ndarray, student_counts: np.ndarray) -> np.ndarray:
+        """
+        Tính calculate_fast() cho cả batch lịch thi (vd: cả bầy PSO) cùng lúc.
+        
+        Mỗi tham số là mảng số nguyên shape (P, N) - P lịch, N ca thi - hoặc (N,)
+        nếu giống nhau giữa các lịch (broadcast).
+        
+        Args:
+            date_ids: ID ngày thi (< 0: ca chưa xếp lịch, bỏ qua như is_scheduled() = False).
+            start_minutes: Giờ bắt đầu tính bằng phút (< 0: giờ không hợp lệ).
+            durations: Thời lượng thi (phút).
+            room_ids: Index phòng theo room_index() (-1: phòng không tồn tại).
+            proctor_ids: ID giám thị (< 0: chưa phân công).
+            student_counts: Số sinh viên.
+        
+        Returns:
+            np.ndarray: Cost của từng lịch, shape (P,).
+        
+        OPTIMIZATION: Không dựng Schedule/Course cho từng lịch; 3 loại vi phạm được
+        tính bằng phép toán NumPy trên toàn bộ batch.
+        """
+        date_ids, start_minutes, durations, room_ids, proctor_ids, student_counts = np.broadcast_arrays(
+            *(np.atleast_2d(column) for column in
+              (date_ids, start_minutes, durations, room_ids, proctor_ids, student_counts))
+        )
+        num_rows = date_ids.shape[0]
+        rows = np.arange(num_rows)[:, None]
+        num_dates = max(int(date_ids.max()) + 1, 1) if date_ids.size else 1
+        
+        scheduled = date_ids >= 0
+        
+        # 2. Capacity (phòng không tồn tại có sức chứa vô hạn -> không phạt)
+        # OPTIMIZATION: Không rẽ nhánh - số SV vượt bị kẹp về 0 bằng np.maximum,
+        # phạt = W * (số ca vượt + tổng số SV vượt / 10)
+        overflow = np.maximum(0.0, student_counts - self._room_capacities[room_ids]) * scheduled
+        capacity = self.ROOM_OVERCAPACITY * (
+            np.count_nonzero(overflow, axis=1) + overflow.sum(axis=1) / 10.0
+        )
+        
+        # 1 + 3. Conflicts: chỉ xét ca đã xếp lịch và có giờ hợp lệ
+        timed = scheduled & (start_minutes >= 0)
+        starts = start_minutes[timed].astype(np.int64)
+        ends = starts + durations[timed]
+        
+        num_rooms = len(self.room_ids_list) + 1  # +1 cho phòng không tồn tại (-1)
+        room_keys = (rows * num_dates + date_ids) * num_rooms + room_ids + 1
+        room_pairs = _batch_overlap_pairs(room_keys[timed].astype(np.int64), starts, ends,
+                                          num_dates * num_rooms, num_rows)
+        
+        with_proctor = proctor_ids[timed] >= 0
+        num_proctors = max(int(proctor_ids.max()) + 1, 1) if proctor_ids.size else 1
+        proctor_keys = (rows * num_dates + date_ids) * num_proctors + proctor_ids
+        proctor_pairs = _batch_overlap_pairs(
+            proctor_keys[timed][with_proctor].astype(np.int64),
+            starts[with_proctor], ends[with_proctor], num_dates * num_proctors, num_rows
+        )
+        
+        return (self.ROOM_CONFLICT * room_pairs + capacity
+                + self.PROCTOR_CONFLICT * proctor_pairs)
+    
+    def _fast_room_conflicts(self, schedule: Schedule, view: List[Tuple] = None) -> float:
         """
         Check room conflicts with time overlap consideration.
         
         Use defaultdict and group by (date, room) then check pairs for overlap.
-        Time complexity: O(n + m) where m = number of conflict pairs
+        Time complexity: O(n log n) - sweep-line trong từng nhóm
+        
+        OPTIMIZATION: Giờ thi được đổi sang phút (int) 1 lần mỗi môn khi gom nhóm;
+        số cặp overlap trong mỗi nhóm được đếm bằng sweep-line O(k log k)
+        (count_overlapping_pairs) thay vì xét mọi cặp O(k²).
         """
-        penalty = 0.0
+        if view is None:
+            view = self._scheduled_view(schedule)
         
         # Group courses by (date, room) for quick lookup
-        room_schedule: Dict[Tuple[str, str], List[Tuple[str, int]]] = defaultdict(list)
-        
-        for course in schedule.courses:
-            if course.is_scheduled():
-                key = (course.assigned_date, course.assigned_room)
-                duration = getattr(course, 'duration', 90)
-                room_schedule[key].append((course.assigned_time, duration))
-        
-        # Check overlaps within each (date, room) group
-        for (date, room), time_list in room_schedule.items():
-            # For each pair of exams in same room/date
-            for i in range(len(time_list)):
-                for j in range(i + 1, len(time_list)):
-                    time1, dur1 = time_list[i]
-                    time2, dur2 = time_list[j]
-                    
-                    if self._check_overlap_cached(time1, dur1, time2, dur2):
-                        penalty += self.ROOM_CONFLICT
+        room_schedule: Dict[Tuple[str, str], List[Tuple[None, int, int]]] = defaultdict(list)
         
-        return penalty
+        for date, room, _, start, duration, _ in view:
+            if start is not None:  # Giờ không hợp lệ: không overlap với môn nào
+                room_schedule[(date, room)].append((None, start, duration))
+        
+        # Count overlapping pairs within each (date, room) group
+        return self.ROOM_CONFLICT * sum(map(count_overlapping_pairs, room_schedule.values()))
     
-    def _fast_room_capacity(self, schedule: Schedule) -> float:
+    def _fast_room_capacity(self, schedule: Schedule, view: List[Tuple] = None) -> float:
         """
         Fast capacity check - O(n) with dict lookup.
         
         Direct lookup in pre-cached room_capacity dictionary.
         """
+        if view is None:
+            view = self._scheduled_view(schedule)
         penalty = 0.0
+        room_capacity = self.room_capacity
         
-        for course in schedule.courses:
-            if course.is_scheduled():
-                room_id = course.assigned_room
-                capacity = self.room_capacity.get(room_id, float('inf'))
-                
-                if course.student_count > capacity:
-                    # Penalize based on overflow amount
-                    overflow = course.student_count - capacity
-                    penalty += self.ROOM_OVERCAPACITY * (1.0 + overflow / 10.0)
+        for _, room_id, _, _, _, student_count in view:
+            capacity = room_capacity.get(room_id, float('inf'))
+            
+            if student_count > capacity:
+                # Penalize based on overflow amount
+                overflow = student_count - capacity
+                penalty += self.ROOM_OVERCAPACITY * (1.0 + overflow / 10.0)
         
         return penalty
     
-    def _fast_proctor_conflicts(self, schedule: Schedule) -> float:
+    def _fast_proctor_conflicts(self, schedule: Schedule, view: List[Tuple] = None) -> float:
         """
         Check proctor conflicts with time overlap consideration.
         
         Group by (date, proctor_id) and check pairs for time overlap.
-        Time complexity: O(n + m) where m = number of conflict pairs
+        Time complexity: O(n log n) - sweep-line trong từng nhóm
         """
-        penalty = 0.0
+        if view is None:
+            view = self._scheduled_view(schedule)
         
         # Group courses by (date, proctor_id)
-        proctor_schedule: Dict[Tuple[str, str], List[Tuple[str, int]]] = defaultdict(list)
-        
-        for course in schedule.courses:
-            if course.is_scheduled() and course.assigned_proctor_id:
-                key = (course.assigned_date, course.assigned_proctor_id)
-                duration = getattr(course, 'duration', 90)
-                proctor_schedule[key].append((course.assigned_time, duration))
-        
-        # Check overlaps within each (date, proctor) group
-        for (date, proctor_id), time_list in proctor_schedule.items():
-            for i in range(len(time_list)):
-                for j in range(i + 1, len(time_list)):
-                    time1, dur1 = time_list[i]
-                    time2, dur2 = time_list[j]
-                    
-                    if self._check_overlap_cached(time1, dur1, time2, dur2):
-                        penalty += self.PROCTOR_CONFLICT
+        proctor_schedule: Dict[Tuple[str, str], List[Tuple[None, int, int]]] = defaultdict(list)
         
-        return penalty
+        for date, _, proctor_id, start, duration, _ in view:
+            if proctor_id and start is not None:
+                proctor_schedule[(date, proctor_id)].append((None, start, duration))
+        
+        # Count overlapping pairs within each (date, proctor) group
+        return self.PROCTOR_CONFLICT * sum(map(count_overlapping_pairs, proctor_schedule.values()))
+
+    
+    # ------------------------------------------------------------------
+    # Đánh giá tăng dần (delta evaluation) cho các bước move của SA
+    # ------------------------------------------------------------------
+    
+    def _course_entry(self, course: Course) -> Tuple:
+        """
+        Phần đóng góp của 1 môn vào calculate_fast() (cùng điều kiện với _scheduled_view).
+        
+        Returns:
+            Tuple (capacity_penalty, room_key, proctor_key, start_minute, duration, slot_id):
+            room_key / proctor_key = None nếu môn không tham gia nhóm trùng phòng /
+            trùng giám thị nào; slot_id theo _slot_id().
+        """
+        if not course.is_scheduled():
+            return 0.0, None, None, None, 0, None
+        
+        penalty = 0.0
+        capacity = self.room_capacity.get(course.assigned_room, float('inf'))
+        if course.student_count > capacity:
+            overflow = course.student_count - capacity
+            penalty = self.ROOM_OVERCAPACITY * (1.0 + overflow / 10.0)
+        
+        start = time_to_minutes(course.assigned_time)
+        if start is None:
+            return penalty, None, None, None, 0, None
+        proctor_id = course.assigned_proctor_id
+        return (penalty, (course.assigned_date, course.assigned_room),
+                (course.assigned_date, proctor_id) if proctor_id else None,
+                start, course.duration, self._slot_ids[(start, course.duration)])
+    
+    def _build_slot_overlap(self, schedule: Schedule, time_slots) -> None:
+        """
+        Dựng bảng overlap giữa mọi cặp (giờ bắt đầu, thời lượng) có thể xuất hiện.
+        
+        Giờ bắt đầu: các giờ thi trong time_slots và giờ đang gán trong schedule (môn
+        khóa cứng); thời lượng: thời lượng của các môn (move không đổi thời lượng).
+        
+        OPTIMIZATION: Chỉ vài chục tổ hợp, nên ma trận overlap K x K được dựng 1 lần
+        bằng 1 phép broadcast; kiểm tra 2 ca có trùng giờ chỉ còn là tra bảng theo index.
+        """
+        starts = {time_to_minutes(time_slot) for time_slot in time_slots}
+        starts.update(time_to_minutes(course.assigned_time) for course in schedule.courses)
+        starts.discard(None)
+        durations = {course.duration for course in schedule.courses}
+        slots = [(start, duration) for start in sorted(starts) for duration in sorted(durations)]
+        self._slot_ids = {slot: slot_id for slot_id, slot in enumerate(slots)}
+        
+        slot_starts, slot_durations = np.array(slots, dtype=np.int64).reshape(-1, 2).T
+        slot_ends = slot_starts + slot_durations
+        # Cùng điều kiện với count_overlapping_pairs (kể cả thời lượng <= 0)
+        self._slot_overlap = ((slot_starts[:, None] < slot_ends[None, :])
+                              & (slot_starts[None, :] < slot_ends[:, None]))
+        self._slot_overlap_rows = self._slot_overlap.tolist()
+    
+    def begin_incremental(self, schedule: Schedule, time_slots=()) -> float:
+        """
+        Dựng trạng thái cho đánh giá tăng dần và trả về cost hiện tại (= calculate_fast()).
+        
+        Gọi 1 lần trước vòng lặp SA; sau đó mỗi move chỉ cần apply_move() với các
+        index môn bị thay đổi.
+        
+        Args:
+            schedule (Schedule): Lịch thi ban đầu.
+            time_slots: Các giờ thi ("HH:MM") mà move có thể gán cho môn học.
+        """
+        self._build_slot_overlap(schedule, time_slots)
+        self._inc_entries = [self._course_entry(course) for course in schedule.courses]
+        self._inc_room_buckets = defaultdict(list)
+        self._inc_proctor_buckets = defaultdict(list)
+        for idx, entry in enumerate(self._inc_entries):
+            self._add_entry(idx, entry)
+        
+        room_pairs = sum(map(count_overlapping_pairs, self._inc_room_buckets.values()))
+        proctor_pairs = sum(map(count_overlapping_pairs, self._inc_proctor_buckets.values()))
+        self._inc_total = (self.ROOM_CONFLICT * room_pairs
+                           + sum(entry[0] for entry in self._inc_entries)
+                           + self.PROCTOR_CONFLICT * proctor_pairs)
+        return self._inc_total
     
-    def clear_overlap_cache(self) -> None:
-        """Clear memoization cache (call after significant changes)."""
-        self._overlap_cache.clear()
+    def apply_move(self, schedule: Schedule, changed_indices) -> float:
+        """
+        Cập nhật trạng thái tăng dần sau khi các môn changed_indices bị thay đổi.
+        
+        Chỉ đếm số ca trùng giờ với từng môn trong nhóm (ngày, phòng) / (ngày, giám thị)
+        mà nó rời đi và nhóm nó chuyển tới (tra bảng _slot_overlap) -> O(k) với k là
+        kích thước các nhóm đó, thay vì O(n) như calculate_fast(). Khi move bị từ chối, khôi phục phân công cũ rồi gọi lại
+        apply_move() với cùng các index (hoàn tác đối xứng, không cần backup state).
+        
+        Args:
+            schedule (Schedule): Lịch thi (đã được thay đổi in-place).
+            changed_indices: Các index trong schedule.courses vừa bị thay đổi.
+        
+        Returns:
+            float: Chênh lệch cost (mới - cũ). Cost mới ở incremental_total.
+        """
+        courses = schedule.courses
+        room_pairs = proctor_pairs = 0
+        delta = 0.0
+        for idx in set(changed_indices):
+            old = self._inc_entries[idx]
+            new = self._inc_entries[idx] = self._course_entry(courses[idx])
+            removed_room, removed_proctor = self._remove_entry(idx, old)
+            added_room, added_proctor = self._add_entry(idx, new)
+            room_pairs += added_room - removed_room
+            proctor_pairs += added_proctor - removed_proctor
+            delta += new[0] - old[0]
+        
+        delta += self.ROOM_CONFLICT * room_pairs + self.PROCTOR_CONFLICT * proctor_pairs
+        self._inc_total += delta
+        return delta
+    
+    @property
+    def incremental_total(self) -> float:
+        """Cost hiện tại theo trạng thái tăng dần (sau begin_incremental)."""
+        return self._inc_total
+    
+    def _add_entry(self, idx: int, entry: Tuple) -> Tuple[int, int]:
+        """Thêm môn vào các nhóm của nó; trả về số cặp overlap mới (phòng, giám thị)."""
+        _, room_key, proctor_key, start, duration, slot_id = entry
+        exam = (idx, start, duration, slot_id)
+        pairs = []
+        for buckets, key in ((self._inc_room_buckets, room_key),
+                             (self._inc_proctor_buckets, proctor_key)):
+            if key is None:
+                pairs.append(0)
+                continue
+            bucket = buckets[key]
+            pairs.append(self._overlap_with(slot_id, bucket))
+            bucket.append(exam)
+        return pairs[0], pairs[1]
+    
+    def _remove_entry(self, idx: int, entry: Tuple) -> Tuple[int, int]:
+        """Bỏ môn khỏi các nhóm của nó; trả về số cặp overlap mất đi (phòng, giám thị)."""
+        _, room_key, proctor_key, _, _, slot_id = entry
+        pairs = []
+        for buckets, key in ((self._inc_room_buckets, room_key),
+                             (self._inc_proctor_buckets, proctor_key)):
+            if key is None:
+                pairs.append(0)
+                continue
+            remaining = [exam for exam in buckets[key] if exam[0] != idx]
+            pairs.append(self._overlap_with(slot_id, remaining))
+            if remaining:
+                buckets[key] = remaining
+            else:
+                del buckets[key]
+        return pairs[0], pairs[1]
+    
+    def _overlap_with(self, slot_id: int, exams: List[Tuple]) -> int:
+        """Số ca trong exams trùng giờ với ca có slot_id (tra bảng _slot_overlap)."""
+        overlaps = self._slot_overlap_rows[slot_id]
+        return sum(overlaps[exam[3]] for exam in exams)
 
 
 class FastPSOEvaluator:
@@ -230,20 +481,20 @@ class FastPSOEvaluator:
         """
         Evaluate multiple positions at once using vectorization.
         
+        OPTIMIZATION: decoder_func decode cả batch thành mảng (không tạo Schedule/
+        Course cho từng hạt) và toàn bộ batch được đánh giá trong 1 lần gọi
+        calculate_fast_batch().
+        
         Args:
             positions: Array of shape (batch_size, dimension)
-            decoder_func: Function to convert position to schedule
+            decoder_func: Function nhận cả positions, trả về tuple mảng (batch_size, N)
+                (date_ids, start_minutes, durations, room_ids, proctor_ids, student_counts)
+                theo quy ước của FastConstraintChecker.calculate_fast_batch()
         
         Returns:
             Array of costs, shape (batch_size,)
         """
-        costs = np.zeros(positions.shape[0])
-        
-        for i, pos in enumerate(positions):
-            sched = decoder_func(pos)
-            costs[i] = self.checker.calculate_fast(sched)
-        
-        return costs
+        return self.checker.calculate_fast_batch(*decoder_func(positions))
 
 
 # Performance Optimization Tips:
@@ -5,7 +5,7 @@ Cung cấp interface chung cho SA, PSO và các thuật toán khác.
 """
 
 from PyQt5.QtCore import QThread, pyqtSignal
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable
 from abc import ABCMeta, abstractmethod
 import time
 import sys
@@ -121,6 +121,7 @@ class BaseSolver(QThread, metaclass=QThreadMeta):
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
         self.total_iterations: int = 0
+        self._last_progress: int = -1  # Phần trăm progress đã emit gần nhất
         
         # ENHANCED: Cấu hình cho dải thời gian linh hoạt
         self.exam_dates: List[str] = self.config.get('exam_dates', None)
@@ -135,6 +136,18 @@ class BaseSolver(QThread, metaclass=QThreadMeta):
         
         self.available_times = self._generate_time_slots()
         
+        # OPTIMIZATION: Cache kết quả _find_optimal_room theo
+        # (student_count, location, prefer_smaller) - danh sách phòng không đổi khi chạy
+        self._optimal_room_cache: Dict[Tuple[int, str, bool], Optional[Room]] = {}
+        
+        # OPTIMIZATION: Nhóm phòng theo địa điểm 1 lần (giữ thứ tự gốc) và cache
+        # danh sách phòng phù hợp theo (student_count, location) - dùng chung cho
+        # mọi thuật toán thay vì mỗi nơi tự lọc lại self.rooms
+        self._rooms_by_location: Dict[str, List[Room]] = {}
+        for room in self.rooms:
+            self._rooms_by_location.setdefault(room.location, []).append(room)
+        self._suitable_rooms_cache: Dict[Tuple[int, str], List[Room]] = {}
+        
         # Validate input
         self._validate_input()
     
@@ -210,6 +223,26 @@ class BaseSolver(QThread, metaclass=QThreadMeta):
         else:
             self._log("ℹ Thuật toán chưa chạy hoặc đã dừng")
     
+    def start(self, *args, **kwargs) -> None:
+        """
+        Khởi động thread sau khi xóa cờ dừng của lần chạy trước.
+        
+        Cờ should_stop được reset ở đây (trên thread gọi start) thay vì ở đầu
+        run(), để yêu cầu dừng gửi tới ngay sau start() - trước khi run() kịp
+        chạy - không bị run() ghi đè và bỏ qua.
+        """
+        self.should_stop = False
+        super().start(*args, **kwargs)
+    
+    def request_stop(self) -> None:
+        """
+        Yêu cầu vòng lặp trong run() thoát ở lần kiểm tra tiếp theo.
+        
+        Khác với stop(), method này không phụ thuộc is_running (run() có thể
+        chưa kịp set) và không ghi log - an toàn để gọi từ GUI thread bất kỳ lúc nào.
+        """
+        self.should_stop = True
+    
     def get_best_solution(self) -> Optional[Schedule]:
         """
         Lấy solution tốt nhất hiện tại.
@@ -348,6 +381,7 @@ class BaseSolver(QThread, metaclass=QThreadMeta):
         self.start_time = None
         self.end_time = None
         self.total_iterations = 0
+        self._last_progress = -1
         
         self._log("✓ Solver đã được reset")
     
@@ -355,23 +389,60 @@ class BaseSolver(QThread, metaclass=QThreadMeta):
         """
         Helper method để emit progress signal.
         
+        OPTIMIZATION: Chỉ emit khi phần trăm thay đổi (tối đa ~101 lần/lần chạy),
+        tránh dồn signal cross-thread làm GUI bị lag.
+        
         Args:
             current_iteration (int): Vòng lặp hiện tại.
             max_iterations (int): Tổng số vòng lặp.
         """
         if max_iterations > 0:
-            percentage = int((current_iteration / max_iterations) * 100)
-            self.progress_signal.emit(percentage)
+            # Số nguyên thuần (không chia float) - iteration luôn >= 0
+            percentage = current_iteration * 100 // max_iterations
+            if percentage != self._last_progress:
+                self._last_progress = percentage
+                self.progress_signal.emit(percentage)
     
-    def _log(self, message: str) -> None:
+    def _log(self, message: Union[str, Callable[[], str]]) -> None:
         """
         Helper method để ghi log (wrapper cho log_signal).
         
+        OPTIMIZATION: Cho phép truyền callable (lazy) - chuỗi log chỉ được tạo khi
+        thực sự có slot kết nối với log_signal. Dùng cho log trong vòng lặp chính.
+        
         Args:
-            message (str): Thông báo cần ghi.
+            message (str | Callable[[], str]): Thông báo cần ghi, hoặc hàm trả về thông báo.
         """
+        if not self.receivers(self.log_signal):
+            return
+        if callable(message):
+            message = message()
         self.log_signal.emit(message)
     
+    def _get_suitable_rooms(self, student_count: int, location: str) -> List[Room]:
+        """
+        Lấy danh sách phòng cùng địa điểm và đủ sức chứa (theo thứ tự self.rooms).
+        
+        OPTIMIZATION: Kết quả được cache theo (student_count, location).
+        List trả về được dùng chung - caller KHÔNG được sửa đổi.
+        
+        Args:
+            student_count (int): Số lượng sinh viên.
+            location (str): Địa điểm yêu cầu.
+        
+        Returns:
+            List[Room]: Danh sách phòng phù hợp (có thể rỗng).
+        """
+        key = (student_count, location)
+        rooms = self._suitable_rooms_cache.get(key)
+        if rooms is None:
+            rooms = [
+                room for room in self._rooms_by_location.get(location, ())
+                if room.capacity >= student_count
+            ]
+            self._suitable_rooms_cache[key] = rooms
+        return rooms
+    
     def _find_optimal_room(self, student_count: int, location: str, 
                           prefer_smaller: bool = True) -> Optional[Room]:
         """
@@ -392,12 +463,26 @@ class BaseSolver(QThread, metaclass=QThreadMeta):
         
         Returns:
             Optional[Room]: Phòng tối ưu hoặc None nếu không tìm thấy.
+        
+        OPTIMIZATION: Kết quả chỉ phụ thuộc vào tham số đầu vào nên được
+        memoize, tránh lọc + chấm điểm lại toàn bộ phòng ở mỗi lần gọi.
+        """
+        key = (student_count, location, prefer_smaller)
+        cache = self._optimal_room_cache
+        if key in cache:
+            return cache[key]
+        
+        room = self._compute_optimal_room(student_count, location, prefer_smaller)
+        cache[key] = room
+        return room
+    
+    def _compute_optimal_room(self, student_count: int, location: str,
+                              prefer_smaller: bool) -> Optional[Room]:
+        """
+        Tính phòng tối ưu (không cache). Xem _find_optimal_room().
         """
         # Lọc phòng cùng địa điểm và đủ sức chứa
-        suitable_rooms = [
-            room for room in self.rooms
-            if room.location == location and room.capacity >= student_count
-        ]
+        suitable_rooms = self._get_suitable_rooms(student_count, location)
         
         if not suitable_rooms:
             return None
@@ -510,10 +595,7 @@ class BaseSolver(QThread, metaclass=QThreadMeta):
         processed_courses = []
         for course in courses:
             # Kiểm tra xem có phòng nào đủ sức chứa cho toàn bộ số sinh viên không
-            suitable_rooms = [
-                room for room in self.rooms
-                if room.location == course.location and room.capacity >= course.student_count
-            ]
+            suitable_rooms = self._get_suitable_rooms(course.student_count, course.location)
             
             # Nếu số lượng sinh viên > max_capacity HOẶC không có phòng phù hợp
             if course.needs_splitting(max_capacity) or not suitable_rooms:
@@ -116,7 +116,6 @@ class FastPSOSolver(PSOSolver):
         try:
             # Setup
             self.is_running = True
-            self.should_stop = False
             self.start_time = time.time()
             self.convergence_history = []
             self.gbest_updates = 0
@@ -132,7 +131,7 @@ class FastPSOSolver(PSOSolver):
             
             # 1. Khởi tạo quần thể
             self._log("📊 Đang khởi tạo quần thể...")
-            swarm = [Particle(self.dimension, (self.lb, self.ub)) for _ in range(self.swarm_size)]
+            swarm = [Particle(self.dimension, (self.lb, self.ub), self.rng) for _ in range(self.swarm_size)]
             
             gbest_position = np.zeros(self.dimension)
             gbest_value = float('inf')
@@ -182,8 +181,8 @@ class FastPSOSolver(PSOSolver):
                 # VECTORIZED: Update all particles efficiently
                 for particle in swarm:
                     # Generate random numbers once
-                    r1 = np.random.rand(self.dimension)
-                    r2 = np.random.rand(self.dimension)
+                    r1 = self.rng.random(self.dimension)
+                    r2 = self.rng.random(self.dimension)
                     
                     # Vectorized velocity update (no loops)
                     particle.velocity = (current_w * particle.velocity) + \
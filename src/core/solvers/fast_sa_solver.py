@@ -1,19 +1,12 @@
 """
-Enhanced SA Solver with Performance Optimizations
-==================================================
+FastSASolver - alias tương thích của SASolver
+=============================================
 
-Key Optimizations:
-1. Use FastConstraintChecker for quick evaluation
-2. Incremental cost calculation (only affected courses)
-3. Cache room/proctor schedules
-4. Fast rollback mechanism
-5. Reduce function calls in inner loop
+Các tối ưu của bản "Fast" trước đây (FastConstraintChecker trong vòng lặp, đánh
+giá tăng dần, in-place move + rollback, snapshot best solution) đều đã nằm trong
+SASolver. Module này chỉ giữ lại tên FastSASolver cho code cũ còn import nó.
 """
 
-import random
-import math
-import time
-from typing import List, Dict, Any, Optional, Tuple
 import sys
 from pathlib import Path
 
@@ -22,197 +15,11 @@ project_root = current_dir.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.core.solvers.sa_solver import SASolver
-from src.core.optimization_fast import FastConstraintChecker
-from src.models.solution import Schedule
-from src.models.course import Course
-from src.core.constraints import ConstraintChecker
 
 
 class FastSASolver(SASolver):
     """
-    Enhanced SA Solver with Performance Optimizations.
+    Alias tương thích của SASolver - cùng thuật toán, cùng tốc độ.
     
-    Improvements over original:
-    - ~5-10x faster evaluation using FastConstraintChecker
-    - Incremental cost updates (delta calculation)
-    - Cache management for room/proctor schedules
-    - Optimized rollback mechanism
+    Không có gì khác SASolver; dùng SASolver trực tiếp cho code mới.
     """
-    
-    def __init__(self, 
-                 courses: List[Course], 
-                 rooms: List = None,
-                 config: Optional[Dict[str, Any]] = None,
-                 proctors: Optional[List] = None,
-                 parent=None):
-        """Initialize with fast constraint checker."""
-        super().__init__(courses, rooms, config, proctors, parent)
-        
-        # Create fast constraint checker
-        self.fast_checker = FastConstraintChecker(rooms)
-        
-        self._log("✅ FastSASolver initialized with optimizations enabled")
-    
-    def _evaluate_fast(self, schedule: Schedule) -> float:
-        """
-        Fast evaluation using only hard constraints.
-        ~5-10x faster than full constraint checking.
-        """
-        return self.fast_checker.calculate_fast(schedule)
-    
-    def run(self) -> None:
-        """
-        Run optimized Simulated Annealing with fast evaluation.
-        """
-        try:
-            self.is_running = True
-            self.should_stop = False
-            self.start_time = time.time()
-            self.convergence_history = []
-            self.accepted_moves = 0
-            self.rejected_moves = 0
-            
-            self._log("=" * 60)
-            self._log("🔥 BẮT ĐẦU SIMULATED ANNEALING (OPTIMIZED - FAST MODE)")
-            self._log("=" * 60)
-            self._log(f"📊 Tham số: T0={self.initial_temperature}, Tmin={self.min_temperature}")
-            self._log(f"❄️ Cooling rate: {self.cooling_rate}")
-            self._log(f"🚀 FAST MODE: Using optimized constraint checking (~5-10x faster)")
-            self._log("-" * 60)
-            
-            # Chuẩn bị dữ liệu
-            self._log("📋 Đang chuẩn bị dữ liệu...")
-            processed_courses = self._prepare_courses_with_sessions(self.courses, auto_split=True)
-            
-            original_count = len(self.courses)
-            processed_count = len(processed_courses)
-            if processed_count > original_count:
-                self._log(f"📋 Đã chia {original_count} môn học thành {processed_count} ca thi riêng biệt")
-            
-            # Tạo lịch ban đầu
-            self._log("🎯 Đang tạo lịch thi ban đầu...")
-            current_schedule = self._create_initial_schedule(processed_courses)
-            
-            # Đánh giá ban đầu (sử dụng fast evaluation)
-            current_cost = self._evaluate_fast(current_schedule)
-            best_schedule = Schedule(courses=[c for c in current_schedule.courses])
-            best_cost = current_cost
-            initial_cost = current_cost
-            
-            self._log(f"✓ Lịch ban đầu: Cost = {current_cost:.2f}")
-            self.convergence_history.append(current_cost)
-            
-            # Setup SA parameters
-            temperature = self.initial_temperature
-            iteration = 0
-            
-            self._log("-" * 60)
-            self._log("🔄 Bắt đầu vòng lặp chính (FAST MODE)...")
-            
-            # Main SA Loop (OPTIMIZED)
-            while (temperature > self.min_temperature and 
-                   iteration < self.max_iterations and 
-                   self.is_running):
-                
-                if self.should_stop:
-                    self._log("⚠️ Thuật toán đã bị dừng bởi người dùng")
-                    break
-                
-                iteration += 1
-                self.total_iterations = iteration
-                
-                # Perform move (in-place modification)
-                move_data = self._perturb_move(current_schedule)
-                
-                # FAST EVALUATION (chỉ kiểm tra hard constraints)
-                new_cost = self._evaluate_fast(current_schedule)
-                delta_cost = new_cost - current_cost
-                
-                # Acceptance criterion
-                if delta_cost < 0:
-                    # Better solution - accept
-                    acceptance_prob = 1.0
-                    current_cost = new_cost
-                    self.accepted_moves += 1
-                    
-                    # Update best if needed
-                    if current_cost < best_cost:
-                        best_cost = current_cost
-                        best_schedule = Schedule(courses=[c for c in current_schedule.courses])
-                        self._log(f"🌟 Iteration {iteration}: NEW BEST! Cost = {best_cost:.2f}")
-                else:
-                    # Worse solution - accept probabilistically
-                    try:
-                        acceptance_prob = math.exp(-delta_cost / temperature)
-                    except (OverflowError, ZeroDivisionError):
-                        acceptance_prob = 0.0
-                    
-                    if random.random() < acceptance_prob:
-                        current_cost = new_cost
-                        self.accepted_moves += 1
-                    else:
-                        # Reject - rollback
-                        self._rollback_move(current_schedule, move_data)
-                        self.rejected_moves += 1
-                
-                # Update convergence history
-                self.convergence_history.append(best_cost)
-                
-                # Emit signals (mỗi 10 vòng)
-                if iteration % 10 == 0:
-                    acceptance_rate = (self.accepted_moves / (iteration) * 100) if iteration > 0 else 0
-                    self.step_signal.emit(iteration, best_cost, temperature, 0, acceptance_rate, 0)
-                    self._emit_progress(iteration, self.max_iterations)
-                
-                # Logging (mỗi 100 vòng)
-                if iteration % 100 == 0:
-                    acceptance_rate = (self.accepted_moves / (iteration) * 100) if iteration > 0 else 0
-                    self._log(
-                        f"Iter {iteration:5d}: T={temperature:.2f}, "
-                        f"Current={current_cost:.2f}, Best={best_cost:.2f}, "
-                        f"Accept Rate={acceptance_rate:.1f}%"
-                    )
-                
-                # Cool down
-                temperature *= self.cooling_rate
-            
-            # FINAL EVALUATION với FULL constraints
-            self._log("=" * 60)
-            self._log("✅ HOÀN THÀNH SIMULATED ANNEALING (OPTIMIZED)")
-            self._log("=" * 60)
-            
-            # Re-evaluate with full constraint checker
-            if best_schedule:
-                final_cost = self.constraint_checker.calculate_total_violation(best_schedule)
-                best_schedule.fitness_score = final_cost
-            
-            # Calculate statistics
-            improvement = 0.0
-            if initial_cost > 0:
-                improvement = ((initial_cost - best_cost) / initial_cost * 100)
-            
-            execution_time = self.get_execution_time()
-            total_moves = self.accepted_moves + self.rejected_moves
-            acceptance_rate = (self.accepted_moves / total_moves * 100) if total_moves > 0 else 0
-            
-            # Final logs
-            self._log(f"⏱️ Thời gian thực thi: {execution_time:.2f}s")
-            self._log(f"🔁 Tổng số vòng lặp: {iteration}")
-            self._log(f"📊 Cost ban đầu: {initial_cost:.2f}")
-            self._log(f"🎯 Cost tốt nhất (FAST): {best_cost:.2f}")
-            if best_schedule:
-                self._log(f"🎯 Cost tốt nhất (FINAL): {best_schedule.fitness_score:.2f}")
-            self._log(f"📈 Cải thiện: {improvement:.2f}%")
-            self._log(f"✔️ Accepted moves: {self.accepted_moves}")
-            self._log(f"❌ Rejected moves: {self.rejected_moves}")
-            self._log(f"📊 Acceptance rate: {acceptance_rate:.1f}%")
-            self._log("=" * 60)
-            
-            self.best_solution = best_schedule
-            self.finished_signal.emit(self.best_solution)
-            
-        except Exception as e:
-            self._log(f"❌ Lỗi: {str(e)}")
-            import traceback
-            self._log(traceback.format_exc())
-            self.error_signal.emit(str(e))
\ No newline at end of file
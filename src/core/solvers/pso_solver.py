@@ -27,19 +27,24 @@ from src.core.solvers.base_solver import BaseSolver
 from src.models.solution import Schedule
 from src.models.course import Course
 from src.models.room import Room
-from src.core.constraints import ConstraintChecker
-from src.core.optimization_fast import FastConstraintChecker
+from src.core.constraints import ConstraintChecker, time_to_minutes
+from src.core.optimization_fast import FastConstraintChecker, FastPSOEvaluator
 
 class Particle:
     """
     Đại diện cho một cá thể trong bầy đàn.
     """
-    def __init__(self, dimension: int, bounds: Tuple[np.ndarray, np.ndarray]):
+    def __init__(self, dimension: int, bounds: Tuple[np.ndarray, np.ndarray],
+                 rng: Optional[np.random.Generator] = None):
+        # RNG của solver (seed theo config) - không dùng trạng thái global np.random
+        if rng is None:
+            rng = np.random.default_rng()
+        
         # Vị trí hiện tại (Random trong bounds)
-        self.position = np.random.uniform(bounds[0], bounds[1], dimension)
+        self.position = rng.uniform(bounds[0], bounds[1], dimension)
         
         # Vận tốc (Khởi tạo nhỏ)
-        self.velocity = np.random.uniform(-1, 1, dimension)
+        self.velocity = rng.uniform(-1, 1, dimension)
         
         # PBest (Vị trí tốt nhất của cá nhân)
         self.pbest_position = self.position.copy()
@@ -97,6 +102,10 @@ class PSOSolver(BaseSolver):
         # Hệ số xã hội (Social - GBest)
         self.c2 = float(self.config.get('c2', 1.5))
         
+        # RNG riêng cho solver (Generator PCG64, có thể seed để tái lập kết quả)
+        # Hỗ trợ sinh số ngẫu nhiên trực tiếp vào buffer có sẵn (out=)
+        self.rng = np.random.default_rng(self.config.get('seed'))
+        
         # Constraint Checker với proctor constraints
         schedule_config = self.config.get('schedule_config', {})
         max_exams_per_week = schedule_config.get('max_exams_per_week', 5)
@@ -109,6 +118,7 @@ class PSOSolver(BaseSolver):
         
         # OPTIMIZATION: Use FastConstraintChecker for iterations
         self.fast_constraint_checker = FastConstraintChecker(rooms)
+        self.fast_evaluator = FastPSOEvaluator(self.fast_constraint_checker)
         
         # Performance optimization: max runtime in seconds (prevent hangs)
         self.max_runtime = float(self.config.get('max_runtime', 300.0))  # 5 minutes default
@@ -138,6 +148,9 @@ class PSOSolver(BaseSolver):
         self.num_rooms = len(self.rooms)
         self.num_courses = len(self.processed_courses)
         
+        # Danh sách mã giám thị (dùng để gán round-robin ngay khi decode)
+        self.proctor_ids = [proctor.proctor_id for proctor in self.proctors]
+        
         # Dimension: Mỗi course cần 2 giá trị (TimeSlot_Index, Room_Index)
         self.dimension = self.num_courses * 2
         
@@ -145,10 +158,14 @@ class PSOSolver(BaseSolver):
         # Lower bound: [0, 0, 0, 0...]
         self.lb = np.zeros(self.dimension)
         # Upper bound: [max_time, max_room, max_time, max_room...]
-        self.ub = np.zeros(self.dimension)
-        for i in range(self.num_courses):
-            self.ub[2*i] = self.num_time_slots - 1e-6     # Time index
-            self.ub[2*i+1] = self.num_rooms - 1e-6        # Room index
+        # OPTIMIZATION: Gán theo slice bước 2 trên mảng float64 liên tục (ghi 1 lần
+        # bằng NumPy) thay vì vòng lặp Python ghi từng phần tử
+        self.ub = np.empty(self.dimension)
+        self.ub[0::2] = self.num_time_slots - 1e-6     # Time index
+        self.ub[1::2] = self.num_rooms - 1e-6          # Room index
+        
+        # Bảng tra để decode cả bầy thành mảng số nguyên (xem _decode_swarm_arrays)
+        self._build_batch_tables()
         
         # Log initialization
         self._log(f"🚀 PSO Solver initialized: swarm_size={self.swarm_size}, "
@@ -167,31 +184,20 @@ class PSOSolver(BaseSolver):
         if not self.proctors or not schedule or not schedule.courses:
             return
         
-        proctor_assignments = {}  # Map to track assignments per proctor
+        # OPTIMIZATION: Chiến lược "giám thị ít việc nhất" (bộ đếm bắt đầu từ 0,
+        # hòa thì lấy người đứng trước) tương đương chia vòng tròn (round-robin)
+        # -> O(n) thay vì quét toàn bộ giám thị cho mỗi môn O(n·P)
+        proctor_ids = self.proctor_ids
+        num_proctors = len(proctor_ids)
+        k = 0
         
         for course in schedule.courses:
             # Nếu đã có giám thị, skip
             if course.assigned_proctor_id:
                 continue
             
-            # Tìm giám thị có ít công việc nhất (load balancing)
-            min_assignments = float('inf')
-            best_proctor = None
-            
-            for proctor in self.proctors:
-                if proctor.proctor_id not in proctor_assignments:
-                    proctor_assignments[proctor.proctor_id] = 0
-                
-                assignments_count = proctor_assignments[proctor.proctor_id]
-                
-                if assignments_count < min_assignments:
-                    min_assignments = assignments_count
-                    best_proctor = proctor
-            
-            # Gán giám thị tốt nhất (có ít công việc nhất)
-            if best_proctor:
-                course.assigned_proctor_id = best_proctor.proctor_id
-                proctor_assignments[best_proctor.proctor_id] += 1
+            course.assigned_proctor_id = proctor_ids[k % num_proctors]
+            k += 1
 
     def _decode_position_to_schedule(self, position: np.ndarray) -> Schedule:
         """
@@ -203,10 +209,25 @@ class PSOSolver(BaseSolver):
         
         Position structure: [c1_time, c1_room, c2_time, c2_room, ...]
         Mỗi course đã được chia thành Course objects riêng biệt.
+
+        OPTIMIZATION: Ép kiểu + clip toàn bộ vector bằng NumPy một lần,
+        thay vì gọi int() và np.clip() vô hướng cho từng course.
+        
+        OPTIMIZATION: Giám thị được gán round-robin ngay trong vòng decode
+        (cùng kết quả với _assign_proctors_to_schedule), tránh duyệt lại
+        toàn bộ schedule thêm một lần nữa.
         """
         decoded_courses = []
-        
+
         # Position là mảng [c1_time, c1_room, c2_time, c2_room, ...]
+        # Tách 2 cột index (time, room) và clip theo cận trên tương ứng
+        indices = position.astype(np.intp).reshape(-1, 2)
+        time_indices = np.clip(indices[:, 0], 0, self.num_time_slots - 1).tolist()
+        room_indices = np.clip(indices[:, 1], 0, self.num_rooms - 1).tolist()
+        
+        proctor_ids = self.proctor_ids
+        num_proctors = len(proctor_ids)
+
         for i in range(self.num_courses):
             course_template = self.processed_courses[i]
             
@@ -231,27 +252,132 @@ class PSOSolver(BaseSolver):
                 new_course.assigned_room = course_template.assigned_room
                 # Không assign proctor - để vector tối ưu
             else:
-                # Lấy giá trị float từ vector và ép kiểu int để ra index
-                time_idx = int(position[2*i])
-                room_idx = int(position[2*i+1])
-                
-                # Clip index để tránh lỗi out of bound (phòng ngừa)
-                time_idx = np.clip(time_idx, 0, self.num_time_slots - 1)
-                room_idx = np.clip(room_idx, 0, self.num_rooms - 1)
-                
-                # Map ngược lại dữ liệu thực
-                date_val, time_val = self.time_slots_flat[time_idx]
-                room_val = self.rooms[room_idx].room_id
+                # Map ngược lại dữ liệu thực (index đã được clip ở trên)
+                date_val, time_val = self.time_slots_flat[time_indices[i]]
+                room_val = self.rooms[room_indices[i]].room_id
                 
                 new_course.assigned_date = date_val
                 new_course.assigned_time = time_val
                 new_course.assigned_room = room_val
             
+            # Gán giám thị (round-robin theo thứ tự course)
+            if num_proctors:
+                new_course.assigned_proctor_id = proctor_ids[i % num_proctors]
+            
             decoded_courses.append(new_course)
             
         schedule = Schedule(courses=decoded_courses)
         return schedule
 
+    def _build_batch_tables(self) -> None:
+        """
+        Dựng các bảng tra cho việc decode cả bầy dạng mảng (_decode_swarm_arrays).
+        
+        Ngày và giám thị được gán ID số nguyên, giờ thi đổi sang phút (-1 nếu không
+        hợp lệ), phòng đổi sang index của fast checker. Môn khóa cứng giữ ngày/giờ/
+        phòng cố định của template.
+        """
+        checker = self.fast_constraint_checker
+        date_ids: Dict[str, int] = {}
+        
+        def date_id(date: str) -> int:
+            return date_ids.setdefault(date, len(date_ids))
+        
+        def start_minute(time_str: str) -> int:
+            minutes = time_to_minutes(time_str)
+            return -1 if minutes is None else minutes
+        
+        # Theo time slot: ngày (-1 nếu ngày/giờ là None -> môn coi như chưa xếp lịch,
+        # cùng quy tắc "is not None" với Course.is_scheduled()) và giờ
+        self._slot_date_ids = np.array(
+            [date_id(d) if d is not None and t is not None else -1
+             for d, t in self.time_slots_flat], dtype=np.int64)
+        self._slot_starts = np.array(
+            [start_minute(t) for _, t in self.time_slots_flat], dtype=np.int64)
+        # Theo phòng của solver
+        self._room_lookup = np.array(
+            [checker.room_index(room.room_id) for room in self.rooms], dtype=np.int64)
+        self._room_has_id = np.array([room.room_id is not None for room in self.rooms])
+        
+        # Theo môn: dữ liệu cố định + giám thị round-robin (như _decode_position_to_schedule)
+        courses = self.processed_courses
+        proctor_index: Dict[str, int] = {}
+        num_proctors = len(self.proctor_ids)
+        self._course_durations = np.array([c.duration for c in courses], dtype=np.int64)
+        self._course_students = np.array([c.student_count for c in courses], dtype=np.int64)
+        self._course_proctors = np.array(
+            [proctor_index.setdefault(self.proctor_ids[i % num_proctors], len(proctor_index))
+             if num_proctors and self.proctor_ids[i % num_proctors] else -1
+             for i in range(len(courses))],
+            dtype=np.int64
+        )
+        
+        self._locked = np.array([c.is_locked and c.is_scheduled() for c in courses], dtype=bool)
+        locked = [c for c, is_locked in zip(courses, self._locked) if is_locked]
+        self._locked_date_ids = np.array([date_id(c.assigned_date) for c in locked], dtype=np.int64)
+        self._locked_starts = np.array([start_minute(c.assigned_time) for c in locked], dtype=np.int64)
+        self._locked_rooms = np.array([checker.room_index(c.assigned_room) for c in locked],
+                                      dtype=np.int64)
+    
+    def _decode_swarm_arrays(self, positions: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Decode cả bầy thành các mảng số nguyên cho FastPSOEvaluator.evaluate_batch().
+        
+        Cùng kết quả với _decode_position_to_schedule() cho từng hạt nhưng không tạo
+        Course/Schedule nào: index time slot / phòng được tra qua bảng bằng fancy indexing.
+        
+        Args:
+            positions: Ma trận vị trí (swarm_size, dimension).
+        
+        Returns:
+            Tuple (date_ids, start_minutes, durations, room_ids, proctor_ids, student_counts).
+        """
+        indices = positions.astype(np.intp).reshape(len(positions), -1, 2)
+        time_indices = np.clip(indices[:, :, 0], 0, self.num_time_slots - 1)
+        room_indices = np.clip(indices[:, :, 1], 0, self.num_rooms - 1)
+        
+        date_ids = self._slot_date_ids[time_indices]
+        start_minutes = self._slot_starts[time_indices]
+        room_ids = self._room_lookup[room_indices]
+        if not self._room_has_id.all():
+            date_ids[~self._room_has_id[room_indices]] = -1
+        
+        if self._locked.any():
+            date_ids[:, self._locked] = self._locked_date_ids
+            start_minutes[:, self._locked] = self._locked_starts
+            room_ids[:, self._locked] = self._locked_rooms
+        
+        return (date_ids, start_minutes, self._course_durations, room_ids,
+                self._course_proctors, self._course_students)
+    
+    def _evaluate_swarm(self, positions: np.ndarray,
+                        out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, int, Schedule]:
+        """
+        Decode + đánh giá toàn bộ các hạt (fast checker).
+        
+        Args:
+            positions: Ma trận vị trí (swarm_size, dimension).
+            out: Buffer cost cấp phát sẵn để ghi kết quả (optional).
+        
+        Returns:
+            Tuple (costs, best_idx, best_schedule):
+            - costs: Mảng cost của từng hạt.
+            - best_idx: Index hạt tốt nhất trong lần đánh giá này.
+            - best_schedule: Schedule đã decode của hạt tốt nhất.
+        """
+        # OPTIMIZATION: Decode cả bầy thành mảng số nguyên và đánh giá 1 lần bằng
+        # NumPy; chỉ hạt tốt nhất mới được decode thành Schedule
+        batch_costs = self.fast_evaluator.evaluate_batch(positions, self._decode_swarm_arrays)
+        if out is None:
+            costs = batch_costs
+        else:
+            costs = out
+            costs[:] = batch_costs
+        
+        best_idx = int(np.argmin(costs))
+        best_sched = self._decode_position_to_schedule(positions[best_idx])
+        return costs, best_idx, best_sched
+    
     def run(self) -> None:
         """
         Chạy thuật toán Particle Swarm Optimization.
@@ -269,7 +395,6 @@ class PSOSolver(BaseSolver):
         try:
             # Setup
             self.is_running = True
-            self.should_stop = False
             self.start_time = time.time()
             self.convergence_history = []
             self.gbest_updates = 0
@@ -287,33 +412,33 @@ class PSOSolver(BaseSolver):
             self._log("-" * 60)
             
             # 1. Khởi tạo quần thể (Swarm Initialization)
+            # OPTIMIZATION: Lưu cả bầy dưới dạng ma trận (swarm_size, dimension)
+            # để cập nhật vận tốc/vị trí bằng một phép toán NumPy cho toàn bầy
             self._log("📊 Đang khởi tạo quần thể...")
-            swarm = [Particle(self.dimension, (self.lb, self.ub)) for _ in range(self.swarm_size)]
-            
-            gbest_position = np.zeros(self.dimension)
-            gbest_value = float('inf')
-            initial_gbest_value = None
+            S, D = self.swarm_size, self.dimension
+            rng = self.rng
+            positions = rng.uniform(self.lb, self.ub, (S, D))
+            velocities = rng.uniform(-1, 1, (S, D))
             
             # Đánh giá ban đầu
             self._log("🔍 Đang đánh giá các hạt ban đầu...")
-            for particle in swarm:
-                sched = self._decode_position_to_schedule(particle.position)
-                # Gán giám thị cho schedule này
-                self._assign_proctors_to_schedule(sched)
-                # Use fast checker for initial evaluation
-                cost = self.fast_constraint_checker.calculate_fast(sched)
-                
-                particle.current_value = cost
-                particle.pbest_value = cost
-                particle.pbest_position = particle.position.copy()
-                
-                if cost < gbest_value:
-                    gbest_value = cost
-                    gbest_position = particle.position.copy()
-                    self.best_solution = sched
-                    self.best_solution.fitness_score = gbest_value
+            costs, best_idx, best_sched = self._evaluate_swarm(positions)
+            
+            pbest_positions = positions.copy()
+            pbest_values = costs.copy()
+            
+            gbest_value = float(costs[best_idx])
+            gbest_position = positions[best_idx].copy()
+            self.best_solution = best_sched
+            self.best_solution.fitness_score = gbest_value
             
             initial_gbest_value = gbest_value
+            
+            # Buffer tạm dùng lại cho mọi vòng lặp
+            scratch = np.empty((S, D))
+            r1 = np.empty((S, D))
+            r2 = np.empty((S, D))
+            w, c1, c2 = self.w, self.c1, self.c2
             self._log(f"✓ Đánh giá ban đầu hoàn tất: Initial Best Cost = {gbest_value:.2f}")
             self.convergence_history.append(gbest_value)
             
@@ -336,47 +461,47 @@ class PSOSolver(BaseSolver):
                 iteration += 1
                 self.total_iterations = iteration
                 
-                for particle in swarm:
-                    # --- UPDATE VELOCITY ---
-                    # v = w*v + c1*r1*(pbest - x) + c2*r2*(gbest - x)
-                    r1 = np.random.rand(self.dimension)
-                    r2 = np.random.rand(self.dimension)
-                    
-                    particle.velocity = (self.w * particle.velocity) + \
-                                        (self.c1 * r1 * (particle.pbest_position - particle.position)) + \
-                                        (self.c2 * r2 * (gbest_position - particle.position))
-                    
-                    # --- UPDATE POSITION ---
-                    # x = x + v
-                    particle.position = particle.position + particle.velocity
-                    
-                    # Clip position to bounds (giữ hạt trong không gian tìm kiếm)
-                    particle.position = np.clip(particle.position, self.lb, self.ub)
-                    
-                    # --- EVALUATION (OPTIMIZED: Use fast checker) ---
-                    current_sched = self._decode_position_to_schedule(particle.position)
-                    # Gán giám thị cho schedule này
-                    self._assign_proctors_to_schedule(current_sched)
-                    
-                    # Use fast constraint checker for iterations (hard constraints only)
-                    current_cost = self.fast_constraint_checker.calculate_fast(current_sched)
-                    particle.current_value = current_cost
+                # --- UPDATE VELOCITY (toàn bầy) ---
+                # v = w*v + c1*r1*(pbest - x) + c2*r2*(gbest - x)
+                # OPTIMIZATION: Tính in-place trên buffer cấp phát sẵn (out=),
+                # không tạo mảng tạm (S, D) mới cho từng phép toán
+                rng.random(out=r1)
+                rng.random(out=r2)
+                r1 *= c1
+                r2 *= c2
+                velocities *= w
+                np.subtract(pbest_positions, positions, out=scratch)
+                scratch *= r1
+                velocities += scratch
+                np.subtract(gbest_position, positions, out=scratch)
+                scratch *= r2
+                velocities += scratch
+                
+                # --- UPDATE POSITION ---
+                # x = x + v, clip để giữ hạt trong không gian tìm kiếm
+                positions += velocities
+                np.clip(positions, self.lb, self.ub, out=positions)
+                
+                # --- EVALUATION (OPTIMIZED: Use fast checker) ---
+                costs, best_idx, best_sched = self._evaluate_swarm(positions, out=costs)
+                
+                # Update PBest (mask cho các hạt cải thiện)
+                improved = costs < pbest_values
+                n_improved = int(np.count_nonzero(improved))
+                if n_improved:
+                    pbest_values[improved] = costs[improved]
+                    pbest_positions[improved] = positions[improved]
+                    self.pbest_updates += n_improved
+                
+                # Update GBest
+                if costs[best_idx] < gbest_value:
+                    gbest_value = float(costs[best_idx])
+                    gbest_position = positions[best_idx].copy()
+                    self.best_solution = best_sched
+                    self.best_solution.fitness_score = gbest_value
+                    self.gbest_updates += 1
                     
-                    # Update PBest
-                    if current_cost < particle.pbest_value:
-                        particle.pbest_value = current_cost
-                        particle.pbest_position = particle.position.copy()
-                        self.pbest_updates += 1
-                        
-                        # Update GBest
-                        if current_cost < gbest_value:
-                            gbest_value = current_cost
-                            gbest_position = particle.position.copy()
-                            self.best_solution = current_sched
-                            self.best_solution.fitness_score = gbest_value
-                            self.gbest_updates += 1
-                            
-                            self._log(f"🌟 Iteration {iteration}: NEW GBEST FOUND! Cost = {gbest_value:.2f}")
+                    self._log(lambda: f"🌟 Iteration {iteration}: NEW GBEST FOUND! Cost = {gbest_value:.2f}")
 
                 # Store history
                 self.convergence_history.append(gbest_value)
@@ -391,11 +516,11 @@ class PSOSolver(BaseSolver):
                 
                 # Log định kỳ (mỗi 100 vòng)
                 if iteration % 100 == 0:
-                    pbest_rate = (self.pbest_updates / (iteration * self.swarm_size) * 100) if iteration > 0 else 0
-                    self._log(
+                    self._log(lambda:
                         f"Iter {iteration}: Current Best = {gbest_value:.2f}, "
                         f"GBest Updates = {self.gbest_updates}, "
-                        f"PBest Updates = {self.pbest_updates} ({pbest_rate:.1f}%)"
+                        f"PBest Updates = {self.pbest_updates} "
+                        f"({self.pbest_updates / (iteration * self.swarm_size) * 100 if iteration > 0 else 0:.1f}%)"
                     )
             
             # 3. Finish
@@ -53,6 +53,9 @@ class SASolver(BaseSolver):
         - If ΔE > 0: Accept with probability P = exp(-ΔE/T)
     """
     
+    # OPTIMIZATION: Số vòng lặp giữa 2 lần kiểm tra giới hạn thời gian chạy
+    TIME_CHECK_INTERVAL = 64
+    
     def __init__(self, 
                  courses: List[Course], 
                  rooms: List[Room],
@@ -78,6 +81,10 @@ class SASolver(BaseSolver):
         self.max_iterations = self.config.get('max_iterations', 10000)
         self.neighbor_type = self.config.get('neighbor_type', 'random')
         
+        # RNG riêng cho solver (có thể seed để tái lập kết quả) - không dùng chung
+        # trạng thái module-level `random` với các thread/thành phần khác
+        self.rng = random.Random(self.config.get('seed'))
+        
         # Constraint checker với proctor constraints
         schedule_config = self.config.get('schedule_config', {})
         max_exams_per_week = schedule_config.get('max_exams_per_week', 5)
@@ -94,15 +101,20 @@ class SASolver(BaseSolver):
         # Performance optimization: max runtime in seconds (prevent hangs)
         self.max_runtime = float(self.config.get('max_runtime', 300.0))  # 5 minutes default
         
-        # Time slots và schedule parameters
-        self.available_dates = self._generate_exam_dates()
-        self.available_times = self._generate_time_slots()
+        # Không gian tìm kiếm (available_dates/available_times) đã được BaseSolver
+        # tạo sẵn (tôn trọng config['exam_dates']) - không tạo lại ở đây
         
         # Statistics
         self.accepted_moves = 0
         self.rejected_moves = 0
         self.total_neighbors = 0
         
+        # Cache (courses_list, len, modifiable_indices) cho _perturb_move_random
+        self._modifiable_cache = None
+        
+        # Hàm perturb được chọn sẵn theo neighbor_type
+        self._perturb_impl = self._select_perturb_impl()
+        
         self._log(f"🔥 SA Solver initialized (OPTIMIZED): T0={self.initial_temperature}, "
                   f"cooling={self.cooling_rate}, max_iter={self.max_iterations}")
     
@@ -156,8 +168,8 @@ class SASolver(BaseSolver):
                 self._log(f"🔒 Giữ nguyên lịch của môn {course.course_id} (locked)")
             else:
                 # Random assign schedule
-                new_course.assigned_date = random.choice(self.available_dates)
-                new_course.assigned_time = random.choice(self.available_times)
+                new_course.assigned_date = self.rng.choice(self.available_dates)
+                new_course.assigned_time = self.rng.choice(self.available_times)
                 
                 # Tìm phòng tối ưu
                 optimal_room = self._find_optimal_room(
@@ -170,20 +182,16 @@ class SASolver(BaseSolver):
                     new_course.assigned_room = optimal_room.room_id
                 else:
                     # Fallback: Chọn random phòng cùng địa điểm
-                    suitable_rooms = [
-                        room for room in self.rooms
-                        if room.location == course.location and 
-                           room.capacity >= course.student_count
-                    ]
+                    suitable_rooms = self._get_suitable_rooms(course.student_count, course.location)
                     if suitable_rooms:
-                        new_course.assigned_room = random.choice(suitable_rooms).room_id
+                        new_course.assigned_room = self.rng.choice(suitable_rooms).room_id
                     else:
-                        new_course.assigned_room = random.choice(self.rooms).room_id
+                        new_course.assigned_room = self.rng.choice(self.rooms).room_id
             
             # Phân công giám thị ngẫu nhiên cho TẤT CẢ MÔN (kể cả môn bị khóa)
             # vì giám thị cần được tối ưu độc lập
             if self.proctors:
-                random_proctor = random.choice(self.proctors)
+                random_proctor = self.rng.choice(self.proctors)
                 new_course.assigned_proctor_id = random_proctor.proctor_id
             
             initial_courses.append(new_course)
@@ -193,7 +201,33 @@ class SASolver(BaseSolver):
         
         return schedule
     
-    def _perturb_move(self, schedule: Schedule) -> Dict[str, Any]:
+    @staticmethod
+    def _backup_course(idx: int, course: Course) -> Tuple:
+        """
+        Tạo bản backup gọn cho 1 course: (idx, date, time, room, proctor).
+        
+        OPTIMIZATION: Dùng tuple phẳng thay vì dict lồng dict -> ít cấp phát
+        bộ nhớ hơn ở mỗi iteration.
+        """
+        return (idx, course.assigned_date, course.assigned_time,
+                course.assigned_room, course.assigned_proctor_id)
+    
+    def _select_perturb_impl(self):
+        """
+        Chọn hàm perturb theo neighbor_type (chỉ 1 lần khi khởi tạo).
+        
+        OPTIMIZATION: Tránh so sánh chuỗi neighbor_type ở mỗi iteration.
+        
+        Returns:
+            Bound method: schedule -> backup tuple.
+        """
+        if self.neighbor_type == 'swap':
+            return self._perturb_move_swap
+        if self.neighbor_type == 'smart':
+            return self._perturb_move_smart
+        return self._perturb_move_random
+    
+    def _perturb_move(self, schedule: Schedule) -> Tuple[Tuple, ...]:
         """
         Thực hiện thay đổi nhỏ (Move) trên schedule hiện tại (in-place).
         Trả về backup data để có thể rollback nếu cần.
@@ -204,94 +238,84 @@ class SASolver(BaseSolver):
             schedule: Lịch thi cần thay đổi (sẽ bị modify trực tiếp).
         
         Returns:
-            Dict chứa backup data: {
-                'course_indices': List[int],
-                'old_values': List[Dict]  # [{date, time, room}, ...]
-            }
+            Tuple các backup: ((idx, date, time, room, proctor), ...)
+            - rỗng nếu không có thay đổi nào.
         """
         if not schedule.courses:
-            return {'course_indices': [], 'old_values': []}
+            return ()
         
-        backup_data = {
-            'course_indices': [],
-            'old_values': []
-        }
+        return self._perturb_impl(schedule)
+    
+    def _perturb_move_swap(self, schedule: Schedule) -> Tuple[Tuple, ...]:
+        """
+        Swap move: hoán đổi ngày/giờ/phòng/giám thị của 2 môn ngẫu nhiên.
         
-        if self.neighbor_type == 'swap':
-            # Swap 2 courses
-            if len(schedule.courses) < 2:
-                return self._perturb_move_random(schedule, backup_data)
-            
-            # Chọn 2 môn ngẫu nhiên
-            idx1, idx2 = random.sample(range(len(schedule.courses)), 2)
-            course1 = schedule.courses[idx1]
-            course2 = schedule.courses[idx2]
-            
-            # Backup
-            backup_data['course_indices'] = [idx1, idx2]
-            backup_data['old_values'] = [
-                {
-                    'date': course1.assigned_date,
-                    'time': course1.assigned_time,
-                    'room': course1.assigned_room,
-                    'proctor': course1.assigned_proctor_id
-                },
-                {
-                    'date': course2.assigned_date,
-                    'time': course2.assigned_time,
-                    'room': course2.assigned_room,
-                    'proctor': course2.assigned_proctor_id
-                }
-            ]
-            
-            # Swap (in-place)
-            course1.assigned_date, course2.assigned_date = course2.assigned_date, course1.assigned_date
-            course1.assigned_time, course2.assigned_time = course2.assigned_time, course1.assigned_time
-            course1.assigned_room, course2.assigned_room = course2.assigned_room, course1.assigned_room
-            course1.assigned_proctor_id, course2.assigned_proctor_id = course2.assigned_proctor_id, course1.assigned_proctor_id
-            
-        elif self.neighbor_type == 'smart':
-            # Smart move: Tìm môn có vi phạm và sửa
-            violations = self.constraint_checker.get_violation_details(schedule)
-            
-            if violations.get('location_mismatches', 0) > 0:
-                # Tìm môn có location mismatch
-                for idx, course in enumerate(schedule.courses):
-                    if not course.is_scheduled():
-                        continue
-                    
-                    room = self.rooms_dict.get(course.assigned_room)
-                    if room and room.location != course.location:
-                        # Fix bằng cách đổi phòng
-                        suitable_rooms = [
-                            r for r in self.rooms
-                            if r.location == course.location and 
-                               r.capacity >= course.student_count
-                        ]
-                        
-                        if suitable_rooms:
-                            # Backup
-                            backup_data['course_indices'] = [idx]
-                            backup_data['old_values'] = [{
-                                'date': course.assigned_date,
-                                'time': course.assigned_time,
-                                'room': course.assigned_room,
-                                'proctor': course.assigned_proctor_id
-                            }]
-                            
-                            # Modify (in-place)
-                            course.assigned_room = random.choice(suitable_rooms).room_id
-                            return backup_data
-            
-            # Fallback: random move
-            return self._perturb_move_random(schedule, backup_data)
+        Args:
+            schedule: Lịch thi cần thay đổi.
         
-        else:  # 'random'
-            return self._perturb_move_random(schedule, backup_data)
+        Returns:
+            Tuple backup theo định dạng của _perturb_move().
+        """
+        if len(schedule.courses) < 2:
+            return self._perturb_move_random(schedule)
+        
+        # Chọn 2 môn ngẫu nhiên (OPTIMIZATION: randrange thay vì
+        # random.sample(range(n), 2) để tránh tạo range/list mỗi bước)
+        n = len(schedule.courses)
+        idx1 = self.rng.randrange(n)
+        idx2 = self.rng.randrange(n - 1)
+        if idx2 >= idx1:
+            idx2 += 1
+        course1 = schedule.courses[idx1]
+        course2 = schedule.courses[idx2]
+        
+        # Backup
+        backup_data = (self._backup_course(idx1, course1),
+                       self._backup_course(idx2, course2))
+        
+        # Swap (in-place)
+        course1.assigned_date, course2.assigned_date = course2.assigned_date, course1.assigned_date
+        course1.assigned_time, course2.assigned_time = course2.assigned_time, course1.assigned_time
+        course1.assigned_room, course2.assigned_room = course2.assigned_room, course1.assigned_room
+        course1.assigned_proctor_id, course2.assigned_proctor_id = course2.assigned_proctor_id, course1.assigned_proctor_id
         
         return backup_data
     
-    def _perturb_move_random(self, schedule: Schedule, backup_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _perturb_move_smart(self, schedule: Schedule) -> Tuple[Tuple, ...]:
+        """
+        Smart move: Tìm môn có vi phạm (sai địa điểm) và sửa bằng cách đổi phòng.
+        Nếu không có vi phạm nào sửa được -> random move.
+        
+        Args:
+            schedule: Lịch thi cần thay đổi.
+        
+        Returns:
+            Tuple backup theo định dạng của _perturb_move().
+        """
+        # OPTIMIZATION: Quét trực tiếp tìm môn sai địa điểm đầu tiên thay vì gọi
+        # get_violation_details() (chạy toàn bộ các ràng buộc) ở mỗi iteration
+        rooms_dict = self.rooms_dict
+        for idx, course in enumerate(schedule.courses):
+            if not course.is_scheduled():
+                continue
+            
+            room = rooms_dict.get(course.assigned_room)
+            if room and room.location.strip().lower() != course.location.strip().lower():
+                # Fix bằng cách đổi phòng
+                suitable_rooms = self._get_suitable_rooms(course.student_count, course.location)
+                
+                if suitable_rooms:
+                    # Backup
+                    backup_data = (self._backup_course(idx, course),)
+                    
+                    # Modify (in-place)
+                    course.assigned_room = self.rng.choice(suitable_rooms).room_id
+                    return backup_data
+        
+        # Fallback: random move
+        return self._perturb_move_random(schedule)
+    
+    def _perturb_move_random(self, schedule: Schedule) -> Tuple[Tuple, ...]:
         """
         Thực hiện random move trên 1 course hoặc 1 session.
         
@@ -300,59 +324,45 @@ class SASolver(BaseSolver):
         
         Args:
             schedule: Lịch thi cần thay đổi.
-            backup_data: Dict để lưu backup (sẽ được modify).
         
         Returns:
-            backup_data đã được cập nhật.
+            Tuple backup theo định dạng của _perturb_move().
         """
-        # ENHANCED: Lọc ra các môn có is_locked=False
-        # Chỉ được thay đổi ngày/giờ/phòng của các môn mà không bị khóa
-        modifiable_courses = [
-            (idx, course) for idx, course in enumerate(schedule.courses)
-            if not course.is_locked
-        ]
+        # ENHANCED: Chỉ được thay đổi ngày/giờ/phòng của các môn không bị khóa
+        # OPTIMIZATION: Danh sách index được cache, không dựng lại mỗi iteration
+        modifiable_indices = self._get_modifiable_indices(schedule)
         
         # Nếu tất cả môn đều bị khóa, chỉ có thể thay đổi giám thị
-        if not modifiable_courses:
+        if not modifiable_indices:
             # Thay đổi giám thị cho 1 môn ngẫu nhiên (kể cả môn bị khóa)
             if self.proctors:
-                idx = random.randint(0, len(schedule.courses) - 1)
+                idx = self.rng.randint(0, len(schedule.courses) - 1)
                 course = schedule.courses[idx]
                 
-                backup_data['course_indices'] = [idx]
-                backup_data['old_values'] = [{
-                    'date': course.assigned_date,
-                    'time': course.assigned_time,
-                    'room': course.assigned_room,
-                    'proctor': course.assigned_proctor_id
-                }]
+                backup_data = (self._backup_course(idx, course),)
                 
-                random_proctor = random.choice(self.proctors)
+                random_proctor = self.rng.choice(self.proctors)
                 course.assigned_proctor_id = random_proctor.proctor_id
+                return backup_data
             
-            return backup_data
+            return ()
         
         # Chọn 1 môn ngẫu nhiên từ danh sách modifiable
-        idx, course = random.choice(modifiable_courses)
+        idx = self.rng.choice(modifiable_indices)
+        course = schedule.courses[idx]
         
         # Backup
-        backup_data['course_indices'] = [idx]
-        backup_data['old_values'] = [{
-            'date': course.assigned_date,
-            'time': course.assigned_time,
-            'room': course.assigned_room,
-            'proctor': course.assigned_proctor_id
-        }]
+        backup_data = (self._backup_course(idx, course),)
         
         # Quyết định thay đổi gì (date/time/room/proctor)
-        change_type = random.choice(['date', 'time', 'room', 'proctor', 'all'])
+        change_type = self.rng.choice(['date', 'time', 'room', 'proctor', 'all'])
         
         # Modify (in-place)
         if change_type in ['date', 'all']:
-            course.assigned_date = random.choice(self.available_dates)
+            course.assigned_date = self.rng.choice(self.available_dates)
         
         if change_type in ['time', 'all']:
-            course.assigned_time = random.choice(self.available_times)
+            course.assigned_time = self.rng.choice(self.available_times)
         
         if change_type in ['room', 'all']:
             # Tìm phòng tối ưu
@@ -366,25 +376,78 @@ class SASolver(BaseSolver):
                 course.assigned_room = optimal_room.room_id
             else:
                 # Fallback: Ưu tiên phòng cùng địa điểm
-                suitable_rooms = [
-                    room for room in self.rooms
-                    if room.location == course.location and 
-                       room.capacity >= course.student_count
-                ]
+                suitable_rooms = self._get_suitable_rooms(course.student_count, course.location)
                 
-                if suitable_rooms and random.random() > 0.3:  # 70% chọn phòng phù hợp
-                    course.assigned_room = random.choice(suitable_rooms).room_id
+                if suitable_rooms and self.rng.random() > 0.3:  # 70% chọn phòng phù hợp
+                    course.assigned_room = self.rng.choice(suitable_rooms).room_id
                 else:
-                    course.assigned_room = random.choice(self.rooms).room_id
+                    course.assigned_room = self.rng.choice(self.rooms).room_id
         
         # Thay đổi giám thị (nếu có danh sách giám thị)
         if change_type in ['proctor', 'all'] and self.proctors:
-            random_proctor = random.choice(self.proctors)
+            random_proctor = self.rng.choice(self.proctors)
             course.assigned_proctor_id = random_proctor.proctor_id
         
         return backup_data
     
-    def _undo_move(self, schedule: Schedule, backup_data: Dict[str, Any]) -> None:
+    def _get_modifiable_indices(self, schedule: Schedule) -> List[int]:
+        """
+        Lấy danh sách index các môn không bị khóa (is_locked=False).
+        
+        OPTIMIZATION: Trạng thái is_locked không đổi trong suốt quá trình chạy,
+        nên danh sách được tính 1 lần cho mỗi schedule.courses và cache lại.
+        
+        Args:
+            schedule: Lịch thi hiện tại.
+        
+        Returns:
+            List index của các môn có thể thay đổi.
+        """
+        courses = schedule.courses
+        cached = self._modifiable_cache
+        if cached is None or cached[0] is not courses or cached[1] != len(courses):
+            indices = [idx for idx, course in enumerate(courses) if not course.is_locked]
+            cached = self._modifiable_cache = (courses, len(courses), indices)
+        return cached[2]
+    
+    @staticmethod
+    def _snapshot_assignments(schedule: Schedule) -> List[Tuple]:
+        """
+        Lưu lại phân công hiện tại của schedule dưới dạng list tuple
+        (date, time, room, proctor) - rẻ hơn nhiều so với deepcopy.
+        
+        Args:
+            schedule: Lịch thi cần snapshot.
+        
+        Returns:
+            List tuple theo thứ tự schedule.courses.
+        """
+        return [
+            (c.assigned_date, c.assigned_time, c.assigned_room, c.assigned_proctor_id)
+            for c in schedule.courses
+        ]
+    
+    @staticmethod
+    def _restore_snapshot(schedule: Schedule, snapshot: List[Tuple]) -> Schedule:
+        """
+        Tạo bản sao của schedule và áp dụng lại phân công từ snapshot.
+        
+        Args:
+            schedule: Lịch thi gốc (không bị thay đổi).
+            snapshot: Kết quả từ _snapshot_assignments().
+        
+        Returns:
+            Schedule mới với phân công theo snapshot.
+        """
+        restored = copy.deepcopy(schedule)
+        for course, (date, time_slot, room, proctor) in zip(restored.courses, snapshot):
+            course.assigned_date = date
+            course.assigned_time = time_slot
+            course.assigned_room = room
+            course.assigned_proctor_id = proctor
+        return restored
+    
+    def _undo_move(self, schedule: Schedule, backup_data: Tuple[Tuple, ...]) -> None:
         """
         Hoàn tác thay đổi dựa trên backup data (Rollback).
         
@@ -394,16 +457,14 @@ class SASolver(BaseSolver):
             schedule: Lịch thi cần rollback.
             backup_data: Dữ liệu backup từ _perturb_move().
         """
-        if not backup_data or not backup_data.get('course_indices'):
-            return
-        
-        for idx, old_values in zip(backup_data['course_indices'], backup_data['old_values']):
-            if 0 <= idx < len(schedule.courses):
-                course = schedule.courses[idx]
-                course.assigned_date = old_values['date']
-                course.assigned_time = old_values['time']
-                course.assigned_room = old_values['room']
-                course.assigned_proctor_id = old_values.get('proctor')  # Restore proctor (có thể None)
+        courses = schedule.courses
+        for idx, date, time_slot, room, proctor in backup_data:
+            if 0 <= idx < len(courses):
+                course = courses[idx]
+                course.assigned_date = date
+                course.assigned_time = time_slot
+                course.assigned_room = room
+                course.assigned_proctor_id = proctor  # Restore proctor (có thể None)
     
     def _acceptance_probability(self, current_cost: float, new_cost: float, temperature: float) -> float:
         """
@@ -454,13 +515,12 @@ class SASolver(BaseSolver):
         
         Performance Improvements:
             - Loại bỏ deepcopy trong vòng lặp
-            - Chỉ copy khi update best_solution (ít xảy ra)
+            - Best solution chỉ lưu snapshot (date, time, room, proctor), dựng lại 1 lần cuối
             - Mỗi bước: O(1) hoặc O(k) nhỏ thay vì O(N)
         """
         try:
             # Setup
             self.is_running = True
-            self.should_stop = False
             self.start_time = time.time()
             self.convergence_history = []
             self.accepted_moves = 0
@@ -476,8 +536,10 @@ class SASolver(BaseSolver):
             current_schedule = self._generate_initial_solution()
             current_cost = current_schedule.fitness_score
             
-            # Chỉ copy khi tạo best_solution (ít xảy ra)
-            best_schedule = copy.deepcopy(current_schedule)
+            # OPTIMIZATION: Không deepcopy best_solution trong vòng lặp - chỉ lưu
+            # snapshot gọn (date, time, room, proctor) của từng course, dựng lại
+            # Schedule 1 lần duy nhất khi kết thúc
+            best_snapshot = self._snapshot_assignments(current_schedule)
             best_cost = current_cost
             
             self._log(f"✓ Lịch ban đầu: Cost = {current_cost:.2f}")
@@ -492,15 +554,32 @@ class SASolver(BaseSolver):
             self._log(f"🔽 Tốc độ làm lạnh: {self.cooling_rate}")
             self._log("-" * 60)
             
-            while temperature > self.min_temperature and iteration < self.max_iterations:
+            # OPTIMIZATION: Hoist các bound method / hằng số ra khỏi vòng lặp
+            # để tránh attribute lookup lặp lại mỗi iteration
+            perturb_move = self._perturb_impl if current_schedule.courses else self._perturb_move
+            undo_move = self._undo_move
+            # OPTIMIZATION: Đánh giá tăng dần - mỗi move chỉ đếm lại các nhóm
+            # (ngày, phòng) / (ngày, giám thị) bị ảnh hưởng thay vì calculate_fast() O(n)
+            fast_checker = self.fast_constraint_checker
+            fast_checker.begin_incremental(current_schedule, self.available_times)
+            apply_move = fast_checker.apply_move
+            acceptance_probability = self._acceptance_probability
+            rand = self.rng.random
+            history_append = self.convergence_history.append
+            min_temperature = self.min_temperature
+            max_iterations = self.max_iterations
+            cooling_rate = self.cooling_rate
+            deadline = self.start_time + self.max_runtime
+            
+            while temperature > min_temperature and iteration < max_iterations:
                 # Check stop flag
                 if self.should_stop:
                     self._log("⚠️ Thuật toán đã bị dừng bởi người dùng")
                     break
                 
-                # Check runtime limit
-                elapsed_time = time.time() - self.start_time
-                if elapsed_time > self.max_runtime:
+                # Check runtime limit (OPTIMIZATION: chỉ gọi time.time() mỗi
+                # TIME_CHECK_INTERVAL vòng lặp thay vì mọi vòng lặp)
+                if iteration % self.TIME_CHECK_INTERVAL == 0 and time.time() > deadline:
                     self._log(f"⏱️ Đạt giới hạn thời gian ({self.max_runtime}s). Dừng.")
                     break
                 
@@ -508,37 +587,40 @@ class SASolver(BaseSolver):
                 self.total_iterations = iteration
                 
                 # --- OPTIMIZED: Perturb với backup (in-place modification) ---
-                backup_data = self._perturb_move(current_schedule)
+                backup_data = perturb_move(current_schedule)
+                changed_indices = [backup[0] for backup in backup_data]
                 self.total_neighbors += 1
                 
-                # Calculate new cost (sau khi đã modify) - OPTIMIZED: use fast checker
-                new_cost = self.fast_constraint_checker.calculate_fast(current_schedule)
+                # Calculate new cost (sau khi đã modify) - OPTIMIZED: fast checker, tăng dần
+                apply_move(current_schedule, changed_indices)
+                new_cost = fast_checker.incremental_total
                 
                 # Calculate acceptance probability
-                accept_prob = self._acceptance_probability(current_cost, new_cost, temperature)
+                accept_prob = acceptance_probability(current_cost, new_cost, temperature)
                 
                 # Decide whether to accept neighbor
-                if random.random() < accept_prob:
+                if rand() < accept_prob:
                     # Accept: Giữ nguyên thay đổi (đã modify rồi)
                     current_cost = new_cost
                     self.accepted_moves += 1
                     
                     # Update best solution if better (chỉ copy khi cần)
                     if current_cost < best_cost:
-                        best_schedule = copy.deepcopy(current_schedule)
+                        best_snapshot = self._snapshot_assignments(current_schedule)
                         best_cost = current_cost
-                        self._log(f"🎯 Iteration {iteration}: NEW BEST! Cost = {best_cost:.2f}")
+                        self._log(lambda: f"🎯 Iteration {iteration}: NEW BEST! Cost = {best_cost:.2f}")
                 else:
                     # Reject: Rollback bằng backup (hoàn tác thay đổi)
-                    self._undo_move(current_schedule, backup_data)
+                    undo_move(current_schedule, backup_data)
+                    apply_move(current_schedule, changed_indices)
                     # current_cost không đổi (vì đã rollback)
                     self.rejected_moves += 1
                 
                 # Store convergence history
-                self.convergence_history.append(current_cost)
+                history_append(current_cost)
                 
                 # Cool down temperature
-                temperature *= self.cooling_rate
+                temperature *= cooling_rate
                 
                 # Emit signals every 10 iterations (not too frequent to avoid GUI lag)
                 if iteration % 10 == 0:
@@ -556,7 +638,7 @@ class SASolver(BaseSolver):
                 
                 # Log every 100 iterations
                 if iteration % 100 == 0:
-                    self._log(
+                    self._log(lambda:
                         f"Iter {iteration}: T={temperature:.2f}, "
                         f"Current={current_cost:.2f}, Best={best_cost:.2f}, "
                         f"Accept Rate={self.accepted_moves/self.total_neighbors*100:.1f}%"
@@ -564,6 +646,7 @@ class SASolver(BaseSolver):
             
             # Step 3: Finish
             self.end_time = time.time()
+            best_schedule = self._restore_snapshot(current_schedule, best_snapshot)
             self.best_solution = best_schedule
             self.current_solution = current_schedule
             
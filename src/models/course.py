@@ -9,9 +9,28 @@ ENHANCED: Hỗ trợ khóa cứng lịch thi (Pinning) và thời lượng thi l
 from dataclasses import dataclass, field
 from typing import Optional, List
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _parse_exam_datetime(date_str: str, time_str: str) -> Optional[datetime]:
+    """
+    Parse cặp (ngày, giờ) thi thành datetime, có cache.
+    
+    OPTIMIZATION: Số cặp (ngày, giờ) trong một kỳ thi rất ít, nên strptime
+    (chậm) chỉ chạy một lần cho mỗi cặp; các lần sau chỉ là một lần tra dict.
+    datetime là immutable nên dùng chung kết quả cache là an toàn.
+    """
+    try:
+        return datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+    except (ValueError, TypeError):
+        return None
+
+
+# OPTIMIZATION: slots=True - mỗi Course lưu thuộc tính trong mảng slot cố định
+# thay vì __dict__ riêng, giảm bộ nhớ và tăng tốc truy cập thuộc tính trong các
+# vòng lặp ràng buộc (quét hàng nghìn môn học mỗi lần đánh giá)
+@dataclass(slots=True)
 class Course:
     """
     Class đại diện cho một môn học/lớp học phần.
@@ -79,11 +98,9 @@ class Course:
         
         # Backward compatible: Kiểm tra assigned_date/time/room
         # Note: assigned_proctor_id là optional, không bắt buộc để is_scheduled() = True
-        return all([
-            self.assigned_date is not None,
-            self.assigned_time is not None,
-            self.assigned_room is not None
-        ])
+        return (self.assigned_date is not None
+                and self.assigned_time is not None
+                and self.assigned_room is not None)
     
     def clear_schedule(self) -> None:
         """
@@ -148,11 +165,11 @@ class Course:
         """
         if self.assigned_date is None or self.assigned_time is None:
             return None
+        # Kết hợp ngày và giờ (kết quả parse được cache theo cặp ngày/giờ)
         try:
-            # Kết hợp ngày và giờ
-            datetime_str = f"{self.assigned_date} {self.assigned_time}"
-            return datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-        except (ValueError, TypeError):
+            return _parse_exam_datetime(self.assigned_date, self.assigned_time)
+        except TypeError:
+            # Giá trị không hash được (không phải chuỗi) - coi như không hợp lệ
             return None
     
     @property
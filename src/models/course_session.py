@@ -25,6 +25,7 @@ class CourseSession:
         assigned_time (Optional[str]): Giờ thi được phân công.
         assigned_room (Optional[str]): Phòng thi được phân công.
         student_count (int): Số lượng sinh viên trong ca này.
+        assigned_proctor_id (Optional[str]): Mã giám thị coi thi ca này (None nếu chưa phân công).
     
     Note:
         - Một Course có thể có nhiều CourseSession (legacy support)
@@ -37,6 +38,8 @@ class CourseSession:
     assigned_time: Optional[str] = None
     assigned_room: Optional[str] = None
     student_count: int = 0
+    # Khai báo sẵn (mặc định None) để ConstraintChecker đọc trực tiếp thay vì hasattr/getattr
+    assigned_proctor_id: Optional[str] = None
     
     def is_scheduled(self) -> bool:
         """
@@ -45,17 +48,20 @@ class CourseSession:
         Returns:
             bool: True nếu đã có đủ thông tin ngày, giờ và phòng thi.
         """
-        return all([
-            self.assigned_date is not None,
-            self.assigned_time is not None,
-            self.assigned_room is not None
-        ])
+        # Chuỗi `and` ngắt sớm, không dựng list tạm như all([...]) - hàm này được
+        # gọi cho từng session mỗi khi Course.is_scheduled() duyệt sessions
+        return (
+            self.assigned_date is not None
+            and self.assigned_time is not None
+            and self.assigned_room is not None
+        )
     
     def clear_schedule(self) -> None:
         """Xóa thông tin xếp lịch của ca thi."""
         self.assigned_date = None
         self.assigned_time = None
         self.assigned_room = None
+        self.assigned_proctor_id = None
     
     def __str__(self) -> str:
         """Trả về chuỗi mô tả ca thi."""
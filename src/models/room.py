@@ -6,7 +6,8 @@ Chứa thông tin về sức chứa và vị trí địa lý của phòng.
 from dataclasses import dataclass
 
 
-@dataclass
+# OPTIMIZATION: slots=True - không có __dict__ riêng cho mỗi phòng (giống Course)
+@dataclass(slots=True)
 class Room:
     """
     Class đại diện cho một phòng thi.
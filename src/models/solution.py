@@ -4,11 +4,44 @@ Data class đại diện cho một giải pháp xếp lịch thi hoàn chỉnh.
 """
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
 
 from .course import Course
 
 
+class ScheduleArrays(NamedTuple):
+    """
+    Dạng struct-of-arrays của các ca thi đã xếp lịch (mỗi phần tử = 1 môn hoặc 1 session).
+    
+    Attributes:
+        course_index (np.ndarray): Index của môn trong Schedule.courses (int32).
+        student_count (np.ndarray): Số sinh viên của ca thi (int32).
+        duration (np.ndarray): Thời lượng thi - phút (int32, lấy từ môn cha).
+        rooms (List[str]): Mã phòng của từng ca thi.
+    """
+    course_index: np.ndarray
+    student_count: np.ndarray
+    duration: np.ndarray
+    rooms: List[str]
+    
+    @classmethod
+    def from_records(cls, records: List[Tuple[int, int, int, str]]) -> 'ScheduleArrays':
+        """Dựng từ danh sách (course_index, student_count, duration, room) của từng ca."""
+        if not records:
+            empty = np.empty(0, dtype=np.int32)
+            return cls(empty, empty, empty, [])
+        
+        course_index, student_count, duration, rooms = zip(*records)
+        return cls(
+            course_index=np.array(course_index, dtype=np.int32),
+            student_count=np.array(student_count, dtype=np.int32),
+            duration=np.array(duration, dtype=np.int32),
+            rooms=list(rooms),
+        )
+
+
 @dataclass
 class Schedule:
     """
@@ -30,6 +63,30 @@ class Schedule:
     courses: List[Course] = field(default_factory=list)
     fitness_score: float = 0.0
     
+    def to_soa(self) -> ScheduleArrays:
+        """
+        Làm phẳng các ca thi đã xếp lịch thành các mảng NumPy song song.
+        
+        Môn chia ca: mỗi session đã xếp lịch là 1 phần tử; môn không chia ca: chính
+        môn đó (nếu đã xếp lịch). Dùng cho các phép kiểm tra ràng buộc dạng vector.
+        
+        Returns:
+            ScheduleArrays: Các mảng theo thứ tự duyệt courses/sessions.
+        """
+        # OPTIMIZATION: Gom mỗi ca thành 1 tuple rồi zip(*) thành các cột - rẻ hơn
+        # append vào 4 list riêng ở mỗi vòng lặp
+        records = []
+        append = records.append
+        for idx, course in enumerate(self.courses):
+            if course.sessions:
+                for session in course.sessions:
+                    if session.is_scheduled():
+                        append((idx, session.student_count, course.duration, session.assigned_room))
+            elif course.is_scheduled():
+                append((idx, course.student_count, course.duration, course.assigned_room))
+        
+        return ScheduleArrays.from_records(records)
+    
     def get_scheduled_count(self) -> int:
         """
         Đếm số môn học đã được xếp lịch đầy đủ.
@@ -5,12 +5,15 @@ Cập nhật: Tích hợp DataLoader để đọc file Excel/CSV.
 """
 
 import sys
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from PyQt5.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QApplication, QFileDialog,
     QMessageBox, QTableWidget, QTableWidgetItem, QDialog, QLabel, QPushButton
 )
-from PyQt5.QtCore import Qt, pyqtSlot, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSlot, QThread, pyqtSignal, QObject, QRunnable, QThreadPool
 from PyQt5.QtGui import QIcon
 
 # Import Fluent Widgets
@@ -36,8 +39,8 @@ from src.models.proctor import Proctor
 from src.models.solution import Schedule
 from src.core.solvers.sa_solver import SASolver
 from src.core.solvers.pso_solver import PSOSolver
-from src.utils.data_loader import DataLoader  # <--- MỚI: Import DataLoader
-from src.utils.exporter import Exporter
+# DataLoader (pandas) và Exporter (openpyxl) được import lười trong
+# import_data/export_data để không cộng thời gian import vào lúc khởi động
 
 # Import Widgets
 from src.ui.widgets.config_widget import ConfigWidget
@@ -46,6 +49,35 @@ from src.ui.widgets.schedule_table import ScheduleResultTable
 from src.ui.widgets.data_viewer import DataViewerWidget
 
 
+class _FileIOSignals(QObject):
+    """Signals cho _FileIOWorker (QRunnable không phải QObject)."""
+    finished = pyqtSignal(object)  # Kết quả trả về của hàm
+    failed = pyqtSignal(str)       # Thông báo lỗi
+
+
+class _FileIOWorker(QRunnable):
+    """
+    Worker chạy một thao tác I/O file (callable + args) trên QThreadPool.
+    
+    Kết quả được gửi về GUI thread qua signals (queued connection), nên các slot
+    nhận kết quả có thể cập nhật widget an toàn.
+    """
+    
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _FileIOSignals()
+    
+    def run(self):
+        try:
+            result = self.func(*self.args, **self.kwargs)
+            self.signals.finished.emit(result)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
 class DashboardInterface(QWidget):
     """
     Giao diện Tab Dashboard: Chứa Config và Chart (Responsive).
@@ -69,6 +101,13 @@ class MainWindow(FluentWindow):
     """
     Cửa sổ chính ứng dụng.
     """
+    # Bảng tra thuật toán: key 'algorithm' trong config -> (lớp Solver, tên hiển thị).
+    # Key không có trong bảng dùng mặc định SA.
+    _SOLVERS = {
+        'sa': (SASolver, "Simulated Annealing (SA)"),
+        'pso': (PSOSolver, "Particle Swarm Optimization (PSO)"),
+    }
+
     def __init__(self):
         super().__init__()
         
@@ -138,6 +177,11 @@ class MainWindow(FluentWindow):
         
         # Biến lưu solver
         self.solver = None
+        self._close_pending_solver = None  # Solver đang được chờ dừng để đóng cửa sổ
+        self._export_worker = None
+        
+        # Logging cho solver (ghi log trên thread nền)
+        self._init_solver_logging()
         
         # Biến cho benchmark
         self.benchmark_running = False
@@ -156,6 +200,73 @@ class MainWindow(FluentWindow):
         """Handle window resize to maintain proportional layouts."""
         super().resizeEvent(event)
 
+    def closeEvent(self, event):
+        """
+        Dừng solver đang chạy (cooperative) trước khi đóng cửa sổ.
+        
+        Không chờ thread trên GUI thread: yêu cầu dừng, hoãn việc đóng và đóng
+        lại khi solver phát finished. Nếu lúc đó đã có solver khác chạy tiếp
+        (benchmark: SA xong thì khởi động PSO), lặp lại với solver mới.
+        """
+        solver = self.solver
+        if solver is not None and solver.isRunning():
+            solver.request_stop()
+            if self._close_pending_solver is not solver:
+                self._close_pending_solver = solver
+                # Nối trước rồi mới kiểm tra lại để không bỏ lỡ finished phát giữa 2 bước
+                solver.finished.connect(self.close)
+            if solver.isRunning():
+                event.ignore()
+                return
+        self._shutdown_solver_logging()
+        super().closeEvent(event)
+
+    def _replace_solver(self, new_solver):
+        """
+        Đặt solver mới làm solver hiện tại và giải phóng QThread của solver cũ.
+        
+        OPTIMIZATION: Mỗi lần chạy tạo một QThread solver mới; các signal nối
+        bằng lambda giữ tham chiếu tới solver nên solver cũ (kèm bản deepcopy
+        courses và lịch tốt nhất) không bao giờ được thu hồi. deleteLater sau
+        khi thread đã thoát giữ số QThread sống ở mức 1-2 dù chạy bao nhiêu lần.
+        """
+        old_solver = self.solver
+        self.solver = new_solver
+        if old_solver is None or old_solver is new_solver:
+            return
+        # Nối trước rồi mới kiểm tra để không bỏ lỡ finished phát giữa 2 bước
+        old_solver.finished.connect(old_solver.deleteLater)
+        if not old_solver.isRunning():
+            old_solver.deleteLater()
+
+    def _init_solver_logging(self):
+        """
+        Khởi tạo logger cho log của solver.
+        
+        OPTIMIZATION: Thay vì connect log_signal -> print (ghi stdout đồng bộ trên
+        GUI thread cho từng dòng), log được đẩy vào queue qua QueueHandler và một
+        QueueListener ghi ra console trên thread nền.
+        """
+        log_queue = queue.SimpleQueue()
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        
+        self._solver_log_handler = QueueHandler(log_queue)
+        self._solver_log_listener = QueueListener(log_queue, console_handler)
+        self._solver_log_listener.start()
+        
+        self.solver_logger = logging.getLogger("solver")
+        self.solver_logger.setLevel(logging.INFO)
+        self.solver_logger.propagate = False  # Không lặp lại qua root handler
+        self.solver_logger.addHandler(self._solver_log_handler)
+
+    def _shutdown_solver_logging(self):
+        """Dừng QueueListener (flush các log còn lại) và gỡ handler."""
+        if self._solver_log_listener is not None:
+            self._solver_log_listener.stop()
+            self._solver_log_listener = None
+            self.solver_logger.removeHandler(self._solver_log_handler)
+
     def _init_navigation(self):
         """Thiết lập menu điều hướng."""
         self.addSubInterface(
@@ -195,6 +306,8 @@ class MainWindow(FluentWindow):
         if not file_path:
             return  # Người dùng bấm Cancel
 
+        from src.utils.data_loader import DataLoader
+
         try:
             # Load Môn học trước để kiểm tra file có hợp lệ không
             new_courses = DataLoader.load_courses(file_path)
@@ -307,12 +420,8 @@ class MainWindow(FluentWindow):
         courses_copy = copy.deepcopy(self.courses)
         
         # 4. Khởi tạo Solver dựa trên lựa chọn (truyền proctors nếu có)
-        if algo_type == 'pso':
-            self.solver = PSOSolver(courses_copy, self.rooms, config, self.proctors)
-            algo_name = "Particle Swarm Optimization (PSO)"
-        else:
-            self.solver = SASolver(courses_copy, self.rooms, config, self.proctors)
-            algo_name = "Simulated Annealing (SA)"
+        solver_cls, algo_name = self._SOLVERS.get(algo_type, self._SOLVERS['sa'])
+        self._replace_solver(solver_cls(courses_copy, self.rooms, config, self.proctors))
             
         # 5. Kết nối signals
         self.solver.step_signal.connect(self.chart_widget.update_plot)
@@ -321,8 +430,9 @@ class MainWindow(FluentWindow):
         
         # Kết nối log nếu có (Optional)
         if hasattr(self.solver, 'log_signal'):
-             # Bạn có thể thêm 1 widget log nếu muốn, hoặc in ra console
-             self.solver.log_signal.connect(print)
+            # DirectConnection: logger.info chỉ đẩy record vào queue (thread-safe),
+            # chạy ngay trên thread của solver - không đi qua event loop của GUI
+            self.solver.log_signal.connect(self.solver_logger.info, Qt.DirectConnection)
 
         # 6. Start
         self.solver.start()
@@ -400,7 +510,26 @@ class MainWindow(FluentWindow):
         if not file_path:
             return
 
-        success = Exporter.export_to_excel(self.solver.best_solution, file_path, self.proctors_dict)
+        from src.utils.exporter import Exporter
+
+        # OPTIMIZATION: Ghi Excel (openpyxl) trên thread nền để không đóng băng GUI.
+        # best_solution không bị sửa sau khi solver kết thúc (mỗi lần chạy dùng
+        # bản deepcopy riêng của courses) nên có thể đọc trực tiếp từ worker.
+        worker = _FileIOWorker(
+            Exporter.export_to_excel, self.solver.best_solution, file_path, self.proctors_dict
+        )
+        worker.signals.finished.connect(
+            lambda success: self._on_export_finished(success, file_path)
+        )
+        worker.signals.failed.connect(lambda _msg: self._on_export_finished(False, file_path))
+        self._export_worker = worker  # Giữ tham chiếu tới khi signals được xử lý
+        self.export_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_export_finished(self, success: bool, file_path: str):
+        """Xử lý kết quả xuất Excel (chạy trên GUI thread)."""
+        self._export_worker = None
+        self.export_btn.setEnabled(self.solver is not None and self.solver.best_solution is not None)
 
         if success:
             InfoBar.success(title="Thành công", content=f"Đã lưu file tại: {file_path}", parent=self)
@@ -504,7 +633,8 @@ class MainWindow(FluentWindow):
         # Lưu tạm PSO config để truyền qua callback
         self._temp_pso_config = pso_bench_config
         
-        # Deepcopy dữ liệu
+        # Snapshot dữ liệu 1 lần cho cả benchmark: SA và PSO chỉ đọc danh sách
+        # courses đầu vào (luôn dựng Course mới để xếp lịch) nên dùng chung được
         import copy
         courses_copy = copy.deepcopy(self.courses)
         
@@ -551,11 +681,42 @@ class MainWindow(FluentWindow):
         )
         
         # Lưu solver để có thể stop
-        self.solver = sa_solver
+        self._replace_solver(sa_solver)
         
         # Start
         sa_solver.start()
     
+    @staticmethod
+    def _summarize_benchmark_run(best_schedule: Schedule, solver) -> dict:
+        """
+        Tổng hợp kết quả một lượt chạy benchmark (dùng chung cho SA và PSO).
+        
+        Args:
+            best_schedule: Schedule tốt nhất solver trả về.
+            solver: Solver instance đã chạy xong.
+        
+        Returns:
+            dict: schedule, history, time, iterations, initial_cost, best_cost,
+                  improvement, feasible.
+        """
+        # OPTIMIZATION: Các chỉ số được lấy từ lịch sử hội tụ trong một lần
+        # đọc, thay vì lặp lại cùng một đoạn tính toán cho từng thuật toán
+        history = solver.get_convergence_history()
+        initial = history[0] if history else 0
+        best = best_schedule.fitness_score if best_schedule.fitness_score is not None else (history[-1] if history else 0)
+        improvement = ((initial - best) / initial * 100) if initial > 0 else 0
+        
+        return {
+            'schedule': best_schedule,
+            'history': history,
+            'time': solver.get_execution_time(),
+            'iterations': getattr(solver, 'total_iterations', len(history)),
+            'initial_cost': initial,
+            'best_cost': best,
+            'improvement': improvement,
+            'feasible': solver.constraint_checker.is_feasible(best_schedule) if hasattr(solver, 'constraint_checker') else False
+        }
+    
     def _on_sa_finished_for_benchmark(self, best_schedule: Schedule, sa_solver, courses_copy):
         """
         Xử lý khi SA kết thúc trong benchmark.
@@ -563,26 +724,23 @@ class MainWindow(FluentWindow):
         Args:
             best_schedule: Schedule tốt nhất từ SA.
             sa_solver: SA Solver instance.
-            courses_copy: Deepcopy của courses (không dùng, chỉ để tương thích).
+            courses_copy: Snapshot courses của benchmark (dùng lại cho PSO).
         """
+        # Bước 2: Tự động chạy PSO với config đã cô lập
+        # OPTIMIZATION: Khởi động PSO ngay, trước phần tổng hợp kết quả SA
+        # (is_feasible quét toàn bộ ràng buộc trên GUI thread) - PSO chạy song
+        # song thay vì chờ. finished_signal của PSO đi qua event loop nên chỉ
+        # được xử lý sau khi hàm này đã lưu xong benchmark_sa_result.
+        # Lấy PSO config từ biến tạm (đã được set trong run_benchmark)
+        pso_bench_config = self._temp_pso_config
+        if pso_bench_config is not None:
+            # OPTIMIZATION: Dùng lại snapshot của benchmark thay vì deepcopy lần 2
+            self._run_pso_for_benchmark(courses_copy, pso_bench_config)
+        
         # Lưu kết quả SA
-        sa_history = sa_solver.get_convergence_history()
-        sa_time = sa_solver.get_execution_time()
-        sa_iterations = sa_solver.total_iterations if hasattr(sa_solver, 'total_iterations') else len(sa_history)
-        sa_initial = sa_history[0] if sa_history else 0
-        sa_best = best_schedule.fitness_score if best_schedule.fitness_score is not None else (sa_history[-1] if sa_history else 0)
-        sa_improvement = ((sa_initial - sa_best) / sa_initial * 100) if sa_initial > 0 else 0
-        
-        self.benchmark_sa_result = {
-            'schedule': best_schedule,
-            'history': sa_history,
-            'time': sa_time,
-            'iterations': sa_iterations,
-            'initial_cost': sa_initial,
-            'best_cost': sa_best,
-            'improvement': sa_improvement,
-            'feasible': sa_solver.constraint_checker.is_feasible(best_schedule) if hasattr(sa_solver, 'constraint_checker') else False
-        }
+        self.benchmark_sa_result = self._summarize_benchmark_run(best_schedule, sa_solver)
+        sa_best = self.benchmark_sa_result['best_cost']
+        sa_improvement = self.benchmark_sa_result['improvement']
         
         # Thông báo SA hoàn thành
         InfoBar.success(
@@ -593,16 +751,8 @@ class MainWindow(FluentWindow):
             duration=5000
         )
         
-        # Bước 2: Tự động chạy PSO với config đã cô lập
-        # Lấy PSO config từ biến tạm (đã được set trong run_benchmark)
-        if self._temp_pso_config is None:
+        if pso_bench_config is None:
             self._on_benchmark_error("PSO config không tồn tại", "SA")
-            return
-        
-        pso_bench_config = self._temp_pso_config
-        import copy
-        courses_copy_pso = copy.deepcopy(self.courses)
-        self._run_pso_for_benchmark(courses_copy_pso, pso_bench_config)
     
     def _run_pso_for_benchmark(self, courses_copy, pso_bench_config):
         """
@@ -625,7 +775,7 @@ class MainWindow(FluentWindow):
         )
         
         # Lưu solver để có thể stop
-        self.solver = pso_solver
+        self._replace_solver(pso_solver)
         
         # Start
         pso_solver.start()
@@ -633,23 +783,7 @@ class MainWindow(FluentWindow):
     def _on_pso_finished_for_benchmark(self, best_schedule: Schedule, pso_solver):
         """Xử lý khi PSO kết thúc trong benchmark."""
         # Lưu kết quả PSO
-        pso_history = pso_solver.get_convergence_history()
-        pso_time = pso_solver.get_execution_time()
-        pso_iterations = pso_solver.total_iterations if hasattr(pso_solver, 'total_iterations') else len(pso_history)
-        pso_initial = pso_history[0] if pso_history else 0
-        pso_best = best_schedule.fitness_score if best_schedule.fitness_score is not None else (pso_history[-1] if pso_history else 0)
-        pso_improvement = ((pso_initial - pso_best) / pso_initial * 100) if pso_initial > 0 else 0
-        
-        self.benchmark_pso_result = {
-            'schedule': best_schedule,
-            'history': pso_history,
-            'time': pso_time,
-            'iterations': pso_iterations,
-            'initial_cost': pso_initial,
-            'best_cost': pso_best,
-            'improvement': pso_improvement,
-            'feasible': pso_solver.constraint_checker.is_feasible(best_schedule) if hasattr(pso_solver, 'constraint_checker') else False
-        }
+        self.benchmark_pso_result = self._summarize_benchmark_run(best_schedule, pso_solver)
         
         # Bước 3: Vẽ biểu đồ so sánh
         if self.benchmark_sa_result and self.benchmark_pso_result:
@@ -10,7 +10,7 @@ from PyQt5.QtWidgets import (
     QLabel, QPushButton, QComboBox
 )
 from PyQt5.QtCore import Qt, QDate
-from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtGui import QBrush, QColor, QFont
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Tuple, Set
 
@@ -50,6 +50,8 @@ class CalendarView(QWidget):
         self.proctors_dict: Dict = {}
         self.current_week_index: int = 0
         self.weeks: List[Tuple[datetime, datetime]] = []  # (start_date, end_date) của mỗi tuần
+        # Courses nhóm theo ngày Thứ 2 của tuần (tính 1 lần trong _calculate_weeks)
+        self._courses_by_week: Dict = {}
         
         # Setup UI
         self._setup_ui()
@@ -228,20 +230,29 @@ class CalendarView(QWidget):
         
         Một tuần được định nghĩa là từ Thứ 2 đến Chủ Nhật.
         """
+        self._courses_by_week = {}
         if not self.schedule or not self.schedule.courses:
             self.weeks = []
             return
         
         # Lấy tất cả ngày thi duy nhất
+        # OPTIMIZATION: Đồng thời nhóm courses theo tuần (ngày Thứ 2) - mỗi ngày thi
+        # chỉ parse 1 lần, đổi tuần chỉ là 1 lần tra dict thay vì quét lại toàn bộ lịch
         dates_set = set()
+        monday_of = {}  # assigned_date -> ngày Thứ 2 của tuần (None nếu không parse được)
         for course in self.schedule.courses:
             if course.assigned_date:
-                try:
-                    # Parse date string (định dạng YYYY-MM-DD)
-                    date_obj = datetime.strptime(course.assigned_date, "%Y-%m-%d").date()
-                    dates_set.add(date_obj)
-                except ValueError:
-                    pass
+                if course.assigned_date not in monday_of:
+                    try:
+                        # Parse date string (định dạng YYYY-MM-DD)
+                        date_obj = datetime.strptime(course.assigned_date, "%Y-%m-%d").date()
+                        dates_set.add(date_obj)
+                        monday_of[course.assigned_date] = date_obj - timedelta(days=date_obj.weekday())
+                    except ValueError:
+                        monday_of[course.assigned_date] = None
+                monday = monday_of[course.assigned_date]
+                if monday is not None:
+                    self._courses_by_week.setdefault(monday, []).append(course)
         
         if not dates_set:
             self.weeks = []
@@ -331,48 +342,45 @@ class CalendarView(QWidget):
             self._clear_table()
             return
         
-        # Tạo ma trận
-        self.table.setColumnCount(len(room_ids))
-        self.table.setRowCount(len(time_slots))
+        # OPTIMIZATION: Tắt repaint + signals trong lúc dựng lại cả bảng tuần
+        # (resize, header, setItem từng ô, style) - chỉ repaint một lần ở cuối
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            # Tạo ma trận
+            self.table.setColumnCount(len(room_ids))
+            self.table.setRowCount(len(time_slots))
         
-        # Set header
-        self.table.setHorizontalHeaderLabels(room_ids)
+            # Set header
+            self.table.setHorizontalHeaderLabels(room_ids)
         
-        # Set row labels (ngày + giờ để dễ đọc hơn)
-        row_labels = []
-        for date_str, time_str in time_slots:
-            # Parse date để lấy ngày/tháng
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                date_label = date_obj.strftime("%a %d/%m")  # "Mon 15/11"
-                row_labels.append(f"{date_label}\n{time_str}")
-            except ValueError:
-                row_labels.append(f"{date_str}\n{time_str}")
+            # Set row labels (ngày + giờ để dễ đọc hơn)
+            row_labels = []
+            for date_str, time_str in time_slots:
+                # Parse date để lấy ngày/tháng
+                try:
+                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+                    date_label = date_obj.strftime("%a %d/%m")  # "Mon 15/11"
+                    row_labels.append(f"{date_label}\n{time_str}")
+                except ValueError:
+                    row_labels.append(f"{date_str}\n{time_str}")
         
-        self.table.setVerticalHeaderLabels(row_labels)
+            self.table.setVerticalHeaderLabels(row_labels)
         
-        # Điền dữ liệu
-        self._fill_courses_to_table_week(week_courses, room_ids, time_slots)
+            # Điền dữ liệu
+            self._fill_courses_to_table_week(week_courses, room_ids, time_slots)
         
-        # Style
-        self._style_table()
+            # Style
+            self._style_table()
+        finally:
+            self.table.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
+            self.table.viewport().update()
     
     def _get_courses_for_week(self, start_date, end_date) -> List:
         """Lấy tất cả courses trong tuần từ start_date đến end_date (inclusive)."""
-        week_courses = []
-        
-        for course in self.schedule.courses:
-            if not course.assigned_date:
-                continue
-            
-            try:
-                course_date = datetime.strptime(course.assigned_date, "%Y-%m-%d").date()
-                if start_date <= course_date <= end_date:
-                    week_courses.append(course)
-            except ValueError:
-                pass
-        
-        return week_courses
+        # Tuần luôn bắt đầu từ Thứ 2 (xem _calculate_weeks) nên start_date là khóa nhóm
+        return self._courses_by_week.get(start_date, [])
     
     def _get_sorted_room_ids(self) -> List[str]:
         """
@@ -423,14 +431,17 @@ class CalendarView(QWidget):
         time_slot_row_map = {slot: idx for idx, slot in enumerate(time_slots)}
         
         # List màu khác nhau cho từng phòng
+        # OPTIMIZATION: Brush/font được tạo một lần và dùng chung cho mọi ô
         colors = [
-            QColor(200, 230, 255),  # Xanh nhạt
-            QColor(200, 255, 230),  # Lục nhạt
-            QColor(255, 230, 200),  # Cam nhạt
-            QColor(255, 200, 230),  # Hồng nhạt
-            QColor(230, 230, 255),  # Tím nhạt
-            QColor(255, 255, 200),  # Vàng nhạt
+            QBrush(QColor(200, 230, 255)),  # Xanh nhạt
+            QBrush(QColor(200, 255, 230)),  # Lục nhạt
+            QBrush(QColor(255, 230, 200)),  # Cam nhạt
+            QBrush(QColor(255, 200, 230)),  # Hồng nhạt
+            QBrush(QColor(230, 230, 255)),  # Tím nhạt
+            QBrush(QColor(255, 255, 200)),  # Vàng nhạt
         ]
+        text_brush = QBrush(QColor(0, 0, 0))
+        cell_font = None
         
         # Duyệt qua courses
         for course in week_courses:
@@ -457,10 +468,11 @@ class CalendarView(QWidget):
             item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
             
             # Set font - TO HƠN
-            font = item.font()
-            font.setPointSize(11)
-            font.setBold(True)
-            item.setFont(font)
+            if cell_font is None:
+                cell_font = item.font()
+                cell_font.setPointSize(11)
+                cell_font.setBold(True)
+            item.setFont(cell_font)
             
             # Set màu nền - rotate colors
             color_idx = col % len(colors)
@@ -468,7 +480,7 @@ class CalendarView(QWidget):
             item.setBackground(color)
             
             # Set màu chữ
-            item.setForeground(QColor(0, 0, 0))
+            item.setForeground(text_brush)
             
             # Đặt vào table
             self.table.setItem(row, col, item)
@@ -530,6 +542,7 @@ class CalendarView(QWidget):
         self.schedule = None
         self.rooms = []
         self.weeks = []
+        self._courses_by_week = {}
         self.current_week_index = 0
     
     def export_as_image(self, file_path: str) -> bool:
@@ -560,12 +573,15 @@ class CalendarView(QWidget):
         if not self.schedule or not self.schedule.courses:
             return {}
         
-        total_courses = len([c for c in self.schedule.courses if c.is_scheduled()])
         total_rooms = len(self.rooms)
         
-        # Tính tổng ca thi
+        # OPTIMIZATION: Đếm môn đã xếp lịch và gom ca thi trong cùng một lần duyệt
+        total_courses = 0
         all_time_slots = set()
         for course in self.schedule.courses:
+            if course.is_scheduled():
+                total_courses += 1
+            # Tính tổng ca thi
             if course.assigned_date and course.assigned_time:
                 all_time_slots.add((course.assigned_date, course.assigned_time))
         
@@ -4,14 +4,15 @@ Hiển thị: Iteration, Temperature/Inertia, Cost, Acceptance Rate, Updates, et
 """
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-                             QTableWidget, QTableWidgetItem, QHeaderView, QTabWidget)
-from PyQt5.QtCore import Qt
+                             QTableView, QHeaderView, QTabWidget)
+from PyQt5.QtCore import (Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal,
+                          QAbstractTableModel, QModelIndex)
 from PyQt5.QtGui import QColor, QFont, QBrush
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
-from typing import List, Optional, Dict, Any
+from matplotlib.collections import LineCollection
+from typing import List, Optional, Dict, Any, Tuple
 import numpy as np
 import matplotlib
 import warnings
@@ -43,6 +44,225 @@ except Exception as e:
 warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
 
 
+def _draw_algorithm_panels(fig: Figure, data: Dict[str, List]) -> None:
+    """
+    Vẽ 4 biểu đồ thông số thuật toán lên một Figure bất kỳ.
+    
+    Dùng chung cho canvas trên GUI và cho worker xuất ảnh (Agg offscreen).
+    
+    Args:
+        fig: Figure đích (đã được clear).
+        data: Dict dữ liệu theo định dạng của ChartWidget.get_data().
+    """
+    # Tạo subplots
+    ax1 = fig.add_subplot(2, 2, 1)
+    ax2 = fig.add_subplot(2, 2, 2)
+    ax3 = fig.add_subplot(2, 2, 3)
+    ax4 = fig.add_subplot(2, 2, 4)
+    
+    # ========== SUBPLOT 1: Cost Trend ==========
+    ax1.plot(data['iterations'], data['costs'], color='#0066FF', linewidth=2, marker='o', markersize=3)
+    ax1.set_xlabel('Iteration', fontsize=10, fontweight='bold')
+    ax1.set_ylabel('Cost', fontsize=10, fontweight='bold')
+    ax1.set_title('[Cost Trend] Trend over iterations', fontsize=11, fontweight='bold', color='#0066FF')
+    ax1.grid(True, alpha=0.3)
+    ax1.set_facecolor('#F5F5F5')
+    
+    # ========== SUBPLOT 2: Temperature/Inertia ==========
+    if data['temperatures']:
+        ax2.plot(data['iterations'][-len(data['temperatures']):], data['temperatures'], 
+                color='#FF6600', linewidth=2, marker='s', markersize=3)
+        ax2.set_title('[Temperature] SA Temperature', fontsize=11, fontweight='bold', color='#FF6600')
+    elif data['inertias']:
+        ax2.plot(data['iterations'][-len(data['inertias']):], data['inertias'],
+                color='#00CC00', linewidth=2, marker='^', markersize=3)
+        ax2.set_title('[Inertia] PSO Inertia Weight', fontsize=11, fontweight='bold', color='#00CC00')
+    
+    ax2.set_xlabel('Iteration', fontsize=10, fontweight='bold')
+    ax2.set_ylabel('Value', fontsize=10, fontweight='bold')
+    ax2.grid(True, alpha=0.3)
+    ax2.set_facecolor('#F5F5F5')
+    
+    # ========== SUBPLOT 3: Acceptance Rate ==========
+    if data['acceptance_rates']:
+        ax3.plot(data['iterations'][-len(data['acceptance_rates']):], data['acceptance_rates'],
+                color='#FF00FF', linewidth=2, marker='d', markersize=3)
+        ax3.set_ylim([0, 100])
+        ax3.axhline(y=50, color='r', linestyle='--', alpha=0.5, label='50%')
+        ax3.legend()
+    else:
+        ax3.text(0.5, 0.5, 'No data', ha='center', va='center',
+                transform=ax3.transAxes, fontsize=10, color='#999')
+    
+    ax3.set_xlabel('Iteration', fontsize=10, fontweight='bold')
+    ax3.set_ylabel('Rate (%)', fontsize=10, fontweight='bold')
+    ax3.set_title('[Acceptance Rate] Acceptance rate over iterations (%)', fontsize=11, fontweight='bold', color='#FF00FF')
+    ax3.grid(True, alpha=0.3)
+    ax3.set_facecolor('#F5F5F5')
+    
+    # ========== SUBPLOT 4: Updates ==========
+    if data['updates']:
+        # OPTIMIZATION: Vẽ toàn bộ cột bằng 1 LineCollection (vlines) thay vì
+        # ax.bar() tạo 1 Rectangle artist cho mỗi cột
+        updates_arr = np.asarray(data['updates'])
+        colors = np.where(updates_arr > 0, '#00AA00', '#CCCCCC')
+        ax4.vlines(data['iterations'][-len(data['updates']):], 0, updates_arr,
+                   colors=colors, linewidth=3, alpha=0.7)
+        ax4.set_ylim(bottom=0)
+    else:
+        ax4.text(0.5, 0.5, 'Không có dữ liệu', ha='center', va='center',
+                transform=ax4.transAxes, fontsize=10, color='#999')
+    
+    ax4.set_xlabel('Iteration', fontsize=10, fontweight='bold')
+    ax4.set_ylabel('Updates Count', fontsize=10, fontweight='bold')
+    ax4.set_title('[Updates] Number of updates', fontsize=11, fontweight='bold', color='#66CC00')
+    ax4.grid(True, alpha=0.3, axis='y')
+    ax4.set_facecolor('#F5F5F5')
+    
+    # Layout
+    fig.tight_layout()
+
+
+def _draw_comparison(fig: Figure, sa_history: List[float], pso_history: List[float]) -> None:
+    """
+    Vẽ biểu đồ so sánh SA vs PSO lên một Figure bất kỳ.
+    
+    Args:
+        fig: Figure đích (đã được clear).
+        sa_history: Lịch sử chi phí của SA
+        pso_history: Lịch sử chi phí của PSO
+    """
+    ax = fig.add_subplot(1, 1, 1)
+    
+    # SA curve
+    sa_x = list(range(1, len(sa_history) + 1))
+    ax.plot(sa_x, sa_history, color='#FF6600', linewidth=2, marker='o', 
+           markersize=3, label='SA Algorithm')
+    
+    # PSO curve
+    pso_x = list(range(1, len(pso_history) + 1))
+    ax.plot(pso_x, pso_history, color='#0099FF', linewidth=2, marker='s',
+           markersize=3, label='PSO Algorithm')
+    
+    ax.set_xlabel('Iteration', fontsize=11, fontweight='bold')
+    ax.set_ylabel('Cost', fontsize=11, fontweight='bold')
+    ax.set_title('Comparison: SA vs PSO', fontsize=12, fontweight='bold', color='#0066FF')
+    ax.grid(True, alpha=0.3)
+    ax.set_facecolor('#F5F5F5')
+    ax.legend(loc='upper right')
+    
+    fig.tight_layout()
+
+
+class _ImageExportSignals(QObject):
+    """Signals cho _ImageExportTask (QRunnable không phải QObject)."""
+    finished = pyqtSignal(str)  # filepath
+    failed = pyqtSignal(str)    # error message
+
+
+class _ImageExportTask(QRunnable):
+    """
+    Worker render + lưu biểu đồ ra file trên thread nền.
+    
+    Dùng Figure + FigureCanvasAgg riêng (offscreen, không gắn với Qt) nên không
+    đụng tới canvas đang hiển thị và không block GUI thread khi savefig dpi cao.
+    """
+    
+    def __init__(self, filepath: str, draw_func, draw_args: tuple, facecolor):
+        super().__init__()
+        self.filepath = filepath
+        self.draw_func = draw_func
+        self.draw_args = draw_args
+        self.facecolor = facecolor
+        self.signals = _ImageExportSignals()
+    
+    def run(self):
+        try:
+            fig = Figure(figsize=(12, 6), dpi=100, facecolor=self.facecolor)
+            FigureCanvasAgg(fig)
+            self.draw_func(fig, *self.draw_args)
+            fig.savefig(self.filepath, dpi=300, bbox_inches='tight')
+            self.signals.finished.emit(self.filepath)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+class _DetailTableModel(QAbstractTableModel):
+    """
+    Model cho bảng chi tiết của ChartWidget (mỗi dòng = 1 mốc iteration).
+    
+    OPTIMIZATION: Thay QTableWidget (8 QTableWidgetItem + QBrush/QColor mới cho
+    mỗi dòng) bằng model lưu tuple chuỗi + mã màu. Thêm dòng chỉ phát
+    beginInsertRows/endInsertRows; view chỉ đọc dữ liệu của các ô đang hiển thị.
+    Giữ tối đa max_rows dòng - dòng cũ nhất bị bỏ trước.
+    """
+    
+    HEADERS = (
+        "Iteration", "Cost", "Improvement %",
+        "Temp/Inertia", "Acceptance Rate", "Updates", "Time (s)", "Status"
+    )
+    
+    def __init__(self, max_rows: int, parent=None):
+        super().__init__(parent)
+        self.max_rows = max_rows
+        # Mỗi dòng: (texts, {col: màu nền}, {col: màu chữ})
+        self._rows: List[Tuple[Tuple[str, ...], Dict[int, str], Dict[int, str]]] = []
+        # Brush dùng chung theo mã màu (tạo 1 lần cho mỗi màu)
+        self._brushes: Dict[str, QBrush] = {}
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        texts, backgrounds, foregrounds = self._rows[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            return texts[col]
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignCenter | Qt.AlignVCenter)
+        if role == Qt.BackgroundRole:
+            return self._brush(backgrounds.get(col))
+        if role == Qt.ForegroundRole:
+            return self._brush(foregrounds.get(col))
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def _brush(self, color: Optional[str]) -> Optional[QBrush]:
+        if color is None:
+            return None
+        brush = self._brushes.get(color)
+        if brush is None:
+            brush = self._brushes[color] = QBrush(QColor(color))
+        return brush
+    
+    def append_row(self, texts: Tuple[str, ...],
+                   backgrounds: Dict[int, str], foregrounds: Dict[int, str]) -> None:
+        """Thêm 1 dòng vào cuối (bỏ dòng đầu nếu đã đủ max_rows)."""
+        if len(self._rows) >= self.max_rows:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            del self._rows[0]
+            self.endRemoveRows()
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append((texts, backgrounds, foregrounds))
+        self.endInsertRows()
+    
+    def clear(self) -> None:
+        """Xóa toàn bộ dòng."""
+        self.beginResetModel()
+        self._rows.clear()
+        self.endResetModel()
+
+
 class ChartWidget(QWidget):
     """
     Widget biểu diễn Gantt Chart và bảng thông số của thuật toán.
@@ -58,8 +278,22 @@ class ChartWidget(QWidget):
         canvas: Matplotlib canvas cho Gantt Chart
         data_table: Bảng hiển thị chi tiết
         algorithm_stats: Từ điển lưu thông số thuật toán
+    
+    Signals:
+        image_exported(str): Phát khi export_image() lưu file xong (đường dẫn file)
+        image_export_failed(str): Phát khi export_image() lỗi (thông báo lỗi)
     """
     
+    image_exported = pyqtSignal(str)
+    image_export_failed = pyqtSignal(str)
+    
+    # Khoảng thời gian tối thiểu giữa 2 lần vẽ lại biểu đồ (ms)
+    REDRAW_INTERVAL_MS = 150
+    # Khoảng thời gian tối thiểu giữa 2 lần cuộn bảng chi tiết xuống cuối (ms)
+    SCROLL_INTERVAL_MS = 100
+    # Số dòng tối đa giữ trong bảng chi tiết (dòng cũ nhất bị bỏ trước)
+    MAX_TABLE_ROWS = 500
+    
     def __init__(self, parent=None):
         """
         Khởi tạo Chart Widget.
@@ -86,6 +320,26 @@ class ChartWidget(QWidget):
         self.initial_cost = None
         self.current_iteration = 0
         
+        # Dữ liệu (sa_history, pso_history) nếu đang hiển thị biểu đồ so sánh
+        self._comparison_data = None
+        
+        # Các artist của biểu đồ realtime (None = cần dựng lại)
+        self._live_panels = None
+        
+        # OPTIMIZATION: Gộp các lần vẽ lại biểu đồ bằng single-shot QTimer -
+        # tối đa 1 lần redraw mỗi REDRAW_INTERVAL_MS dù solver emit dày đến đâu
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(self.REDRAW_INTERVAL_MS)
+        self._redraw_timer.timeout.connect(self._redraw_gantt_chart)
+        
+        # OPTIMIZATION: Tương tự, gộp các lần cuộn bảng chi tiết xuống cuối -
+        # scrollToBottom buộc bảng tính lại layout/scrollbar mỗi lần gọi
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(self.SCROLL_INTERVAL_MS)
+        self._scroll_timer.timeout.connect(self._scroll_table_to_bottom)
+        
         # Setup UI
         self._init_ui()
     
@@ -141,18 +395,15 @@ class ChartWidget(QWidget):
         self.table_widget = QWidget()
         table_layout = QVBoxLayout(self.table_widget)
         
-        # Tạo bảng
-        self.data_table = QTableWidget()
-        self.data_table.setColumnCount(8)
-        self.data_table.setHorizontalHeaderLabels([
-            "Iteration", "Cost", "Improvement %", 
-            "Temp/Inertia", "Acceptance Rate", "Updates", "Time (s)", "Status"
-        ])
+        # Tạo bảng (QTableView + model, xem _DetailTableModel)
+        self._table_model = _DetailTableModel(self.MAX_TABLE_ROWS, self)
+        self.data_table = QTableView()
+        self.data_table.setModel(self._table_model)
         
         # Set column widths
         self.data_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.data_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #E0E0E0;
                 background-color: #FFFFFF;
             }
@@ -172,7 +423,8 @@ class ChartWidget(QWidget):
         
         # ========== IMPROVEMENT LABEL ==========
         self.improvement_label = QLabel("[INFO] Waiting for algorithm...")
-        self.improvement_label.setStyleSheet("color: #999; font-size: 10pt; font-style: italic;")
+        self._improvement_style = "color: #999; font-size: 10pt; font-style: italic;"
+        self.improvement_label.setStyleSheet(self._improvement_style)
         main_layout.addWidget(self.improvement_label)
         
         self.setLayout(main_layout)
@@ -193,9 +445,24 @@ class ChartWidget(QWidget):
             acceptance_rate: Tỷ lệ chấp nhận
             updates: Số lần cập nhật
         """
+        if self._append_point(iteration, cost, temperature, inertia, acceptance_rate, updates):
+            # Update labels
+            self._update_statistics()
+    
+    def _append_point(self, iteration: int, cost: float, temperature: float,
+                      inertia: float, acceptance_rate: float, updates: int) -> bool:
+        """
+        Ghi nhận 1 điểm dữ liệu: lưu series, lên lịch redraw, thêm dòng bảng.
+        
+        OPTIMIZATION: Không cập nhật label thống kê - update_plot() làm việc đó
+        cho từng điểm, còn update_batch()/set_data() chỉ làm 1 lần sau cả lô.
+        
+        Returns:
+            bool: False nếu cost không hợp lệ (điểm bị bỏ qua).
+        """
         # Validate cost
         if not isinstance(cost, (int, float)) or cost == float('inf') or cost != cost:
-            return
+            return False
         
         # Append data
         self.iterations.append(iteration)
@@ -224,89 +491,190 @@ class ChartWidget(QWidget):
         
         self.current_iteration = iteration
         
-        # Update labels
-        self._update_statistics()
-        
         # Cập nhật biểu đồ (mỗi 10 iterations để không quá nhanh)
-        if iteration % 10 == 0 or iteration == 1:
-            self._redraw_gantt_chart()
+        # Lên lịch redraw qua timer thay vì vẽ ngay - nhiều điểm dữ liệu đến trong
+        # cùng khoảng REDRAW_INTERVAL_MS chỉ gây ra 1 lần vẽ
+        if (iteration % 10 == 0 or iteration == 1) and not self._redraw_timer.isActive():
+            self._redraw_timer.start()
         
         # Cập nhật bảng với dòng mới
         self._add_table_row(iteration, cost, temperature if temperature > 0 else None, 
                            inertia if inertia > 0 else None, 
                            acceptance_rate if acceptance_rate > 0 else None, 
                            updates if updates > 0 else None, None)
+        return True
     
     def _redraw_gantt_chart(self):
-        """Vẽ lại Gantt Chart với dữ liệu hiện tại."""
-        self.fig.clear()
+        """
+        Vẽ lại Gantt Chart với dữ liệu hiện tại.
+        
+        OPTIMIZATION: Axes và các artist (Line2D, LineCollection) chỉ được tạo
+        1 lần; các lần sau chỉ cập nhật dữ liệu (set_data/set_segments) rồi
+        draw_idle, thay vì fig.clear() + dựng lại 4 subplot mỗi lần.
+        """
+        self._redraw_timer.stop()
         
         if not self.iterations:
+            self.fig.clear()
+            self._live_panels = None
+            self._comparison_data = None
             return
         
-        # Tạo subplots
-        ax1 = self.fig.add_subplot(2, 2, 1)
-        ax2 = self.fig.add_subplot(2, 2, 2)
-        ax3 = self.fig.add_subplot(2, 2, 3)
-        ax4 = self.fig.add_subplot(2, 2, 4)
+        if self._live_panels is None:
+            self._build_live_panels()
+        self._update_live_panels()
+        
+        # draw_idle: gộp các yêu cầu vẽ lại, Qt chỉ render khi event loop rảnh
+        self.canvas.draw_idle()
+    
+    def _build_live_panels(self):
+        """Tạo 4 subplot + các artist rỗng cho chế độ cập nhật tăng dần."""
+        fig = self.fig
+        fig.clear()
+        self._comparison_data = None
+        
+        ax1 = fig.add_subplot(2, 2, 1)
+        ax2 = fig.add_subplot(2, 2, 2)
+        ax3 = fig.add_subplot(2, 2, 3)
+        ax4 = fig.add_subplot(2, 2, 4)
         
         # ========== SUBPLOT 1: Cost Trend ==========
-        ax1.plot(self.iterations, self.costs, color='#0066FF', linewidth=2, marker='o', markersize=3)
+        cost_line, = ax1.plot([], [], color='#0066FF', linewidth=2, marker='o', markersize=3)
         ax1.set_xlabel('Iteration', fontsize=10, fontweight='bold')
         ax1.set_ylabel('Cost', fontsize=10, fontweight='bold')
         ax1.set_title('[Cost Trend] Trend over iterations', fontsize=11, fontweight='bold', color='#0066FF')
-        ax1.grid(True, alpha=0.3)
-        ax1.set_facecolor('#F5F5F5')
         
         # ========== SUBPLOT 2: Temperature/Inertia ==========
-        if self.temperatures:
-            ax2.plot(self.iterations[-len(self.temperatures):], self.temperatures, 
-                    color='#FF6600', linewidth=2, marker='s', markersize=3)
-            ax2.set_title('[Temperature] SA Temperature', fontsize=11, fontweight='bold', color='#FF6600')
-        elif self.inertias:
-            ax2.plot(self.iterations[-len(self.inertias):], self.inertias,
-                    color='#00CC00', linewidth=2, marker='^', markersize=3)
-            ax2.set_title('[Inertia] PSO Inertia Weight', fontsize=11, fontweight='bold', color='#00CC00')
-        
+        param_line, = ax2.plot([], [], linewidth=2, markersize=3)
         ax2.set_xlabel('Iteration', fontsize=10, fontweight='bold')
         ax2.set_ylabel('Value', fontsize=10, fontweight='bold')
-        ax2.grid(True, alpha=0.3)
-        ax2.set_facecolor('#F5F5F5')
         
         # ========== SUBPLOT 3: Acceptance Rate ==========
-        if self.acceptance_rates:
-            ax3.plot(self.iterations[-len(self.acceptance_rates):], self.acceptance_rates,
-                    color='#FF00FF', linewidth=2, marker='d', markersize=3)
-            ax3.set_ylim([0, 100])
-            ax3.axhline(y=50, color='r', linestyle='--', alpha=0.5, label='50%')
-            ax3.legend()
-        else:
-            ax3.text(0.5, 0.5, 'No data', ha='center', va='center',
-                    transform=ax3.transAxes, fontsize=10, color='#999')
-        
+        acc_line, = ax3.plot([], [], color='#FF00FF', linewidth=2, marker='d', markersize=3)
+        acc_ref = ax3.axhline(y=50, color='r', linestyle='--', alpha=0.5, label='50%')
+        acc_ref.set_visible(False)
+        acc_empty = ax3.text(0.5, 0.5, 'No data', ha='center', va='center',
+                             transform=ax3.transAxes, fontsize=10, color='#999')
         ax3.set_xlabel('Iteration', fontsize=10, fontweight='bold')
         ax3.set_ylabel('Rate (%)', fontsize=10, fontweight='bold')
         ax3.set_title('[Acceptance Rate] Acceptance rate over iterations (%)', fontsize=11, fontweight='bold', color='#FF00FF')
-        ax3.grid(True, alpha=0.3)
-        ax3.set_facecolor('#F5F5F5')
         
         # ========== SUBPLOT 4: Updates ==========
-        if self.updates:
-            colors = ['#00AA00' if u > 0 else '#CCCCCC' for u in self.updates]
-            ax4.bar(self.iterations[-len(self.updates):], self.updates, color=colors, alpha=0.7)
-        else:
-            ax4.text(0.5, 0.5, 'Không có dữ liệu', ha='center', va='center',
-                    transform=ax4.transAxes, fontsize=10, color='#999')
-        
+        updates_coll = LineCollection([], linewidth=3, alpha=0.7)
+        ax4.add_collection(updates_coll)
+        updates_empty = ax4.text(0.5, 0.5, 'Không có dữ liệu', ha='center', va='center',
+                                 transform=ax4.transAxes, fontsize=10, color='#999')
         ax4.set_xlabel('Iteration', fontsize=10, fontweight='bold')
         ax4.set_ylabel('Updates Count', fontsize=10, fontweight='bold')
         ax4.set_title('[Updates] Number of updates', fontsize=11, fontweight='bold', color='#66CC00')
+        
+        for ax in (ax1, ax2, ax3):
+            ax.grid(True, alpha=0.3)
         ax4.grid(True, alpha=0.3, axis='y')
-        ax4.set_facecolor('#F5F5F5')
+        for ax in (ax1, ax2, ax3, ax4):
+            ax.set_facecolor('#F5F5F5')
+        
+        fig.tight_layout()
+        
+        self._live_panels = {
+            'axes': (ax1, ax2, ax3, ax4),
+            'cost_line': cost_line,
+            'param_line': param_line,
+            'param_mode': None,
+            'acc_line': acc_line,
+            'acc_ref': acc_ref,
+            'acc_empty': acc_empty,
+            'acc_shown': False,
+            'updates_coll': updates_coll,
+            'updates_empty': updates_empty,
+        }
+    
+    def _update_live_panels(self):
+        """Cập nhật dữ liệu cho các artist đã tạo bởi _build_live_panels()."""
+        live = self._live_panels
+        ax1, ax2, ax3, ax4 = live['axes']
+        iterations = self.iterations
         
-        # Layout
-        self.fig.tight_layout()
-        self.canvas.draw()
+        # ========== SUBPLOT 1: Cost Trend ==========
+        live['cost_line'].set_data(iterations, self.costs)
+        ax1.relim()
+        ax1.autoscale_view()
+        
+        # ========== SUBPLOT 2: Temperature/Inertia ==========
+        if self.temperatures:
+            mode, values = 'temperature', self.temperatures
+        elif self.inertias:
+            mode, values = 'inertia', self.inertias
+        else:
+            mode, values = None, None
+        
+        param_line = live['param_line']
+        if mode != live['param_mode']:
+            live['param_mode'] = mode
+            if mode == 'temperature':
+                param_line.set_color('#FF6600')
+                param_line.set_marker('s')
+                ax2.set_title('[Temperature] SA Temperature', fontsize=11, fontweight='bold', color='#FF6600')
+            elif mode == 'inertia':
+                param_line.set_color('#00CC00')
+                param_line.set_marker('^')
+                ax2.set_title('[Inertia] PSO Inertia Weight', fontsize=11, fontweight='bold', color='#00CC00')
+            else:
+                ax2.set_title('')
+                param_line.set_data([], [])
+            self.fig.tight_layout()
+        
+        if values:
+            param_line.set_data(iterations[-len(values):], values)
+            ax2.relim()
+            ax2.autoscale_view()
+        
+        # ========== SUBPLOT 3: Acceptance Rate ==========
+        if self.acceptance_rates:
+            x = iterations[-len(self.acceptance_rates):]
+            live['acc_line'].set_data(x, self.acceptance_rates)
+            if not live['acc_shown']:
+                live['acc_shown'] = True
+                live['acc_ref'].set_visible(True)
+                live['acc_empty'].set_visible(False)
+                ax3.set_ylim([0, 100])
+                ax3.legend()
+            ax3.set_xlim(*self._x_span(x))
+        
+        # ========== SUBPLOT 4: Updates ==========
+        if self.updates:
+            x = np.asarray(iterations[-len(self.updates):], dtype=float)
+            updates_arr = np.asarray(self.updates, dtype=float)
+            # Mỗi cột là 1 đoạn thẳng (x, 0) -> (x, updates)
+            segments = np.zeros((len(x), 2, 2))
+            segments[:, :, 0] = x[:, None]
+            segments[:, 1, 1] = updates_arr
+            coll = live['updates_coll']
+            coll.set_segments(segments)
+            coll.set_color(np.where(updates_arr > 0, '#00AA00', '#CCCCCC'))
+            live['updates_empty'].set_visible(False)
+            ax4.set_xlim(*self._x_span(x))
+            ax4.set_ylim(0, max(float(updates_arr.max()) * 1.05, 1.0))
+    
+    @staticmethod
+    def _x_span(x) -> tuple:
+        """Giới hạn trục x (có lề 5%) cho dãy iteration tăng dần."""
+        x0, x1 = float(x[0]), float(x[-1])
+        if x1 <= x0:
+            return x0 - 1, x0 + 1
+        pad = (x1 - x0) * 0.05
+        return x0 - pad, x1 + pad
+    
+    def _plot_data(self) -> Dict[str, List]:
+        """Dữ liệu vẽ (tham chiếu trực tiếp, không copy) cho canvas trên GUI."""
+        return {
+            'iterations': self.iterations,
+            'costs': self.costs,
+            'temperatures': self.temperatures,
+            'inertias': self.inertias,
+            'acceptance_rates': self.acceptance_rates,
+            'updates': self.updates
+        }
     
     def _add_table_row(self, iteration: int, cost: float, 
                       temperature: Optional[float] = None,
@@ -318,9 +686,6 @@ class ChartWidget(QWidget):
         if iteration % 10 != 0 and iteration != 1:
             return
         
-        row_position = self.data_table.rowCount()
-        self.data_table.insertRow(row_position)
-        
         # Calculate improvement
         if self.initial_cost and self.initial_cost > 0:
             improvement = ((self.initial_cost - cost) / self.initial_cost) * 100
@@ -328,7 +693,7 @@ class ChartWidget(QWidget):
             improvement = 0
         
         # Prepare row data
-        row_data = [
+        row_data = (
             str(iteration),
             f"{cost:.2f}",
             f"{improvement:.2f}%",
@@ -337,37 +702,28 @@ class ChartWidget(QWidget):
             str(updates) if updates else "N/A",
             f"{elapsed_time:.2f}s" if elapsed_time else "N/A",
             "[OK] Tốt" if improvement > 0 else "[CHỜ] Chờ đợi"
-        ]
+        )
         
-        # Add items
-        for col, data in enumerate(row_data):
-            item = QTableWidgetItem(data)
-            item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
-            
-            # Color coding
-            if col == 1:  # Cost
-                if cost < self.best_cost * 1.1:  # Gần với best
-                    item.setBackground(QBrush(QColor("#C8E6C9")))  # Xanh nhạt
-                else:
-                    item.setBackground(QBrush(QColor("#FFE0B2")))  # Cam nhạt
-            
-            elif col == 2:  # Improvement
-                if improvement > 10:
-                    item.setBackground(QBrush(QColor("#A5D6A7")))  # Xanh đậm
-                elif improvement > 0:
-                    item.setBackground(QBrush(QColor("#C8E6C9")))  # Xanh nhạt
-                else:
-                    item.setBackground(QBrush(QColor("#FFCCBC")))  # Cam đậm
-            
-            elif col == 7:  # Status
-                if improvement > 0:
-                    item.setForeground(QColor("#00AA00"))  # Xanh
-                else:
-                    item.setForeground(QColor("#FF9800"))  # Cam
-            
-            self.data_table.setItem(row_position, col, item)
+        # Color coding
+        backgrounds = {
+            # Cost: gần với best -> xanh nhạt, ngược lại cam nhạt
+            1: "#C8E6C9" if cost < self.best_cost * 1.1 else "#FFE0B2",
+            # Improvement: xanh đậm / xanh nhạt / cam đậm
+            2: "#A5D6A7" if improvement > 10 else ("#C8E6C9" if improvement > 0 else "#FFCCBC"),
+        }
+        # Status: xanh nếu có cải thiện, ngược lại cam
+        foregrounds = {7: "#00AA00" if improvement > 0 else "#FF9800"}
         
-        # Scroll to bottom
+        # OPTIMIZATION: Giới hạn bảng ở MAX_TABLE_ROWS dòng (ring buffer) - lần chạy
+        # dài không làm bảng phình vô hạn, giữ chi phí layout/bộ nhớ cố định
+        self._table_model.append_row(row_data, backgrounds, foregrounds)
+        
+        # Scroll to bottom (gộp qua timer, không cuộn ngay mỗi dòng)
+        if not self._scroll_timer.isActive():
+            self._scroll_timer.start()
+    
+    def _scroll_table_to_bottom(self):
+        """Cuộn bảng chi tiết xuống dòng mới nhất."""
         self.data_table.scrollToBottom()
     
     def _update_statistics(self):
@@ -401,16 +757,27 @@ class ChartWidget(QWidget):
                     f"[IMPROVED] Improvement: {improvement:.2f}% "
                     f"({self.initial_cost:.2f} -> {self.best_cost:.2f})"
                 )
-                self.improvement_label.setStyleSheet("color: green; font-weight: bold;")
+                self._set_improvement_style("color: green; font-weight: bold;")
             else:
                 self.improvement_label.setText(
                     f"[SEARCHING] Finding better solution... "
                     f"(Best: {self.best_cost:.2f})"
                 )
-                self.improvement_label.setStyleSheet("color: orange;")
+                self._set_improvement_style("color: orange;")
         else:
             self.improvement_label.setText("[LOADING] Processing data...")
-            self.improvement_label.setStyleSheet("color: #999;")
+            self._set_improvement_style("color: #999;")
+    
+    def _set_improvement_style(self, style: str) -> None:
+        """
+        Đổi stylesheet của improvement_label chỉ khi khác style hiện tại.
+        
+        OPTIMIZATION: _update_statistics chạy mỗi step; setStyleSheet luôn
+        parse lại CSS và repolish widget dù chuỗi không đổi.
+        """
+        if style != self._improvement_style:
+            self._improvement_style = style
+            self.improvement_label.setStyleSheet(style)
     
     def update_batch(self, data: List[Dict[str, Any]]):
         """
@@ -419,6 +786,7 @@ class ChartWidget(QWidget):
         Args:
             data: Danh sách dict chứa {iteration, cost, temperature, inertia, ...}
         """
+        appended = False
         for point in data:
             # Extract values with defaults
             iteration = point.get('iteration', 0)
@@ -428,8 +796,12 @@ class ChartWidget(QWidget):
             acceptance_rate = point.get('acceptance_rate', 0.0)
             updates = point.get('updates', 0)
             
-            # Call update_plot with positional args
-            self.update_plot(iteration, cost, temperature, inertia, acceptance_rate, updates)
+            if self._append_point(iteration, cost, temperature, inertia, acceptance_rate, updates):
+                appended = True
+        
+        # Label thống kê chỉ cập nhật 1 lần cho cả lô
+        if appended:
+            self._update_statistics()
     
     def update_final(self, final_iteration: int, final_cost: float, 
                     convergence_history: Optional[List[float]] = None,
@@ -466,16 +838,19 @@ class ChartWidget(QWidget):
         self.current_iteration = 0
         
         # Clear table
-        self.data_table.setRowCount(0)
+        self._table_model.clear()
         
         # Clear chart
+        self._redraw_timer.stop()
         self.fig.clear()
+        self._live_panels = None
+        self._comparison_data = None
         self.canvas.draw()
         
         # Reset labels
         self.stats_label.setText("Chờ dữ liệu...")
         self.improvement_label.setText("[INFO] Chờ dữ liệu từ thuật toán...")
-        self.improvement_label.setStyleSheet("color: #999;")
+        self._set_improvement_style("color: #999;")
     
     def get_data(self):
         """Lấy dữ liệu hiện tại."""
@@ -489,8 +864,26 @@ class ChartWidget(QWidget):
         }
     
     def export_image(self, filepath: str):
-        """Xuất biểu đồ ra file ảnh."""
-        self.fig.savefig(filepath, dpi=300, bbox_inches='tight')
+        """
+        Xuất biểu đồ ra file ảnh (không block GUI).
+        
+        OPTIMIZATION: Render lại trên Figure Agg offscreen ở thread nền (QThreadPool)
+        từ snapshot dữ liệu hiện tại, thay vì savefig dpi=300 trên GUI thread.
+        Kết quả được báo qua signal image_exported / image_export_failed.
+        
+        Args:
+            filepath: Đường dẫn file ảnh cần lưu.
+        """
+        if self._comparison_data is not None:
+            sa_history, pso_history = self._comparison_data
+            draw_func, draw_args = _draw_comparison, (list(sa_history), list(pso_history))
+        else:
+            draw_func, draw_args = _draw_algorithm_panels, (self.get_data(),)
+        
+        task = _ImageExportTask(filepath, draw_func, draw_args, self.fig.get_facecolor())
+        task.signals.finished.connect(self.image_exported)
+        task.signals.failed.connect(self.image_export_failed)
+        QThreadPool.globalInstance().start(task)
     
     def plot_comparison(self, sa_history: List[float], pso_history: List[float]):
         """
@@ -500,28 +893,11 @@ class ChartWidget(QWidget):
             sa_history: Lịch sử chi phí của SA
             pso_history: Lịch sử chi phí của PSO
         """
+        self._redraw_timer.stop()  # Tránh redraw đang chờ ghi đè biểu đồ so sánh
         self.fig.clear()
-        
-        ax = self.fig.add_subplot(1, 1, 1)
-        
-        # SA curve
-        sa_x = list(range(1, len(sa_history) + 1))
-        ax.plot(sa_x, sa_history, color='#FF6600', linewidth=2, marker='o', 
-               markersize=3, label='SA Algorithm')
-        
-        # PSO curve
-        pso_x = list(range(1, len(pso_history) + 1))
-        ax.plot(pso_x, pso_history, color='#0099FF', linewidth=2, marker='s',
-               markersize=3, label='PSO Algorithm')
-        
-        ax.set_xlabel('Iteration', fontsize=11, fontweight='bold')
-        ax.set_ylabel('Cost', fontsize=11, fontweight='bold')
-        ax.set_title('Comparison: SA vs PSO', fontsize=12, fontweight='bold', color='#0066FF')
-        ax.grid(True, alpha=0.3)
-        ax.set_facecolor('#F5F5F5')
-        ax.legend(loc='upper right')
-        
-        self.fig.tight_layout()
+        self._live_panels = None
+        _draw_comparison(self.fig, sa_history, pso_history)
+        self._comparison_data = (sa_history, pso_history)
         self.canvas.draw()
     
     def set_data(self, iterations: List[int], costs: List[float]):
@@ -533,8 +909,12 @@ class ChartWidget(QWidget):
             costs: Danh sách costs
         """
         self.clear()
+        appended = False
         for iteration, cost in zip(iterations, costs):
-            self.update_plot(iteration, cost)
+            if self._append_point(iteration, cost, 0.0, 0.0, 0.0, 0):
+                appended = True
+        if appended:
+            self._update_statistics()
     
     def set_theme(self, theme: str = 'light'):
         """
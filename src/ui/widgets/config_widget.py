@@ -13,7 +13,7 @@ from qfluentwidgets import (
     StrongBodyLabel, BodyLabel, PushButton, PrimaryPushButton,
     InfoBar, InfoBarPosition
 )
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 class ConfigWidget(CardWidget):
@@ -32,7 +32,9 @@ class ConfigWidget(CardWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._config_cache: Optional[Dict[str, Any]] = None
         self._init_ui()
+        self._connect_cache_invalidation()
         self._reset_defaults()
 
     def _init_ui(self):
@@ -238,6 +240,25 @@ class ConfigWidget(CardWidget):
         scroll.setWidget(container)
         main_layout.addWidget(scroll)
 
+    def _connect_cache_invalidation(self):
+        """
+        OPTIMIZATION: get_config() được memoize; mọi thay đổi giá trị trên form
+        sẽ xóa cache để lần gọi sau đọc lại từ widget.
+        """
+        self.start_date.dateChanged.connect(self._invalidate_config_cache)
+        self.end_date.dateChanged.connect(self._invalidate_config_cache)
+        self.algo_combo.currentIndexChanged.connect(self._invalidate_config_cache)
+        for spin in (
+            self.max_exams_per_week, self.max_exams_per_day,
+            self.sa_temp, self.sa_cooling, self.sa_iter,
+            self.pso_swarm, self.pso_iter, self.pso_w, self.pso_c1, self.pso_c2,
+        ):
+            spin.valueChanged.connect(self._invalidate_config_cache)
+    
+    def _invalidate_config_cache(self, *_):
+        """Xóa cache của get_config()."""
+        self._config_cache = None
+
     def _on_algo_changed(self, index):
         """Chuyển đổi giao diện tham số khi đổi thuật toán."""
         self.param_stack.setCurrentIndex(index)
@@ -282,7 +303,20 @@ class ConfigWidget(CardWidget):
         self._on_date_changed()
 
     def get_config(self) -> Dict[str, Any]:
-        """Lấy config dựa trên thuật toán đang chọn + cấu hình lịch."""
+        """
+        Lấy config dựa trên thuật toán đang chọn + cấu hình lịch.
+        
+        Kết quả được cache tới khi có giá trị trên form thay đổi. Trả về bản
+        sao để caller có thể sửa (vd: benchmark thêm 'seed') mà không ảnh hưởng cache.
+        """
+        if self._config_cache is None:
+            self._config_cache = self._build_config()
+        config = dict(self._config_cache)
+        config['schedule_config'] = dict(self._config_cache['schedule_config'])
+        return config
+    
+    def _build_config(self) -> Dict[str, Any]:
+        """Đọc config từ các widget trên form."""
         algo_idx = self.algo_combo.currentIndex()
         algo_type = 'sa' if algo_idx == 0 else 'pso'
         
@@ -330,12 +364,8 @@ class ConfigWidget(CardWidget):
                 - max_exams_per_week: Tối đa môn/tuần/giám thị
                 - max_exams_per_day: Tối đa môn/ngày/giám thị
         """
-        return {
-            'start_date': self.start_date.date().toString('yyyy-MM-dd'),
-            'end_date': self.end_date.date().toString('yyyy-MM-dd'),
-            'max_exams_per_week': int(self.max_exams_per_week.value()),
-            'max_exams_per_day': int(self.max_exams_per_day.value()),
-        }
+        # Đọc từ config đã cache (được làm mới khi form thay đổi), không truy vấn lại widget
+        return self.get_config()['schedule_config']
     
     def get_proctor_constraints(self) -> Dict[str, int]:
         """
@@ -346,7 +376,8 @@ class ConfigWidget(CardWidget):
                 - max_exams_per_week: Tối đa môn/tuần
                 - max_exams_per_day: Tối đa môn/ngày
         """
+        schedule_config = self.get_config()['schedule_config']
         return {
-            'max_exams_per_week': int(self.max_exams_per_week.value()),
-            'max_exams_per_day': int(self.max_exams_per_day.value()),
+            'max_exams_per_week': schedule_config['max_exams_per_week'],
+            'max_exams_per_day': schedule_config['max_exams_per_day'],
         }
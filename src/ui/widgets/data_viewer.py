@@ -9,8 +9,78 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor, QFont, QBrush
 from qfluentwidgets import InfoBar, InfoBarPosition
-from typing import List, Dict, Any, Optional
-import pandas as pd
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from contextlib import contextmanager
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Stylesheet dùng chung cho cả 3 bảng (chuỗi hằng, không dựng lại mỗi lần)
+_TABLE_STYLESHEET = """
+QTableWidget {
+    gridline-color: #E0E0E0;
+    background-color: #FFFFFF;
+}
+QHeaderView::section {
+    background-color: #1976D2;
+    color: white;
+    padding: 5px;
+    border: 1px solid #1565C0;
+    font-weight: bold;
+    font-size: 10pt;
+}
+QTableWidget::item {
+    padding: 5px;
+    border-bottom: 1px solid #EEEEEE;
+}
+QTableWidget::item:selected {
+    background-color: #BBDEFB;
+    color: #000;
+}
+"""
+
+
+# Brush dùng chung theo mã màu (tạo lần đầu khi cần, sau đó tái sử dụng)
+_BRUSHES: Dict[str, QBrush] = {}
+
+
+def _brush(color: str) -> QBrush:
+    """
+    Lấy QBrush dùng chung cho một mã màu.
+    
+    OPTIMIZATION: Các bảng chỉ dùng vài màu cố định; mỗi màu chỉ tạo
+    QColor/QBrush một lần thay vì một lần cho mỗi ô được tô.
+    """
+    brush = _BRUSHES.get(color)
+    if brush is None:
+        brush = _BRUSHES[color] = QBrush(QColor(color))
+    return brush
+
+
+@contextmanager
+def _bulk_update(table: QTableWidget):
+    """
+    Tạm tắt repaint và signals của bảng trong lúc đổ dữ liệu hàng loạt.
+    
+    OPTIMIZATION: Mỗi setItem phát itemChanged + relayout/repaint viewport; với
+    bảng lớn đó là O(rows * cols) sự kiện Qt trên GUI thread. Gom lại thành
+    một lần repaint duy nhất khi kết thúc.
+    
+    Sorting cũng được tắt trong lúc đổ dữ liệu: khi bật, mỗi setItem kích hoạt
+    sắp xếp lại cả bảng (và dòng vừa ghi có thể bị dời đi giữa chừng). Bảng chỉ
+    được sắp xếp 1 lần khi bật lại ở cuối.
+    """
+    sorting_enabled = table.isSortingEnabled()
+    table.setSortingEnabled(False)
+    table.setUpdatesEnabled(False)
+    table.blockSignals(True)
+    try:
+        yield table
+    finally:
+        table.blockSignals(False)
+        table.setSortingEnabled(sorting_enabled)
+        table.setUpdatesEnabled(True)
+        table.viewport().update()
 
 
 class DataViewerWidget(QWidget):
@@ -32,9 +102,9 @@ class DataViewerWidget(QWidget):
         self.setObjectName("DataViewerWidget")
         
         # Data storage
-        self.subjects_df: Optional[pd.DataFrame] = None
-        self.rooms_df: Optional[pd.DataFrame] = None
-        self.proctors_df: Optional[pd.DataFrame] = None
+        self.subjects_df: Optional['pd.DataFrame'] = None
+        self.rooms_df: Optional['pd.DataFrame'] = None
+        self.proctors_df: Optional['pd.DataFrame'] = None
         
         # Setup UI
         self._init_ui()
@@ -109,28 +179,7 @@ class DataViewerWidget(QWidget):
     
     def _setup_table(self, table: QTableWidget):
         """Setup table style."""
-        table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #E0E0E0;
-                background-color: #FFFFFF;
-            }
-            QHeaderView::section {
-                background-color: #1976D2;
-                color: white;
-                padding: 5px;
-                border: 1px solid #1565C0;
-                font-weight: bold;
-                font-size: 10pt;
-            }
-            QTableWidget::item {
-                padding: 5px;
-                border-bottom: 1px solid #EEEEEE;
-            }
-            QTableWidget::item:selected {
-                background-color: #BBDEFB;
-                color: #000;
-            }
-        """)
+        table.setStyleSheet(_TABLE_STYLESHEET)
         
         # Enable sorting
         table.setSortingEnabled(True)
@@ -157,7 +206,7 @@ class DataViewerWidget(QWidget):
             self.subjects_table.setRowCount(1)
             self.subjects_table.setColumnCount(1)
             item = QTableWidgetItem("Không có dữ liệu môn học")
-            item.setForeground(QColor("#999"))
+            item.setForeground(_brush("#999"))
             self.subjects_table.setItem(0, 0, item)
             return
         
@@ -172,54 +221,58 @@ class DataViewerWidget(QWidget):
         # Set rows
         self.subjects_table.setRowCount(len(courses))
         
-        for row, course in enumerate(courses):
-            # Mã LHP
-            item = QTableWidgetItem(str(course.course_id))
-            item.setTextAlignment(Qt.AlignCenter)
-            self.subjects_table.setItem(row, 0, item)
+        # Một brush dùng chung cho mọi ô nền xen kẽ (không tạo QBrush/QColor mỗi ô)
+        alt_row_brush = _brush("#F5F5F5")
+        
+        with _bulk_update(self.subjects_table):
+            for row, course in enumerate(courses):
+                # Mã LHP
+                item = QTableWidgetItem(str(course.course_id))
+                item.setTextAlignment(Qt.AlignCenter)
+                self.subjects_table.setItem(row, 0, item)
             
-            # Tên HP
-            item = QTableWidgetItem(str(course.name))
-            self.subjects_table.setItem(row, 1, item)
+                # Tên HP
+                item = QTableWidgetItem(str(course.name))
+                self.subjects_table.setItem(row, 1, item)
             
-            # SL ĐK
-            item = QTableWidgetItem(str(course.student_count))
-            item.setTextAlignment(Qt.AlignCenter)
-            self.subjects_table.setItem(row, 2, item)
+                # SL ĐK
+                item = QTableWidgetItem(str(course.student_count))
+                item.setTextAlignment(Qt.AlignCenter)
+                self.subjects_table.setItem(row, 2, item)
             
-            # Địa điểm
-            item = QTableWidgetItem(str(course.location if hasattr(course, 'location') else 'N/A'))
-            self.subjects_table.setItem(row, 3, item)
+                # Địa điểm
+                item = QTableWidgetItem(str(course.location if hasattr(course, 'location') else 'N/A'))
+                self.subjects_table.setItem(row, 3, item)
             
-            # Hình thức
-            item = QTableWidgetItem(str(course.exam_format if hasattr(course, 'exam_format') else 'N/A'))
-            self.subjects_table.setItem(row, 4, item)
+                # Hình thức
+                item = QTableWidgetItem(str(course.exam_format if hasattr(course, 'exam_format') else 'N/A'))
+                self.subjects_table.setItem(row, 4, item)
             
-            # Thời lượng
-            duration = getattr(course, 'duration', 120)
-            item = QTableWidgetItem(str(duration))
-            item.setTextAlignment(Qt.AlignCenter)
-            self.subjects_table.setItem(row, 5, item)
+                # Thời lượng
+                duration = getattr(course, 'duration', 120)
+                item = QTableWidgetItem(str(duration))
+                item.setTextAlignment(Qt.AlignCenter)
+                self.subjects_table.setItem(row, 5, item)
             
-            # Cố định
-            is_locked = getattr(course, 'is_locked', False)
-            locked_text = "✅" if is_locked else "❌"
-            item = QTableWidgetItem(locked_text)
-            item.setTextAlignment(Qt.AlignCenter)
-            if is_locked:
-                item.setForeground(QColor("#00AA00"))
-            self.subjects_table.setItem(row, 6, item)
+                # Cố định
+                is_locked = getattr(course, 'is_locked', False)
+                locked_text = "✅" if is_locked else "❌"
+                item = QTableWidgetItem(locked_text)
+                item.setTextAlignment(Qt.AlignCenter)
+                if is_locked:
+                    item.setForeground(_brush("#00AA00"))
+                self.subjects_table.setItem(row, 6, item)
             
-            # Ghi chú
-            item = QTableWidgetItem(str(course.note if hasattr(course, 'note') else ''))
-            self.subjects_table.setItem(row, 7, item)
+                # Ghi chú
+                item = QTableWidgetItem(str(course.note if hasattr(course, 'note') else ''))
+                self.subjects_table.setItem(row, 7, item)
             
-            # Color alternate rows
-            if row % 2 == 0:
-                for col in range(len(columns)):
-                    self.subjects_table.item(row, col).setBackground(QBrush(QColor("#F5F5F5")))
+                # Color alternate rows
+                if row % 2 == 0:
+                    for col in range(len(columns)):
+                        self.subjects_table.item(row, col).setBackground(alt_row_brush)
         
-        # Auto-resize columns
+            # Auto-resize columns
         self.subjects_table.resizeColumnsToContents()
     
     def set_rooms_data(self, rooms: List[Any]):
@@ -236,7 +289,7 @@ class DataViewerWidget(QWidget):
             self.rooms_table.setRowCount(1)
             self.rooms_table.setColumnCount(1)
             item = QTableWidgetItem("Không có dữ liệu phòng thi")
-            item.setForeground(QColor("#999"))
+            item.setForeground(_brush("#999"))
             self.rooms_table.setItem(0, 0, item)
             return
         
@@ -248,40 +301,44 @@ class DataViewerWidget(QWidget):
         # Set rows
         self.rooms_table.setRowCount(len(rooms))
         
-        for row, room in enumerate(rooms):
-            # Tên Phòng (room_id)
-            item = QTableWidgetItem(room.room_id)
-            self.rooms_table.setItem(row, 0, item)
+        # Một brush dùng chung cho mọi ô nền xen kẽ (không tạo QBrush/QColor mỗi ô)
+        alt_row_brush = _brush("#F5F5F5")
+        
+        with _bulk_update(self.rooms_table):
+            for row, room in enumerate(rooms):
+                # Tên Phòng (room_id)
+                item = QTableWidgetItem(room.room_id)
+                self.rooms_table.setItem(row, 0, item)
             
-            # Sức Chứa
-            item = QTableWidgetItem(str(room.capacity))
-            item.setTextAlignment(Qt.AlignCenter)
-            self.rooms_table.setItem(row, 1, item)
+                # Sức Chứa
+                item = QTableWidgetItem(str(room.capacity))
+                item.setTextAlignment(Qt.AlignCenter)
+                self.rooms_table.setItem(row, 1, item)
             
-            # Địa Điểm
-            item = QTableWidgetItem(room.location)
-            self.rooms_table.setItem(row, 2, item)
+                # Địa Điểm
+                item = QTableWidgetItem(room.location)
+                self.rooms_table.setItem(row, 2, item)
             
-            # Dung Lượng Hiện Tại (tính toán)
-            current_capacity = getattr(room, 'current_capacity', 0)
-            capacity_percent = (current_capacity / room.capacity * 100) if room.capacity > 0 else 0
-            item = QTableWidgetItem(f"{current_capacity}/{room.capacity} ({capacity_percent:.0f}%)")
-            item.setTextAlignment(Qt.AlignCenter)
+                # Dung Lượng Hiện Tại (tính toán)
+                current_capacity = getattr(room, 'current_capacity', 0)
+                capacity_percent = (current_capacity / room.capacity * 100) if room.capacity > 0 else 0
+                item = QTableWidgetItem(f"{current_capacity}/{room.capacity} ({capacity_percent:.0f}%)")
+                item.setTextAlignment(Qt.AlignCenter)
             
-            # Color based on utilization
-            if capacity_percent >= 80:
-                item.setForeground(QColor("#D32F2F"))  # Red
-            elif capacity_percent >= 50:
-                item.setForeground(QColor("#F57C00"))  # Orange
-            else:
-                item.setForeground(QColor("#00AA00"))  # Green
+                # Color based on utilization
+                if capacity_percent >= 80:
+                    item.setForeground(_brush("#D32F2F"))  # Red
+                elif capacity_percent >= 50:
+                    item.setForeground(_brush("#F57C00"))  # Orange
+                else:
+                    item.setForeground(_brush("#00AA00"))  # Green
             
-            self.rooms_table.setItem(row, 3, item)
+                self.rooms_table.setItem(row, 3, item)
             
-            # Color alternate rows
-            if row % 2 == 0:
-                for col in range(len(columns)):
-                    self.rooms_table.item(row, col).setBackground(QBrush(QColor("#F5F5F5")))
+                # Color alternate rows
+                if row % 2 == 0:
+                    for col in range(len(columns)):
+                        self.rooms_table.item(row, col).setBackground(alt_row_brush)
         
         self.rooms_table.resizeColumnsToContents()
     
@@ -299,7 +356,7 @@ class DataViewerWidget(QWidget):
             self.proctors_table.setRowCount(1)
             self.proctors_table.setColumnCount(1)
             item = QTableWidgetItem("Không có dữ liệu giám thị")
-            item.setForeground(QColor("#999"))
+            item.setForeground(_brush("#999"))
             self.proctors_table.setItem(0, 0, item)
             return
         
@@ -311,39 +368,43 @@ class DataViewerWidget(QWidget):
         # Set rows
         self.proctors_table.setRowCount(len(proctors))
         
-        for row, proctor in enumerate(proctors):
-            # Mã GT
-            item = QTableWidgetItem(str(getattr(proctor, 'proctor_id', 'N/A')))
-            item.setTextAlignment(Qt.AlignCenter)
-            self.proctors_table.setItem(row, 0, item)
+        # Một brush dùng chung cho mọi ô nền xen kẽ (không tạo QBrush/QColor mỗi ô)
+        alt_row_brush = _brush("#F5F5F5")
+        
+        with _bulk_update(self.proctors_table):
+            for row, proctor in enumerate(proctors):
+                # Mã GT
+                item = QTableWidgetItem(str(getattr(proctor, 'proctor_id', 'N/A')))
+                item.setTextAlignment(Qt.AlignCenter)
+                self.proctors_table.setItem(row, 0, item)
             
-            # Họ Tên
-            item = QTableWidgetItem(proctor.name)
-            self.proctors_table.setItem(row, 1, item)
+                # Họ Tên
+                item = QTableWidgetItem(proctor.name)
+                self.proctors_table.setItem(row, 1, item)
             
-            # Cơ Sở
-            item = QTableWidgetItem(getattr(proctor, 'location', 'N/A'))
-            self.proctors_table.setItem(row, 2, item)
+                # Cơ Sở
+                item = QTableWidgetItem(getattr(proctor, 'location', 'N/A'))
+                self.proctors_table.setItem(row, 2, item)
             
-            # Số Môn Đảm Nhận
-            assigned_count = len(getattr(proctor, 'assigned_courses', []))
-            item = QTableWidgetItem(str(assigned_count))
-            item.setTextAlignment(Qt.AlignCenter)
+                # Số Môn Đảm Nhận
+                assigned_count = len(getattr(proctor, 'assigned_courses', []))
+                item = QTableWidgetItem(str(assigned_count))
+                item.setTextAlignment(Qt.AlignCenter)
             
-            # Color based on workload
-            if assigned_count >= 5:
-                item.setForeground(QColor("#D32F2F"))  # Red (overloaded)
-            elif assigned_count >= 3:
-                item.setForeground(QColor("#F57C00"))  # Orange (moderate)
-            else:
-                item.setForeground(QColor("#00AA00"))  # Green (light)
+                # Color based on workload
+                if assigned_count >= 5:
+                    item.setForeground(_brush("#D32F2F"))  # Red (overloaded)
+                elif assigned_count >= 3:
+                    item.setForeground(_brush("#F57C00"))  # Orange (moderate)
+                else:
+                    item.setForeground(_brush("#00AA00"))  # Green (light)
             
-            self.proctors_table.setItem(row, 3, item)
+                self.proctors_table.setItem(row, 3, item)
             
-            # Color alternate rows
-            if row % 2 == 0:
-                for col in range(len(columns)):
-                    self.proctors_table.item(row, col).setBackground(QBrush(QColor("#F5F5F5")))
+                # Color alternate rows
+                if row % 2 == 0:
+                    for col in range(len(columns)):
+                        self.proctors_table.item(row, col).setBackground(alt_row_brush)
         
         self.proctors_table.resizeColumnsToContents()
     
@@ -385,6 +446,7 @@ class DataViewerWidget(QWidget):
         if file_path:
             try:
                 if file_path.endswith('.xlsx'):
+                    import pandas as pd  # Import lười - chỉ cần khi xuất Excel
                     with pd.ExcelWriter(file_path) as writer:
                         if self.subjects_df is not None:
                             self.subjects_df.to_excel(writer, sheet_name='Subjects', index=False)
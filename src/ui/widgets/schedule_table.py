@@ -4,12 +4,13 @@ Widget hiển thị bảng kết quả xếp lịch thi với lựa chọn giữ
 """
 
 from PyQt5.QtWidgets import (
-    QHeaderView, QTableWidgetItem, QWidget, QVBoxLayout, QHBoxLayout, 
+    QHeaderView, QWidget, QVBoxLayout, QHBoxLayout, 
     QRadioButton, QButtonGroup, QLabel
 )
 from PyQt5.QtGui import QColor, QBrush
-from PyQt5.QtCore import Qt
-from qfluentwidgets import TableWidget
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from qfluentwidgets import TableView
+from typing import Dict, List, Optional, Tuple
 
 import sys
 from pathlib import Path
@@ -25,6 +26,120 @@ from src.models.room import Room
 from src.ui.widgets.calendar_view import CalendarView
 
 
+class _ScheduleTableModel(QAbstractTableModel):
+    """
+    Model cho bảng chi tiết kết quả xếp lịch (mỗi dòng = 1 môn/ca thi).
+    
+    OPTIMIZATION: Thay vì dựng trước 10 QTableWidgetItem cho mỗi môn, chuỗi
+    hiển thị và màu của một dòng chỉ được tính khi view cần đọc dòng đó
+    (lần đầu hiển thị), sau đó cache lại. Nạp lịch mới chỉ là 1 lần reset model.
+    """
+    
+    HEADERS = (
+        "Mã LHP", "Tên HP", "Ngày thi", "Giờ thi", 
+        "Phòng thi", "Giám thị", "Địa điểm", "Hình thức thi", 
+        "Sĩ số/Sức chứa", "Ghi chú"
+    )
+    # Cột "Tên HP" và "Ghi chú" căn trái, còn lại căn giữa
+    LEFT_ALIGNED_COLUMNS = (1, 9)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._courses: List = []
+        self._rooms_dict: dict = {}
+        self._proctors_dict: dict = {}
+        # Cache (texts, brush màu chữ) theo dòng - None = chưa tính
+        self._row_cache: List[Optional[Tuple[Tuple[str, ...], Optional[QBrush]]]] = []
+        self._norm_locations: Dict[str, str] = {}
+        self._error_brush = QBrush(QColor("#FF4D4F"))
+        self._warning_brush = QBrush(QColor("#FAAD14"))
+    
+    def set_schedule(self, courses: List, rooms_dict: dict, proctors_dict: dict) -> None:
+        """Thay toàn bộ dữ liệu (courses đã được sắp xếp theo thứ tự hiển thị)."""
+        self.beginResetModel()
+        self._courses = courses
+        self._rooms_dict = rooms_dict
+        self._proctors_dict = proctors_dict
+        self._row_cache = [None] * len(courses)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._courses)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._row(index.row())[0][index.column()]
+        if role == Qt.ForegroundRole:
+            return self._row(index.row())[1]
+        if role == Qt.TextAlignmentRole:
+            if index.column() in self.LEFT_ALIGNED_COLUMNS:
+                return int(Qt.AlignLeft | Qt.AlignVCenter)
+            return int(Qt.AlignCenter | Qt.AlignVCenter)
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def _norm_location(self, location: str) -> str:
+        # Địa điểm chỉ có vài giá trị lặp lại - chuẩn hóa (strip + lower) mỗi chuỗi 1 lần
+        norm = self._norm_locations.get(location)
+        if norm is None:
+            norm = self._norm_locations[location] = location.strip().lower()
+        return norm
+    
+    def _row(self, row: int) -> Tuple[Tuple[str, ...], Optional[QBrush]]:
+        """Chuỗi hiển thị + màu chữ của một dòng (tính lần đầu, sau đó lấy từ cache)."""
+        cached = self._row_cache[row]
+        if cached is not None:
+            return cached
+        
+        course = self._courses[row]
+        assigned_room_obj = self._rooms_dict.get(course.assigned_room)
+        
+        capacity_str = "?"
+        room_capacity_val = 0
+        if assigned_room_obj:
+            capacity_str = str(assigned_room_obj.capacity)
+            room_capacity_val = assigned_room_obj.capacity
+        
+        student_info = f"{course.student_count}/{capacity_str}"
+        
+        # Lấy tên giám thị (hoặc ID nếu không tìm thấy)
+        proctor_name = "---"
+        if course.assigned_proctor_id:
+            proctor_obj = self._proctors_dict.get(course.assigned_proctor_id)
+            if proctor_obj:
+                proctor_name = proctor_obj.name
+            else:
+                proctor_name = course.assigned_proctor_id  # Fallback: hiển thị ID
+        
+        row_data = (
+            course.course_id, course.name,
+            course.assigned_date or "---", course.assigned_time or "---",
+            course.assigned_room or "---", proctor_name,
+            course.location, course.exam_format, student_info, course.note
+        )
+        
+        # Logic Highlight: vượt sức chứa (đỏ) ưu tiên hơn sai địa điểm (vàng)
+        row_brush = None
+        if course.assigned_room and assigned_room_obj:
+            if course.student_count > room_capacity_val:
+                row_brush = self._error_brush
+            elif self._norm_location(course.location) != self._norm_location(assigned_room_obj.location):
+                row_brush = self._warning_brush
+        
+        cached = (tuple(str(value) for value in row_data), row_brush)
+        self._row_cache[row] = cached
+        return cached
+
+
 class ScheduleResultTable(QWidget):
     """
     Widget kết hợp: Bảng kết quả xếp lịch + Thời khóa biểu dạng lưới.
@@ -36,9 +151,13 @@ class ScheduleResultTable(QWidget):
         self.schedule = None
         self.rooms_dict = {}
         self.proctors_dict = {}
+        # Lưới chưa được dựng lại theo dữ liệu mới nhất (đang ẩn)
+        self._calendar_stale = False
         
         # Tạo 2 view
-        self.table_widget = TableWidget()
+        self.table_model = _ScheduleTableModel(self)
+        self.table_widget = TableView()
+        self.table_widget.setModel(self.table_model)
         self.calendar_view = CalendarView()
         
         # Setup UI
@@ -89,15 +208,7 @@ class ScheduleResultTable(QWidget):
     
     def _configure_table(self) -> None:
         """Cấu hình bảng."""
-        # Định nghĩa cột
-        headers = [
-            "Mã LHP", "Tên HP", "Ngày thi", "Giờ thi", 
-            "Phòng thi", "Giám thị", "Địa điểm", "Hình thức thi", 
-            "Sĩ số/Sức chứa", "Ghi chú"
-        ]
-        
-        self.table_widget.setColumnCount(len(headers))
-        self.table_widget.setHorizontalHeaderLabels(headers)
+        # Các cột được định nghĩa trong _ScheduleTableModel.HEADERS
         
         # Cấu hình độ rộng cột
         header = self.table_widget.horizontalHeader()
@@ -105,11 +216,7 @@ class ScheduleResultTable(QWidget):
         header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
-        
-        # Màu sắc highlight
-        self.COLOR_ERROR = QColor("#FF4D4F")
-        self.COLOR_WARNING = QColor("#FAAD14")
-        self.COLOR_DEFAULT = None
+
     
     def _switch_to_table(self) -> None:
         """Chuyển sang chế độ xem bảng."""
@@ -118,6 +225,8 @@ class ScheduleResultTable(QWidget):
     
     def _switch_to_calendar(self) -> None:
         """Chuyển sang chế độ xem lưới."""
+        if self._calendar_stale:
+            self._refresh_calendar()
         self.table_widget.hide()
         self.calendar_view.show()
 
@@ -138,79 +247,28 @@ class ScheduleResultTable(QWidget):
         self._update_table_data()
         
         # Cập nhật lưới
+        # OPTIMIZATION: Lưới đang ẩn (chế độ bảng - mặc định) thì chỉ đánh dấu
+        # cũ, dựng lại khi người dùng chuyển sang xem lưới
         if rooms_dict:
-            rooms_list = list(rooms_dict.values())
-            self.calendar_view.update_data(schedule, rooms_list, proctors_dict)
+            if self.calendar_radio.isChecked():
+                self._refresh_calendar()
+            else:
+                self._calendar_stale = True
+
+    def _refresh_calendar(self) -> None:
+        """Dựng lại lưới theo dữ liệu hiện tại."""
+        self._calendar_stale = False
+        rooms_list = list(self.rooms_dict.values())
+        self.calendar_view.update_data(self.schedule, rooms_list, self.proctors_dict)
 
     def _update_table_data(self) -> None:
         """Cập nhật dữ liệu trong bảng chi tiết."""
-        self.table_widget.setRowCount(0)
-        
         if not self.schedule or not self.schedule.courses:
+            self.table_model.set_schedule([], {}, {})
             return
 
-        self.table_widget.setUpdatesEnabled(False)
-
         sorted_courses = sorted(
             self.schedule.courses, 
             key=lambda x: (str(x.assigned_date), str(x.assigned_time), str(x.assigned_room))
         )
-
-        for row_idx, course in enumerate(sorted_courses):
-            self.table_widget.insertRow(row_idx)
-            
-            assigned_room_obj = self.rooms_dict.get(course.assigned_room)
-            
-            capacity_str = "?"
-            room_capacity_val = 0
-            if assigned_room_obj:
-                capacity_str = str(assigned_room_obj.capacity)
-                room_capacity_val = assigned_room_obj.capacity
-            
-            student_info = f"{course.student_count}/{capacity_str}"
-            
-            # Lấy tên giám thị (hoặc ID nếu không tìm thấy)
-            proctor_name = "---"
-            if course.assigned_proctor_id:
-                proctor_obj = self.proctors_dict.get(course.assigned_proctor_id)
-                if proctor_obj:
-                    proctor_name = proctor_obj.name
-                else:
-                    proctor_name = course.assigned_proctor_id  # Fallback: hiển thị ID
-            
-            row_data = [
-                course.course_id, course.name,
-                course.assigned_date or "---", course.assigned_time or "---",
-                course.assigned_room or "---", proctor_name,
-                course.location, course.exam_format, student_info, course.note
-            ]
-
-            row_text_color = self.COLOR_DEFAULT
-            is_error = False
-            
-            # Logic Highlight
-            if course.assigned_room and assigned_room_obj:
-                if course.student_count > room_capacity_val:
-                    row_text_color = self.COLOR_ERROR
-                    is_error = True
-            
-            if course.assigned_room and assigned_room_obj and not is_error:
-                req_loc = course.location.strip().lower()
-                act_loc = assigned_room_obj.location.strip().lower()
-                if req_loc != act_loc:
-                    row_text_color = self.COLOR_WARNING
-
-            for col_idx, value in enumerate(row_data):
-                item = QTableWidgetItem(str(value)) 
-                
-                if row_text_color:
-                    item.setForeground(QBrush(row_text_color))
-                
-                if col_idx in [1, 9]:  # Cột "Tên HP" và "Ghi chú" căn trái
-                    item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                else:
-                    item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
-                
-                self.table_widget.setItem(row_idx, col_idx, item)
-
-        self.table_widget.setUpdatesEnabled(True)
+        self.table_model.set_schedule(sorted_courses, self.rooms_dict, self.proctors_dict)
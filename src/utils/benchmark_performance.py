@@ -1,5 +1,5 @@
 """
-Benchmark Performance Test - Đo lường tốc độ của SA, PSO và các phiên bản tối ưu.
+Benchmark Performance Test - Đo lường tốc độ của SA, PSO và FastPSOSolver.
 """
 
 import time
@@ -14,7 +14,6 @@ from src.models.room import Room
 from src.models.proctor import Proctor
 from src.core.solvers.sa_solver import SASolver
 from src.core.solvers.pso_solver import PSOSolver
-from src.core.solvers.fast_sa_solver import FastSASolver
 from src.core.solvers.fast_pso_solver import FastPSOSolver
 
 
@@ -111,8 +110,8 @@ if __name__ == "__main__":
         'c2': 1.5
     }
     
-    sa_time = benchmark_solver("SA (Original)", SASolver, courses, rooms, proctors, sa_config)
-    fast_sa_time = benchmark_solver("SA (Optimized)", FastSASolver, courses, rooms, proctors, sa_config)
+    # FastSASolver chỉ là alias của SASolver -> SA chỉ đo 1 lần
+    sa_time = benchmark_solver("SA", SASolver, courses, rooms, proctors, sa_config)
     pso_time = benchmark_solver("PSO (Original)", PSOSolver, courses, rooms, proctors, pso_config)
     fast_pso_time = benchmark_solver("PSO (Optimized)", FastPSOSolver, courses, rooms, proctors, pso_config)
     
@@ -125,8 +124,7 @@ if __name__ == "__main__":
     pso_config['max_iterations'] = 500
     pso_config['swarm_size'] = 50
     
-    sa_time2 = benchmark_solver("SA (Original)", SASolver, courses, rooms, proctors, sa_config)
-    fast_sa_time2 = benchmark_solver("SA (Optimized)", FastSASolver, courses, rooms, proctors, sa_config)
+    sa_time2 = benchmark_solver("SA", SASolver, courses, rooms, proctors, sa_config)
     pso_time2 = benchmark_solver("PSO (Original)", PSOSolver, courses, rooms, proctors, pso_config)
     fast_pso_time2 = benchmark_solver("PSO (Optimized)", FastPSOSolver, courses, rooms, proctors, pso_config)
     
@@ -135,20 +133,14 @@ if __name__ == "__main__":
     print("📊 SUMMARY - PERFORMANCE IMPROVEMENT")
     print("="*60)
     
-    print(f"\n✅ SA - 200 iterations:")
-    print(f"   Original: {sa_time:.2f}s")
-    print(f"   Optimized: {fast_sa_time:.2f}s")
-    print(f"   Speedup: {sa_time/fast_sa_time:.1f}x faster")
+    print(f"\n✅ SA - 200 iterations: {sa_time:.2f}s")
     
     print(f"\n✅ PSO - 200 iterations (6000 evals):")
     print(f"   Original: {pso_time:.2f}s")
     print(f"   Optimized: {fast_pso_time:.2f}s")
     print(f"   Speedup: {pso_time/fast_pso_time:.1f}x faster")
     
-    print(f"\n✅ SA - 500 iterations:")
-    print(f"   Original: {sa_time2:.2f}s")
-    print(f"   Optimized: {fast_sa_time2:.2f}s")
-    print(f"   Speedup: {sa_time2/fast_sa_time2:.1f}x faster")
+    print(f"\n✅ SA - 500 iterations: {sa_time2:.2f}s")
     
     print(f"\n✅ PSO - 500 iterations (25000 evals):")
     print(f"   Original: {pso_time2:.2f}s")
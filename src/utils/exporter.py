@@ -3,12 +3,15 @@ Module xuất dữ liệu ra file Excel.
 Hỗ trợ định dạng đẹp (kẻ bảng, tô màu header, tự động giãn cột).
 """
 
-import pandas as pd
+from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
 from openpyxl.utils import get_column_letter
 import logging
+import os
 from pathlib import Path
+import shutil
 import sys
+import uuid
 
 # Import models
 sys.path.append(str(Path(__file__).parent.parent))
@@ -17,6 +20,12 @@ from models.solution import Schedule
 # Cấu hình logging
 logger = logging.getLogger(__name__)
 
+# Thứ tự cột trong file Excel xuất ra
+EXPORT_COLUMNS = (
+    "Mã LHP", "Tên học phần", "Ngày thi", "Giờ thi", "Phòng thi",
+    "Giám thị", "Địa điểm", "Hình thức", "Sĩ số", "Ghi chú",
+)
+
 class Exporter:
     """
     Class chịu trách nhiệm xuất kết quả xếp lịch ra các định dạng file.
@@ -40,49 +49,50 @@ class Exporter:
                 logger.warning("Không có dữ liệu để xuất.")
                 return False
 
-            # 1. Chuẩn bị dữ liệu cho DataFrame
+            # 1. Chuẩn bị dữ liệu (mỗi dòng là một tuple theo EXPORT_COLUMNS)
             if proctors_dict is None:
                 proctors_dict = {}
             
-            data = []
-            for course in schedule.courses:
+            def proctor_name_of(course) -> str:
                 # Lấy tên giám thị (hoặc ID nếu không tìm thấy)
-                proctor_name = ""
-                if course.assigned_proctor_id:
-                    proctor_obj = proctors_dict.get(course.assigned_proctor_id)
-                    if proctor_obj:
-                        proctor_name = proctor_obj.name
-                    else:
-                        proctor_name = course.assigned_proctor_id  # Fallback: hiển thị ID
-                
-                # Sắp xếp lại thứ tự cột cho hợp lý
-                data.append({
-                    "Mã LHP": course.course_id,
-                    "Tên học phần": course.name,
-                    "Ngày thi": course.assigned_date,
-                    "Giờ thi": course.assigned_time,
-                    "Phòng thi": course.assigned_room,
-                    "Giám thị": proctor_name,
-                    "Địa điểm": course.location,
-                    "Hình thức": course.exam_format,
-                    "Sĩ số": course.student_count,
-                    "Ghi chú": course.note
-                })
+                if not course.assigned_proctor_id:
+                    return ""
+                proctor_obj = proctors_dict.get(course.assigned_proctor_id)
+                if proctor_obj:
+                    return proctor_obj.name
+                return course.assigned_proctor_id  # Fallback: hiển thị ID
             
-            # Tạo DataFrame và sắp xếp theo Ngày -> Giờ -> Phòng
-            df = pd.DataFrame(data)
+            # Sắp xếp theo Ngày -> Giờ -> Phòng để file Excel dễ nhìn hơn
+            # (giá trị None xếp cuối, giống na_position='last' của pandas)
+            sorted_courses = sorted(
+                schedule.courses,
+                key=lambda c: tuple((v is None, v or '')
+                                    for v in (c.assigned_date, c.assigned_time, c.assigned_room))
+            )
             
-            # Sắp xếp dữ liệu để file Excel dễ nhìn hơn
-            if not df.empty and 'Ngày thi' in df.columns:
-                df = df.sort_values(by=['Ngày thi', 'Giờ thi', 'Phòng thi'])
-
-            # 2. Ghi ra file Excel dùng engine openpyxl
-            writer = pd.ExcelWriter(file_path, engine='openpyxl')
-            df.to_excel(writer, index=False, sheet_name='Lich_Thi')
+            # 2. Ghi ra Workbook (openpyxl trực tiếp, không cần pandas)
+            # OPTIMIZATION: Mỗi dòng được tạo và ghi ngay vào worksheet,
+            # không dựng trước danh sách tuple của toàn bộ lịch thi
+            workbook = Workbook()
+            worksheet = workbook.active
+            worksheet.title = 'Lich_Thi'
+            worksheet.append(EXPORT_COLUMNS)
+            for course in sorted_courses:
+                # Thứ tự phải khớp với EXPORT_COLUMNS
+                worksheet.append((
+                    course.course_id,
+                    course.name,
+                    course.assigned_date,
+                    course.assigned_time,
+                    course.assigned_room,
+                    proctor_name_of(course),
+                    course.location,
+                    course.exam_format,
+                    course.student_count,
+                    course.note,
+                ))
             
             # 3. Định dạng file Excel (Formatting)
-            workbook = writer.book
-            worksheet = writer.sheets['Lich_Thi']
             
             # --- Các kiểu định dạng ---
             
@@ -106,13 +116,10 @@ class Exporter:
 
             # --- Áp dụng định dạng ---
             
-            # Lấy kích thước bảng
-            max_row = len(df) + 1
-            max_col = len(df.columns)
-            
             for col_idx, column_cells in enumerate(worksheet.columns, 1):
                 # 1. Tự động giãn chiều rộng cột (Auto fit column width)
-                length = max(len(str(cell.value)) for cell in column_cells)
+                length = max(len(str(cell.value)) if cell.value is not None else 0
+                             for cell in column_cells)
                 # Cộng thêm chút padding cho thoáng
                 adjusted_width = (length + 4) * 1.2
                 worksheet.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
@@ -131,14 +138,27 @@ class Exporter:
                         cell.font = content_font
                         
                         # Căn trái cho Tên môn và Ghi chú, còn lại căn giữa
-                        header_name = df.columns[col_idx - 1]
+                        header_name = EXPORT_COLUMNS[col_idx - 1]
                         if header_name in ['Tên học phần', 'Ghi chú']:
                             cell.alignment = left_align
                         else:
                             cell.alignment = center_align
 
             # Lưu file
-            writer.close()
+            # Ghi ra file tạm cùng thư mục rồi os.replace sang file đích (thao tác
+            # nguyên tử): file đích cũ không bị ghi dở nếu có lỗi giữa chừng.
+            # File tạm được tạo bằng open() mặc định (quyền theo umask như khi ghi
+            # thẳng), nếu ghi đè file cũ thì giữ nguyên quyền của file cũ
+            target = Path(file_path)
+            tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                workbook.save(tmp_path)
+                if target.exists():
+                    shutil.copymode(target, tmp_path)
+                os.replace(tmp_path, target)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
             logger.info(f"Đã xuất file Excel thành công tại: {file_path}")
             return True
 
@@ -0,0 +1,68 @@
+"""
+Fixture dùng chung cho các test solver.
+
+Dữ liệu nhỏ nhưng đủ các trường hợp biên: phòng mã rỗng, môn khóa cứng (giờ/phòng
+hợp lệ và không hợp lệ), thời lượng 0 và 1 môn đông sinh viên bị chia thành nhiều ca.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Setup paths
+current_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(current_dir.parent))
+
+from src.models.room import Room
+from src.models.course import Course
+from src.models.proctor import Proctor
+
+
+def _build_data(seed, num_proctors):
+    rng = np.random.default_rng(seed)
+    rooms = [
+        Room(room_id="P01", capacity=40, location="Tòa A"),
+        Room(room_id="P02", capacity=25, location="Tòa A"),
+        Room(room_id="P03", capacity=60, location="Tòa B"),
+        Room(room_id="", capacity=30, location="Tòa A"),    # Mã phòng rỗng (không phải None)
+    ]
+    courses = []
+    for i in range(30):
+        course = Course(
+            course_id=f"MH{i:03d}", name=f"Môn {i}", location=rng.choice(["Tòa A", "Tòa B"]),
+            exam_format="Tự luận", student_count=int(rng.integers(5, 80)),
+            duration=int(rng.choice([0, 60, 90, 120])),
+        )
+        if i % 6 == 0:
+            # Môn khóa cứng: giờ hợp lệ/không hợp lệ, phòng có/không tồn tại
+            course.is_locked = True
+            course.assigned_date = "2025-12-02"
+            course.assigned_time = ["07:00", "bad"][i % 12 // 6]
+            course.assigned_room = ["P01", "NOPE"][i % 12 // 6]
+        courses.append(course)
+    # Môn đông sinh viên -> bị chia thành nhiều Course
+    courses.append(Course(course_id="BIG", name="Môn lớn", location="Tòa A",
+                          exam_format="Tự luận", student_count=150))
+    proctors = [Proctor(proctor_id=f"GT{i}", name=f"GT {i}") for i in range(num_proctors)]
+    return courses, rooms, proctors
+
+
+@pytest.fixture
+def make_solver():
+    """
+    Factory dựng solver trên dữ liệu dùng chung:
+    make_solver(solver_cls, seed, num_proctors=3, **config).
+    
+    config chỉ chứa tham số riêng của từng solver (seed và schedule_config có sẵn).
+    """
+    def _make(solver_cls, seed, num_proctors=3, **config):
+        courses, rooms, proctors = _build_data(seed, num_proctors)
+        config = {
+            'seed': seed,
+            'schedule_config': {'start_date': '2025-12-01', 'end_date': '2025-12-03'},
+            **config,
+        }
+        return solver_cls(courses, rooms, config, proctors)
+    return _make
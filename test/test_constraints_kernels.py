@@ -0,0 +1,97 @@
+"""
+Test các kernel số học của ConstraintChecker (src/core/_constraints_kernels.py) so với
+cách tính bằng vòng lặp Python.
+
+Chạy được cả khi có và không có numba (NUMBA_AVAILABLE cho biết đang test bản nào).
+"""
+
+import sys
+from pathlib import Path
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+# Setup paths
+current_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(current_dir.parent))
+
+from src.core._constraints_kernels import (
+    capacity_penalty,
+    grouped_overlap_counts,
+    overlapping_pairs,
+    underutilization_penalty,
+)
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 10, 50])
+def test_overlapping_pairs_matches_brute_force(size):
+    rng = np.random.default_rng(size)
+    for _ in range(20):
+        starts = rng.integers(420, 1080, size).astype(np.int64) // 30 * 30
+        ends = starts + rng.choice([30, 60, 90], size)
+        expected = sum(1 for i, j in combinations(range(size), 2)
+                       if starts[i] < ends[j] and starts[j] < ends[i])
+        assert overlapping_pairs(starts, ends) == expected
+
+
+@pytest.mark.parametrize("capacity_dtype", [np.int64, np.float64])
+def test_capacity_penalty_matches_loop(capacity_dtype):
+    rng = np.random.default_rng(1)
+    students = rng.integers(0, 120, 40).astype(np.int32)
+    # -1: phòng không tồn tại
+    capacities = np.where(rng.random(40) < 0.2, -1, rng.integers(20, 100, 40)).astype(capacity_dtype)
+
+    expected = 0.0
+    for count, capacity in zip(students.tolist(), capacities.tolist()):
+        if capacity < 0:
+            expected += 500.0
+        elif count > capacity:
+            expected += 500.0 * (1 + (count - capacity) / 10)
+
+    assert capacity_penalty(students, capacities, 500.0) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("capacity_dtype", [np.int64, np.float64])
+def test_underutilization_penalty_matches_loop(capacity_dtype):
+    rng = np.random.default_rng(2)
+    students = rng.integers(0, 120, 40).astype(np.int32)
+    # -1: phòng không tồn tại, 0: sức chứa 0 - đều bị bỏ qua
+    capacities = np.where(rng.random(40) < 0.2, rng.choice([-1, 0], 40),
+                          rng.integers(20, 100, 40)).astype(capacity_dtype)
+
+    expected = 0.0
+    for count, capacity in zip(students.tolist(), capacities.tolist()):
+        if capacity > 0 and count / capacity < 0.5:
+            expected += 2.0 * (1.0 - count / capacity) * capacity
+
+    assert underutilization_penalty(students, capacities, 2.0) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("size", [0, 1, 5, 60])
+def test_grouped_overlap_counts_matches_dict_grouping(size):
+    rng = np.random.default_rng(size + 3)
+    for _ in range(20):
+        keys = rng.integers(0, 8, size).astype(np.int64)
+        starts = rng.integers(0, 600, size).astype(np.int64) // 30 * 30
+        ends = starts + rng.choice([30, 60, 90], size)
+
+        groups = {}
+        for i, key in enumerate(keys.tolist()):
+            groups.setdefault(key, []).append(i)
+
+        counts = grouped_overlap_counts(keys, starts, ends)
+        for members in groups.values():
+            expected = sum(1 for i, j in combinations(members, 2)
+                           if starts[i] < ends[j] and starts[j] < ends[i])
+            assert counts[members].sum() == 2 * expected
+
+
+def test_grouped_overlap_counts_rejects_int64_overflow():
+    starts = np.array([0, 10], dtype=np.int64)
+    ends = np.array([1000, 1010], dtype=np.int64)
+    keys = np.array([0, np.iinfo(np.int64).max // 1000], dtype=np.int64)
+    with pytest.raises(ValueError):
+        grouped_overlap_counts(keys, starts, ends)
+    with pytest.raises(ValueError):
+        grouped_overlap_counts(np.array([-1, 0], dtype=np.int64), starts, ends)
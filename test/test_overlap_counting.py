@@ -0,0 +1,58 @@
+"""
+Test đếm số cặp ca thi trùng giờ (count_overlapping_pairs) so với định nghĩa O(n²).
+"""
+
+import sys
+from pathlib import Path
+import random
+from itertools import combinations
+
+import pytest
+
+# Setup paths
+current_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(current_dir.parent))
+
+from src.core.constraints import count_overlapping_pairs, _VECTORIZED_BUCKET_SIZE
+
+
+def _brute_force_pairs(exams):
+    """Số cặp (i, j) thỏa start_i < end_j và start_j < end_i (2 ca [start, start + duration) chồng lấn)."""
+    return sum(
+        1 for (_, s1, d1), (_, s2, d2) in combinations(exams, 2)
+        if s1 < s2 + d2 and s2 < s1 + d1
+    )
+
+
+def _random_exams(rng, size, durations):
+    # Giờ bắt đầu theo bước 30 phút để có nhiều ca chạm đầu/cuối và trùng giờ bắt đầu
+    return [(i, rng.randrange(420, 1080, 30), rng.choice(durations)) for i in range(size)]
+
+
+@pytest.mark.parametrize("size", [
+    0, 1, 2, 5,
+    _VECTORIZED_BUCKET_SIZE - 1, _VECTORIZED_BUCKET_SIZE, _VECTORIZED_BUCKET_SIZE + 1,
+    100,
+])
+@pytest.mark.parametrize("durations", [
+    (60, 90, 120),      # Chỉ thời lượng > 0 (nhóm lớn đi qua kernel NumPy)
+    (0, 30, 60),        # Có ca thời lượng 0 (luôn dùng sweep)
+    (30,),              # Cùng thời lượng: nhiều ca chạm nhau đúng ở đầu/cuối
+])
+def test_count_overlapping_pairs_matches_brute_force(size, durations):
+    rng = random.Random(size * 31 + len(durations))
+    for _ in range(20):
+        exams = _random_exams(rng, size, durations)
+        assert count_overlapping_pairs(exams) == _brute_force_pairs(exams)
+
+
+@pytest.mark.parametrize("exams, expected", [
+    ([(0, 420, 60), (1, 480, 60)], 0),                  # Chạm nhau: 07:00-08:00 và 08:00-09:00
+    ([(0, 420, 60), (1, 479, 60)], 1),                  # Chồng 1 phút
+    ([(0, 420, 0), (1, 420, 0)], 0),                    # 2 ca thời lượng 0 cùng giờ
+    ([(0, 420, 0), (1, 400, 60)], 1),                   # Ca thời lượng 0 nằm trong ca khác
+    ([(0, 420, 0), (1, 420, 60)], 0),                   # Ca thời lượng 0 tại đúng giờ bắt đầu
+    ([(0, 420, 90)] * 3, 3),                            # 3 ca trùng hoàn toàn
+])
+def test_count_overlapping_pairs_edge_cases(exams, expected):
+    assert count_overlapping_pairs(exams) == expected == _brute_force_pairs(exams)
@@ -0,0 +1,38 @@
+"""
+Test đánh giá cả bầy PSO dạng mảng (FastConstraintChecker.calculate_fast_batch) so với
+decode từng hạt thành Schedule rồi gọi calculate_fast().
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Setup paths
+current_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(current_dir.parent))
+
+from src.core.solvers.pso_solver import PSOSolver
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("with_proctors", [True, False])
+def test_batch_costs_match_per_particle_calculate_fast(make_solver, seed, with_proctors):
+    solver = make_solver(PSOSolver, seed, num_proctors=3 if with_proctors else 0,
+                         swarm_size=30, max_iterations=1)
+    # Thêm các time slot ngày/giờ "rỗng" (chuỗi rỗng, không phải None) và giờ không hợp lệ
+    solver.time_slots_flat = list(solver.time_slots_flat) + [("", ""), ("2025-12-01", "bad")]
+    solver.num_time_slots = len(solver.time_slots_flat)
+    solver.ub[0::2] = solver.num_time_slots - 1e-6
+    solver._build_batch_tables()
+
+    positions = solver.rng.uniform(solver.lb, solver.ub, (40, solver.dimension))
+    costs, best_idx, best_schedule = solver._evaluate_swarm(positions)
+
+    checker = solver.fast_constraint_checker
+    expected = np.array([checker.calculate_fast(solver._decode_position_to_schedule(p))
+                         for p in positions])
+    np.testing.assert_allclose(costs, expected, rtol=1e-12, atol=1e-6)
+    assert best_idx == int(np.argmin(expected))
+    assert checker.calculate_fast(best_schedule) == pytest.approx(expected[best_idx])
@@ -0,0 +1,61 @@
+"""
+Test đánh giá tăng dần của SA (FastConstraintChecker.begin_incremental / apply_move):
+sau mỗi bước perturb/undo, incremental_total phải bằng calculate_fast() trên toàn lịch.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Setup paths
+current_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(current_dir.parent))
+
+from src.core.solvers.sa_solver import SASolver
+from src.core.constraints import time_to_minutes
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("neighbor_type", ["random", "swap", "smart"])
+def test_incremental_total_matches_calculate_fast(make_solver, seed, neighbor_type):
+    # Ít giám thị -> nhiều trùng giám thị
+    solver = make_solver(SASolver, seed, num_proctors=2,
+                         max_iterations=1, neighbor_type=neighbor_type)
+    schedule = solver._generate_initial_solution()
+    assert any(course.is_locked for course in schedule.courses)
+    assert sum(course.course_id.startswith("BIG") for course in schedule.courses) > 1
+    
+    checker = solver.fast_constraint_checker
+    assert checker.begin_incremental(schedule, solver.available_times) == pytest.approx(checker.calculate_fast(schedule))
+    
+    for _ in range(300):
+        backup = solver._perturb_move(schedule)
+        changed = [b[0] for b in backup]
+        checker.apply_move(schedule, changed)
+        assert checker.incremental_total == pytest.approx(checker.calculate_fast(schedule))
+        
+        if solver.rng.random() < 0.5:
+            solver._undo_move(schedule, backup)
+            checker.apply_move(schedule, changed)
+            assert checker.incremental_total == pytest.approx(checker.calculate_fast(schedule))
+
+
+def test_slot_overlap_matches_brute_force(make_solver):
+    solver = make_solver(SASolver, 0, num_proctors=2, max_iterations=1)
+    schedule = solver._generate_initial_solution()
+    checker = solver.fast_constraint_checker
+    checker.begin_incremental(schedule, solver.available_times)
+    
+    # Đủ mọi tổ hợp (giờ thi cấu hình / giờ môn khóa cứng) x thời lượng các môn
+    durations = {course.duration for course in schedule.courses}
+    assert {0, 60, 90, 120} <= durations
+    for time_slot in list(solver.available_times) + ["07:00"]:
+        for duration in durations:
+            assert (time_to_minutes(time_slot), duration) in checker._slot_ids
+    
+    for (s1, d1), id1 in checker._slot_ids.items():
+        for (s2, d2), id2 in checker._slot_ids.items():
+            expected = s1 < s2 + d2 and s2 < s1 + d1
+            assert checker._slot_overlap[id1, id2] == expected
+            assert checker._slot_overlap_rows[id1][id2] == expected